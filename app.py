@@ -1,20 +1,37 @@
 import os
 import time
+from pathlib import Path
 
-from collections import deque
 from datetime import datetime
 import tkinter as tk
 from tkinter import filedialog, messagebox
 import subprocess
 
-import psutil
 import random
 
-import openpyxl
 
-
-from components import PreferencesWindow
+from components import ExportProgress, PreferencesWindow, RenderScheduler
 from utils import MotionReceiver
+from utils.device_registry import DeviceRegistry
+from utils.link_stats import LinkStats
+from utils.excel_export import ExcelExporter, ExcelSheet
+from utils.measurement_history import MeasurementHistory, MeasurementRow
+from utils.measurement_writer import MeasurementWriter
+from utils.measurements import (
+    MEASUREMENT_HEADER,
+    SAMPLE_HEADER,
+    measurement_rows,
+    sample_rows,
+)
+from utils.ring_buffer import RingBuffer, TimedRingBuffer
+from utils.recent_history import RecentHistory
+from utils.rollups import ROLLUP_HEADER, Rollups
+from utils.segment_store import SegmentStore
+from utils.sqlite_store import SQLiteStore
+from utils.storage_maintenance import StorageMaintenance
+from utils.system_sampler import SystemSampler
+from utils.compression import available as compression_available
+from utils.logger import get_logger, setup_logging
 
 # import project metadata
 from metadata import PROJECT_METADATA
@@ -22,6 +39,8 @@ from utils.constants import CONSTANTS, ICONS
 
 from pages import DashboardPage, MonitoringPage, GraphsPage, PowerOnPage, LogsPage
 
+logger = get_logger("app")
+
 
 # -----------------------------
 # Application core
@@ -43,14 +62,54 @@ class MotionApp(tk.Tk):
 
         # shared state
         self.system_on = False
-        self.motion_values = deque(maxlen=CONSTANTS.get("MOTION_HISTORY_LENGTH"))
-        self.motion_values.extend([0] * CONSTANTS.get("MOTION_HISTORY_LENGTH"))
-        self.measurement_history = []
+        self.motion_values = TimedRingBuffer(CONSTANTS.get("MOTION_HISTORY_LENGTH"))
+        # only the recent measurements stay in RAM, one typed column per
+        # metric, for the Graphs page and exports that fit the window; every
+        # measurement and every motion sample of every transmitter is
+        # streamed to append-only segment files for everything older
+        self.measurement_history = MeasurementHistory(
+            CONSTANTS.get("MEASUREMENT_WINDOW", 3600)
+        )
+        self.measurement_store, self.sample_store = self._open_stores()
+        # the same recent window mirrored to memory-mapped ring files, so a
+        # restart picks up the trend where it left off
+        self.recent = RecentHistory(
+            Path(CONSTANTS.get("MEASUREMENT_DIR", "measurements")) / "recent",
+            CONSTANTS.get("MOTION_HISTORY_LENGTH"),
+            CONSTANTS.get("MEASUREMENT_WINDOW", 3600),
+        )
+        self.warm_motion_buffer = self._restore_recent()
+        # minute / hour / day summaries, kept up to date as data arrives
+        self.rollups = Rollups(
+            Path(CONSTANTS.get("MEASUREMENT_DIR", "measurements")) / "rollups",
+            max_segment_bytes=CONSTANTS.get("SEGMENT_MAX_BYTES", 1 << 20),
+            checkpoint_interval_s=CONSTANTS.get("ROLLUP_CHECKPOINT_S", 300),
+        )
+        # optional SQLite database with every transmitter's samples, motion
+        # events, metrics and logs, for time-range queries
+        self.db = self._open_db()
+        # the stores, ring files, rollups and database are written from
+        # this thread, not from the Tk tick
+        self.writer = self._start_writer()
+        # compresses closed log days and segments, applies retention and
+        # the disk quota, at low priority in the background
+        self.maintenance = self._start_maintenance()
+        self.session_started_at = None
         self.current_motion_value = 0.0
 
-        self.log_buffer = deque(maxlen=CONSTANTS.get("LOGS_HISTORY_LENGTH"))
+        self.log_buffer = RingBuffer(CONSTANTS.get("LOGS_HISTORY_LENGTH"), None)
 
         self.transmitter_status = dict()
+        self.link_stats = LinkStats()
+        # CPU / RAM / disk / network, each on its own cadence
+        self.system_sampler = SystemSampler(
+            CONSTANTS.get("SYSTEM_SAMPLE_INTERVALS_S")
+        )
+        self.system_sampler.start()
+
+        # every transmitter heard by the receiver; pages show the selected one
+        self.devices = DeviceRegistry()
+        self.selected_device = None
 
         # Motion receiver (lazy start when system is turned ON)
         self.background_thread = None
@@ -122,6 +181,9 @@ class MotionApp(tk.Tk):
             self.pages[PageClass.__name__] = page
             page.grid(row=1, column=0, sticky="nsew")
 
+        # each tick only the raised page is updated
+        self.renderer = RenderScheduler(self.pages)
+
         # hide toolbar on landing screens
         self.toolbar.grid_forget()
         self.show_page("PowerOnPage")
@@ -272,10 +334,21 @@ class MotionApp(tk.Tk):
 
         page = self.pages[name]
         page.tkraise()
+        # catch up from the latest tick right away
+        self.renderer.show(name)
 
     def on_exit(self):
         if messagebox.askokcancel("Exit", "Close the HMI application?"):
             self.turn_system_off()
+            self.writer.stop()
+            self.measurement_store.close()
+            self.sample_store.close()
+            self.rollups.close()
+            self.recent.close()
+            self.maintenance.stop()
+            self.system_sampler.stop()
+            if self.db:
+                self.db.stop()
             self.destroy()
 
     # -----------------------------
@@ -289,28 +362,52 @@ class MotionApp(tk.Tk):
 
         # start Motion receiver thread
         if self.background_thread is None or not self.background_thread.is_alive():
-            self.motion_values.clear()
-            self.motion_values.extend([0] * CONSTANTS.get("MOTION_HISTORY_LENGTH"))
-            self.measurement_history.clear()
+            self.session_started_at = time.time()
+            # one receiver thread serves every configured port
+            ports = CONSTANTS.get("SERIAL_PORTS") or [
+                CONSTANTS.get("DEFAULT_SERIAL_PORT")
+            ]
+            self.devices = DeviceRegistry()
             self.background_thread = MotionReceiver(
-                port=CONSTANTS.get("DEFAULT_SERIAL_PORT"),
+                port=ports,
                 baudrate=CONSTANTS.get("DEFAULT_BAUDRATE"),
-                motion_buffer=self.motion_values,
-                log_buffer=self.log_buffer,
-                transmitter_status=self.transmitter_status,
+                devices=self.devices,
                 # TODO: set true in development only, change to False for strict serial only
                 use_mock_if_fail=CONSTANTS.get("USE_MOCK_DATA"),
+                capture_path=CONSTANTS.get("CAPTURE_FILE"),
+                db=self.db,
+                # the first transmitter continues the restored trend
+                motion_buffer=self.warm_motion_buffer,
+                # every received sample is persisted (restored ones already are)
+                sample_sink=self.writer.add_samples,
             )
+            self.warm_motion_buffer = None
+            default = self.background_thread.default_device
+            self.writer.attach(default.key)
+            self.select_device(default.key)
             self.background_thread.start()
+            logger.info("System ON, listening on %s", ", ".join(map(str, ports)))
 
         self.btn_on.config(state="disabled")
         self.btn_off.config(state="normal")
 
+    def select_device(self, key):
+        """
+        Point the shared buffers the pages read at transmitter `key`.
+        """
+        device = self.devices.get(key)
+        self.selected_device = key
+        self.motion_values = device.motion_buffer
+        self.log_buffer = device.log_buffer
+        self.transmitter_status = device.transmitter_status
+        self.link_stats = device.link
+
     def turn_system_off(self):
         self.system_on = False
         self.file_menu.entryconfig("Save Measurements", state="disabled")
         if self.background_thread:
             self.background_thread.stop()
+        logger.info("System OFF")
         self.btn_on.config(state="normal")
         self.btn_off.config(state="disabled")
 
@@ -322,50 +419,144 @@ class MotionApp(tk.Tk):
         # for i in range(30):
         #     self.log_buffer.append(f"Log {i}")
         # latest motion value
+        motion_time = None
         if self.motion_values:
-            self.current_motion_value = self.motion_values[-1]
-
-        cpu = psutil.cpu_percent(interval=None)
-        ram = psutil.virtual_memory().percent
-        disk = psutil.disk_usage("/").percent
-
-        # simple network throughput estimation (kB/s)
-        net1 = psutil.net_io_counters()
-        time.sleep(0.1)
-        net2 = psutil.net_io_counters()
-        sent_kbps = (net2.bytes_sent - net1.bytes_sent) / 1024.0 / 0.1
-        recv_kbps = (net2.bytes_recv - net1.bytes_recv) / 1024.0 / 0.1
-
-        metrics = {
-            "motion": self.current_motion_value,
-            "cpu": cpu,
-            "ram": ram,
-            "disk": disk,
-            "net_up": sent_kbps,
-            "net_down": recv_kbps,
-            "timestamp": datetime.now(),
-            "version": CONSTANTS.get("DEVICE_VERSION"),
-            "transmitter_status": {
-                "motion": self.current_motion_value,
-                "cpu": cpu,
-                "ram": ram,
-                "disk": disk,
-                "net_up": sent_kbps,
-                "net_down": recv_kbps,
-                "timestamp": datetime.now(),
-                "version": CONSTANTS.get("DEVICE_VERSION"),
-            },
-        }
+            self.current_motion_value = self.motion_values.latest()
+            motion_time = self.motion_values.to_wall(self.motion_values.latest_time())
+
+        # psutil is read on the sampler thread; the tick only picks up the
+        # latest snapshot
+        system = self.system_sampler.snapshot
+        metrics = MeasurementRow(
+            timestamp=time.time(),
+            motion=self.current_motion_value,
+            motion_time=motion_time,
+            cpu=system.cpu,
+            ram=system.ram,
+            disk=system.disk,
+            net_up=system.net_up,
+            net_down=system.net_down,
+        )
 
         if self.system_on:
-            self.measurement_history.append(metrics)
-
-        # propagate metrics to pages
-        for page in self.pages.values():
-            page.update_data(metrics, list(self.motion_values), list(self.log_buffer))
+            # queued only; samples of every transmitter are collected by
+            # the writer itself
+            default = self.background_thread.default_device
+            row = self._stored_row(metrics, default.motion_buffer)
+            self.measurement_history.append(row)
+            self.writer.add_measurement(row, default.key)
+
+        # propagate metrics to the raised page; pages read the ring buffers
+        # directly (tail / since cursor) instead of getting a fresh copy
+        # every tick, and hidden pages catch up when they are raised
+        self.renderer.render(metrics, self.motion_values, self.log_buffer)
 
         self.after(CONSTANTS.get("UPDATE_INTERVAL_MS"), self._periodic_update)
 
+    def _stored_row(self, metrics, buffer):
+        """
+        The tick's row as stored: its motion columns follow the transmitter
+        on the first port, whichever one the UI shows.
+        """
+        if buffer is self.motion_values:
+            return metrics
+        motion, motion_time = 0.0, None
+        if buffer:
+            motion = buffer.latest()
+            motion_time = buffer.to_wall(buffer.latest_time())
+        return MeasurementRow(
+            metrics.timestamp,
+            motion,
+            motion_time,
+            metrics.cpu,
+            metrics.ram,
+            metrics.disk,
+            metrics.net_up,
+            metrics.net_down,
+        )
+
+    def _restore_recent(self):
+        """
+        Refill the motion buffer and measurement history from the ring
+        files of the previous run; returns the refilled motion buffer.
+        """
+        values, times = self.recent.samples()
+        offset = self.motion_values.wall_offset
+        self.motion_values.extend(values, [t - offset for t in times])
+        for row in self.recent.measurements():
+            self.measurement_history.append(row)
+        if values:
+            logger.info(
+                "Restored %d motion samples and %d measurements",
+                len(values),
+                len(self.measurement_history),
+            )
+        return self.motion_values
+
+    def _open_db(self):
+        path = CONSTANTS.get("SQLITE_PATH")
+        if not path:
+            return None
+        db = SQLiteStore(path)
+        db.start()
+        logger.info("Recording time series to %s", path)
+        return db
+
+    def _start_maintenance(self):
+        base = Path(CONSTANTS.get("MEASUREMENT_DIR", "measurements"))
+        codec = CONSTANTS.get("STORAGE_COMPRESSION", "gzip")
+        if codec and not compression_available(codec):
+            logger.warning("%s compression is not available, using gzip", codec)
+            codec = "gzip"
+        maintenance = StorageMaintenance(
+            CONSTANTS.get("LOG_DIR", Path.cwd()),
+            store_dirs=[base / "history", base / "samples"],
+            summary_dirs=[base / "rollups" / tier for tier in self.rollups.tiers],
+            export_dir=self._default_save_directory(),
+            codec=codec,
+            compress_after_days=CONSTANTS.get("COMPRESS_AFTER_DAYS", 1),
+            retention_days=CONSTANTS.get("RETENTION_DAYS", 0),
+            quota_bytes=CONSTANTS.get("STORAGE_QUOTA_MB", 0) * 1024 * 1024,
+            interval_s=CONSTANTS.get("MAINTENANCE_INTERVAL_S", 3600),
+        )
+        maintenance.start()
+        return maintenance
+
+    def _start_writer(self):
+        base = Path(CONSTANTS.get("MEASUREMENT_DIR", "measurements"))
+        writer = MeasurementWriter(
+            self.measurement_store,
+            self.sample_store,
+            base / "samples",
+            recent=self.recent,
+            rollups=self.rollups,
+            db=self.db,
+            store_options={
+                "max_segment_bytes": CONSTANTS.get("SEGMENT_MAX_BYTES", 1 << 20),
+                "max_segment_age_s": CONSTANTS.get("SEGMENT_MAX_AGE_S", 3600),
+            },
+        )
+        writer.start()
+        return writer
+
+    def _open_stores(self):
+        base = Path(CONSTANTS.get("MEASUREMENT_DIR", "measurements"))
+        stores = []
+        for name in ("history", "samples"):
+            store = SegmentStore(
+                base / name,
+                max_segment_bytes=CONSTANTS.get("SEGMENT_MAX_BYTES", 1 << 20),
+                max_segment_age_s=CONSTANTS.get("SEGMENT_MAX_AGE_S", 3600),
+            )
+            if store.truncated_bytes:
+                logger.warning(
+                    "%s store recovered after unclean shutdown (%d bytes cut)",
+                    name,
+                    store.truncated_bytes,
+                )
+            stores.append(store)
+        return stores
+
     # -----------------------------
     # Menu actions
     # -----------------------------
@@ -401,40 +592,65 @@ class MotionApp(tk.Tk):
 
         filename = datetime.now().strftime("measurements_%Y%m%d_%H%M%S.xlsx")
         full_path = os.path.join(target_dir, filename)
-        # instantiate workbook
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "Measurements"
-
-        # write headers / column labels
-        ws.append(
-            [
-                "Timestamp",
-                "Motion Value",
-                "CPU Usage (%)",
-                "RAM Usage (%)",
-                "Disk Usage (%)",
-                "Net Up (kB/s)",
-                "Net Down (kB/s)",
-            ]
-        )
 
-        # write data rows
-        for item in self.measurement_history:
-            ws.append(
-                [
-                    item["timestamp"].strftime("%Y-%m-%d %H:%M:%S"),
-                    item["motion"],
-                    item["cpu"],
-                    item["ram"],
-                    item["disk"],
-                    item["net_up"],
-                    item["net_down"],
-                ]
+        # rows are streamed back from the stores on the export thread: this
+        # session, or everything on disk if the system was not turned on yet
+        since, until = self.session_started_at, time.time()
+        history = self.measurement_history
+        if self.db:
+            measurements = self.db.measurement_rows(since, until)
+            samples = self.db.sample_rows(since, until, self.selected_device)
+        else:
+            if since is not None and history and history.oldest_timestamp() <= since:
+                # the session still fits in the RAM window: slice its
+                # columns instead of reading the segments back
+                measurements = history.export_rows(since, until)
+            else:
+                measurements = measurement_rows(self.measurement_store, since, until)
+            samples = sample_rows(
+                self.writer.sample_store(self.selected_device), since, until
             )
-
-        wb.save(full_path)
-        messagebox.showinfo("Save Measurements", f"Measurements saved to:\n{full_path}")
+        sheets = [
+            ExcelSheet(
+                "Measurements",
+                MEASUREMENT_HEADER,
+                measurements,
+                time_columns=(0, 1),
+            ),
+            # every received sample at its own receive time
+            ExcelSheet(
+                "Motion Samples",
+                SAMPLE_HEADER,
+                samples,
+                time_columns=(0,),
+            ),
+            ExcelSheet(
+                "Hourly Summary",
+                ROLLUP_HEADER,
+                self.rollups.summary_rows("hour", since, until),
+                time_columns=(0,),
+            ),
+        ]
+        exporter = ExcelExporter(full_path, sheets)
+        exporter.start()
+        ExportProgress(self, exporter, self._export_finished)
+
+    def _export_finished(self, exporter):
+        if exporter.error:
+            logger.error("Export to %s failed: %s", exporter.path, exporter.error)
+            messagebox.showerror(
+                "Save Measurements",
+                f"Could not save measurements:\n{exporter.error}",
+            )
+        elif exporter.cancelled:
+            logger.info("Export to %s cancelled", exporter.path)
+        else:
+            logger.info("Saved %d rows to %s", exporter.rows_written, exporter.path)
+            text = f"Measurements saved to:\n{exporter.path}"
+            for title, parts in exporter.continued.items():
+                # more rows than one Excel worksheet holds
+                text += f"\n\n{title} is split over {parts} sheets."
+            messagebox.showinfo("Save Measurements", text)
 
     def view_saved_files(self):
         base_dir = self._default_save_directory()
@@ -457,6 +673,7 @@ class MotionApp(tk.Tk):
                 else:  # Linux (including RPi OS)
                     subprocess.call(("xdg-open", file_path))
             except Exception as e:
+                logger.error("Could not open %s: %s", file_path, e)
                 messagebox.showerror(
                     "Error", f"Could not open file explorer. Error: {e}"
                 )
@@ -466,6 +683,9 @@ class MotionApp(tk.Tk):
 # Entry point
 # -----------------------------
 def main():
+    setup_logging(
+        CONSTANTS.get("LOG_LEVEL", "INFO"), CONSTANTS.get("LOG_SAMPLE_EVERY")
+    )
     app = MotionApp()
     app.mainloop()
 
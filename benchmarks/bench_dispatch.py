@@ -0,0 +1,89 @@
+"""
+Message dispatch microbenchmark: per-message cost of
+`MotionReceiver.dispatch` for every message type, text and binary, next to
+the previous substring + try/except parser for text lines.
+
+stdout is captured so console speed does not skew the numbers.
+
+Run from the project root:
+    python -m benchmarks.bench_dispatch
+"""
+
+import contextlib
+import io
+import json
+import timeit
+
+from utils.motion_receiver import MotionReceiver
+from utils.protocol import FrameEncoder, decode_frame
+from utils.ring_buffer import TimedRingBuffer
+
+NUMBER = 50_000
+
+PERF_STATUS = {
+    "cpu": 12.5,
+    "memory": 48.1,
+    "disk": 61.0,
+    "net_up": 0.4,
+    "net_down": 1.2,
+    "version": "Raspberypi 1b+ v1.2",
+}
+
+
+def legacy_parse(raw_line):
+    try:
+        line = raw_line.strip().decode("utf-8")
+        print(f"Received: {line}")
+        if not line:
+            return None
+        if "MOTION:" in line:
+            _, val = line.split("MOTION:", 1)
+            print(f"ExtractedMotion value: {val}")
+            return float(val.strip())
+        return float(line)
+    except Exception:
+        return None
+
+
+def main():
+    receiver = MotionReceiver(
+        port=None,
+        baudrate=9600,
+        motion_buffer=TimedRingBuffer(NUMBER),
+        log_buffer=[],
+        transmitter_status={},
+    )
+    encoder = FrameEncoder()
+    cases = {
+        "text MOTION": b"MOTION:1",
+        "text LOGS": b"LOGS:MOTION DETECTED",
+        "text PERF": b"PERFORMANCE_STATUS:" + json.dumps(PERF_STATUS).encode(),
+        "bin MOTION": decode_frame(encoder.encode("MOTION", 1)),
+        "bin LOGS": decode_frame(encoder.encode("LOGS", "MOTION DETECTED")),
+        "bin PERF": decode_frame(encoder.encode("PERFORMANCE_STATUS", PERF_STATUS)),
+    }
+
+    print(f"{'message':>14} {'us/msg':>8}")
+    with contextlib.redirect_stdout(io.StringIO()) as sink:
+        results = []
+        for line in (b"MOTION:1", b"LOGS:MOTION DETECTED"):
+            t = timeit.timeit(lambda: legacy_parse(line), number=NUMBER)
+            results.append((f"legacy {line.split(b':')[0].decode()}", t))
+            sink.seek(0)
+            sink.truncate()
+        for name, frame in cases.items():
+            t = timeit.timeit(lambda: receiver.dispatch(frame), number=NUMBER)
+            results.append((name, t))
+            sink.seek(0)
+            sink.truncate()
+            receiver.motion_buffer.clear()
+            receiver.log_buffer.clear()
+
+    for name, t in results:
+        print(f"{name:>14} {t / NUMBER * 1e6:>8.2f}")
+    print("parse errors:", receiver.parse_errors)
+    print("transmitter status:", receiver.transmitter_status)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+End-to-end ingest benchmark: synthetic transmitter -> pty -> MotionReceiver.
+
+Each scenario runs a FakeTransmitter on the master side of a pseudo-terminal
+and a real MotionReceiver on the slave side, then reports sustained
+throughput, end-to-end latency percentiles, parse-error rate and the CPU
+used by the receiver thread. Results are written as JSON so runs from
+different releases can be compared.
+
+POSIX only. Run from the project root:
+    python -m benchmarks.bench_e2e
+    python -m benchmarks.bench_e2e --out e2e.json --baseline previous.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import tempfile
+import time
+from datetime import datetime
+
+from benchmarks.bench_fanin import receiver_cpu_s
+from benchmarks.fake_transmitter import FakeTransmitter, open_pty
+from utils import protocol
+from utils.log_sink import AsyncLogSink
+from utils.motion_receiver import MotionReceiver
+
+MIXED = {"MOTION": 0.90, "LOGS": 0.05, "PERFORMANCE_STATUS": 0.05}
+
+# name -> FakeTransmitter settings
+SCENARIOS = {
+    "steady_binary": {"rate": 100},
+    "steady_text": {"rate": 100, "wire": "text"},
+    "mixed_binary": {"rate": 200, "mix": MIXED},
+    "mixed_text": {"rate": 200, "mix": MIXED, "wire": "text"},
+    "bursts": {"rate": 1000, "burst": 200},
+    "errors_1pct": {"rate": 200, "mix": MIXED, "error_rate": 0.01},
+    "lossy_link": {"rate": 200, "drop_rate": 0.02, "dup_rate": 0.02},
+    "max_rate": {"rate": None},
+}
+
+# metrics where a higher value is a regression
+LOWER_IS_BETTER = ("p50_ms", "p99_ms", "max_ms", "parse_error_pct", "rx_cpu_pct")
+
+
+class ProbeReceiver(MotionReceiver):
+    """
+    MotionReceiver that notes when each message left dispatch, keyed the
+    same way FakeTransmitter keys its send times. Binary frames are keyed
+    by their SEQ unwrapped into a running count.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.arrivals = []
+        self.delivered = 0
+        self.frame_count = 0
+
+    def unwrap(self, seq):
+        # the count nearest the previous one whose low 16 bits are `seq`
+        delta = (seq - self.frame_count) & 0xFFFF
+        if delta >= 0x8000:
+            delta -= 0x10000
+        self.frame_count += delta
+        return self.frame_count
+
+    def dispatch(self, frame, channel=None):
+        ok = super().dispatch(frame, channel)
+        now = time.monotonic()
+        if ok:
+            self.delivered += 1
+        if type(frame) is protocol.Frame:
+            self.arrivals.append((self.unwrap(frame.seq), now))
+        elif frame.startswith(b"MOTION:"):
+            try:
+                self.arrivals.append((int(frame[7:]), now))
+            except ValueError:
+                pass
+        return ok
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def run_scenario(settings, duration_s, log_dir):
+    master, slave, port = open_pty()
+    sink = AsyncLogSink(log_dir)
+    sink.start()
+    receiver = ProbeReceiver(
+        port=port, baudrate=115200, use_mock_if_fail=False, log_sink=sink
+    )
+    receiver.start()
+    time.sleep(0.2)
+
+    transmitter = FakeTransmitter(master, duration_s=duration_s, **settings)
+    cpu_before = receiver_cpu_s(receiver)
+    transmitter.start()
+    transmitter.join()
+    # let the receiver drain what is still in the pty
+    time.sleep(0.3)
+    cpu = receiver_cpu_s(receiver) - cpu_before
+
+    receiver.stop()
+    receiver.join(timeout=2)
+    sink.stop()
+    os.close(master)
+    os.close(slave)
+
+    latencies = sorted(
+        (t - transmitter.sent_at[key]) * 1000
+        for key, t in receiver.arrivals
+        if key in transmitter.sent_at
+    )
+    assert not latencies or latencies[0] >= 0, "arrivals matched to later sends"
+    errors = receiver.parse_errors + receiver.framer.crc_errors
+    elapsed = transmitter.elapsed_s or duration_s
+    return {
+        "settings": settings,
+        "sent": transmitter.sent,
+        "corrupted": transmitter.corrupted,
+        "delivered": receiver.delivered,
+        "throughput_msg_s": receiver.delivered / elapsed,
+        "throughput_bytes_s": transmitter.sent_bytes / elapsed,
+        "p50_ms": percentile(latencies, 50),
+        "p90_ms": percentile(latencies, 90),
+        "p99_ms": percentile(latencies, 99),
+        "max_ms": latencies[-1] if latencies else 0.0,
+        "parse_errors": errors,
+        "parse_error_pct": errors / transmitter.sent * 100 if transmitter.sent else 0.0,
+        "rx_cpu_pct": cpu / elapsed * 100,
+        "link": receiver.default_device.link.snapshot(),
+    }
+
+
+def compare(results, baseline):
+    print()
+    print("change vs baseline (+ is worse)")
+    for name, r in results.items():
+        old = baseline.get("scenarios", {}).get(name)
+        if not old:
+            continue
+        changes = []
+        for metric in ("throughput_msg_s",) + LOWER_IS_BETTER:
+            if not old.get(metric):
+                continue
+            delta = (r[metric] - old[metric]) / old[metric] * 100
+            if metric not in LOWER_IS_BETTER:
+                delta = -delta
+            changes.append(f"{metric} {delta:+.0f}%")
+        print(f"{name:>14}: " + ", ".join(changes))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end ingest benchmark")
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument(
+        "--out", default=os.path.join(tempfile.gettempdir(), "bench_e2e.json")
+    )
+    parser.add_argument("--baseline", help="earlier JSON result to compare with")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS))
+    args = parser.parse_args()
+
+    names = args.scenario or list(SCENARIOS)
+    results = {}
+    print(
+        f"{'scenario':>14} {'sent':>7} {'msg/s':>8} {'p50 ms':>7} {'p99 ms':>7}"
+        f" {'err %':>6} {'rx cpu%':>7} {'lost':>5} {'dup':>5}"
+    )
+    with tempfile.TemporaryDirectory() as log_dir:
+        for name in names:
+            r = run_scenario(SCENARIOS[name], args.duration, log_dir)
+            results[name] = r
+            print(
+                f"{name:>14} {r['sent']:>7} {r['throughput_msg_s']:>8.0f}"
+                f" {r['p50_ms']:>7.2f} {r['p99_ms']:>7.2f}"
+                f" {r['parse_error_pct']:>6.2f} {r['rx_cpu_pct']:>7.1f}"
+                f" {r['link']['lost']:>5} {r['link']['duplicates']:>5}"
+            )
+
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "protocol_version": protocol.PROTOCOL_VERSION,
+        "duration_s": args.duration,
+        "scenarios": results,
+    }
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nresults written to {args.out}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Transmitter benchmark: legacy GPIO polling loop versus edge capture.
+
+A fake pin replays a random PIR trace while PiSender runs in either mode
+against an in-memory serial port. For every true edge we check whether a
+MOTION message with the new state went out before the next edge, and how
+long after the edge it was sent. Time is compressed by TIME_SCALE so the
+run stays short; reported latencies are scaled back to real time.
+
+Run from the project root:
+    python -m benchmarks.bench_edges
+"""
+
+import contextlib
+import importlib.util
+import io
+import random
+import threading
+import time
+from pathlib import Path
+
+from utils import protocol
+from utils.pin_driver import FakePinDriver
+from utils.serial_framer import SerialFramer
+
+TIME_SCALE = 0.1
+TRACE_S = 60.0
+SEED = 7
+
+
+def load_sender_module():
+    path = Path(__file__).resolve().parent.parent / "pi-sender.py"
+    spec = importlib.util.spec_from_file_location("pi_sender", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class RecordingSerial:
+    in_waiting = 0
+
+    def __init__(self):
+        self.framer = SerialFramer()
+        self.motion = []
+
+    def write(self, data):
+        now = time.monotonic()
+        self.framer.feed(data)
+        for frame in self.framer.frames():
+            if not isinstance(frame, protocol.Frame):
+                continue
+            if frame.type == protocol.MSG_MOTION:
+                self.motion.append((now, protocol.decode_motion(frame.payload)))
+            elif frame.type == protocol.MSG_MOTION_BATCH:
+                _, runs = protocol.decode_motion_batch(frame.payload)
+                self.motion.extend((now, float(state)) for state, _, _ in runs)
+
+    def readline(self):
+        return b""
+
+    def close(self):
+        pass
+
+
+def make_trace(rng):
+    """
+    Alternating (duration, level) steps in real seconds, starting idle.
+    """
+    steps, total, level = [], 0.0, 0
+    while total < TRACE_S:
+        duration = rng.uniform(0.05, 1.5) if level else rng.uniform(0.1, 3.0)
+        steps.append((duration, level))
+        total += duration
+        level ^= 1
+    return steps
+
+
+def run_mode(module, mode, trace):
+    ser = RecordingSerial()
+    pin = FakePinDriver(level=0)
+    sender_cls = module.PiSender
+    sender_cls.POLL_INTERVAL_S = 0.5 * TIME_SCALE
+    sender_cls.DETECTION_HOLD_S = (1 * TIME_SCALE, 2 * TIME_SCALE)
+    sender_cls.HEARTBEAT_S = 0.5 * TIME_SCALE
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        sender = sender_cls(ser, pin, warmup_s=0)
+    loop = sender.run_edges if mode == "edge" else sender.run
+    worker = threading.Thread(target=loop, daemon=True)
+    worker.start()
+    time.sleep(0.05)
+
+    edges = []
+    for duration, level in trace:
+        if level != pin.level:
+            edges.append((time.monotonic(), level))
+        pin.set_level(level)
+        time.sleep(duration * TIME_SCALE)
+    sender.stop()
+    worker.join(timeout=1)
+
+    latencies, missed = [], 0
+    for i, (t_edge, level) in enumerate(edges):
+        t_next = edges[i + 1][0] if i + 1 < len(edges) else float("inf")
+        hit = next(
+            (t for t, v in ser.motion if t_edge <= t < t_next and v == level), None
+        )
+        if hit is None:
+            missed += 1
+        else:
+            latencies.append((hit - t_edge) / TIME_SCALE)
+
+    latencies.sort()
+    return {
+        "edges": len(edges),
+        "missed": missed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000 if latencies else 0.0,
+        "max_ms": latencies[-1] * 1000 if latencies else 0.0,
+        "messages": len(ser.motion),
+    }
+
+
+def main():
+    module = load_sender_module()
+    trace = make_trace(random.Random(SEED))
+    print(f"{'mode':>6} {'edges':>6} {'missed':>7} {'p50 ms':>8} {'max ms':>8} {'msgs':>6}")
+    for mode in ("poll", "edge"):
+        r = run_mode(module, mode, trace)
+        print(
+            f"{mode:>6} {r['edges']:>6} {r['missed']:>7} {r['p50_ms']:>8.1f}"
+            f" {r['max_ms']:>8.1f} {r['messages']:>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
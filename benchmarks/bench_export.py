@@ -0,0 +1,155 @@
+"""
+Excel export: in-memory workbook built on the UI thread versus the
+streaming write-only exporter on a worker thread.
+
+For 10k, 100k and 1M measurement rows read back from a segment store,
+reports export time, peak memory of the exporting process and, for the
+threaded exporter, the longest gap seen by a 10 ms ticker standing in for
+the Tk event loop. Each case runs in its own process so peak memory is not
+shared between cases. The legacy export is skipped above --legacy-max rows.
+
+Run from the project root:
+    python -m benchmarks.bench_export
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import openpyxl
+
+from utils.excel_export import ExcelExporter, ExcelSheet
+from utils.measurement_history import MeasurementRow
+from utils.measurements import (
+    MEASUREMENT_HEADER,
+    decode_measurement,
+    encode_measurement,
+    measurement_rows,
+)
+from utils.segment_store import SegmentStore
+
+SIZES = (10_000, 100_000, 1_000_000)
+METRICS = MeasurementRow(0.0, 1.0, None, 12.5, 48.1, 61.0, 0.4, 1.2)
+
+
+def fill_store(directory, rows):
+    store = SegmentStore(directory, max_segment_bytes=8 << 20)
+    start = time.time() - rows
+    for i in range(rows):
+        store.append(encode_measurement(METRICS), start + i)
+    store.close()
+
+
+def legacy_export(store, path):
+    # the previous save_measurements_to_excel, minus the dialogs
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "Measurements"
+    ws.append(MEASUREMENT_HEADER)
+    for timestamp, payload in store.records():
+        item = decode_measurement(timestamp, payload)
+        ws.append(
+            [
+                item["timestamp"].strftime("%Y-%m-%d %H:%M:%S"),
+                "",
+                item["motion"],
+                item["cpu"],
+                item["ram"],
+                item["disk"],
+                item["net_up"],
+                item["net_down"],
+            ]
+        )
+    wb.save(path)
+    return 0.0
+
+
+def streaming_export(store, path):
+    sheet = ExcelSheet(
+        "Measurements", MEASUREMENT_HEADER, measurement_rows(store), (0, 1)
+    )
+    exporter = ExcelExporter(path, [sheet])
+    exporter.start()
+    # stand-in for the Tk loop: how late does a 10 ms tick fire?
+    worst_gap = 0.0
+    last = time.perf_counter()
+    while not exporter.done.is_set():
+        time.sleep(0.01)
+        now = time.perf_counter()
+        worst_gap = max(worst_gap, now - last - 0.01)
+        last = now
+    if exporter.error:
+        raise exporter.error
+    return worst_gap
+
+
+def run_case(mode, directory):
+    """
+    Child process: export the store and print the result as JSON.
+    """
+    store = SegmentStore(directory)
+    path = os.path.join(directory, f"{mode}.xlsx")
+    export = legacy_export if mode == "legacy" else streaming_export
+    start = time.perf_counter()
+    worst_gap = export(store, path)
+    elapsed = time.perf_counter() - start
+    # ru_maxrss is in kB on Linux
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(
+        json.dumps(
+            {
+                "seconds": elapsed,
+                "peak_mb": peak_mb,
+                "ui_gap_ms": worst_gap * 1000,
+                "file_mb": os.path.getsize(path) / 1e6,
+            }
+        )
+    )
+
+
+def measure(mode, directory):
+    cmd = [sys.executable, "-m", "benchmarks.bench_export", "--child", mode, directory]
+    out = subprocess.run(
+        cmd,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Excel export benchmark")
+    parser.add_argument("--legacy-max", type=int, default=100_000)
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "DIR"))
+    args = parser.parse_args()
+    if args.child:
+        run_case(*args.child)
+        return
+
+    print(
+        f"{'rows':>9} {'export':>10} {'seconds':>8} {'peak MB':>8}"
+        f" {'UI gap ms':>10} {'file MB':>8}"
+    )
+    for rows in SIZES:
+        with tempfile.TemporaryDirectory() as directory:
+            fill_store(directory, rows)
+            for mode in ("legacy", "streaming"):
+                if mode == "legacy" and rows > args.legacy_max:
+                    print(f"{rows:>9} {mode:>10}  skipped (--legacy-max)")
+                    continue
+                r = measure(mode, directory)
+                gap = "-" if mode == "legacy" else f"{r['ui_gap_ms']:.1f}"
+                print(
+                    f"{rows:>9} {mode:>10} {r['seconds']:>8.1f}"
+                    f" {r['peak_mb']:>8.0f} {gap:>10} {r['file_mb']:>8.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
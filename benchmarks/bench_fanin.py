@@ -0,0 +1,126 @@
+"""
+Multi-transmitter fan-in benchmark over pseudo-terminals.
+
+Simulates N transmitters either on N separate serial ports (one pty each)
+or as N device ids sharing one coordinator port, all served by a single
+MotionReceiver thread. Reports delivered messages, end-to-end latency and
+the receiver thread's CPU time for N = 1, 8 and 32.
+
+POSIX only. Run from the project root:
+    python -m benchmarks.bench_fanin
+"""
+
+import contextlib
+import io
+import os
+import time
+
+import psutil
+
+from benchmarks.fake_transmitter import open_pty
+from utils.device_registry import DeviceRegistry, DeviceState
+from utils.motion_receiver import MotionReceiver
+from utils.protocol import FrameEncoder
+
+COUNTS = (1, 8, 32)
+RATE_PER_DEVICE = 10  # messages/s per transmitter
+DURATION_S = 5.0
+
+
+class TimedBuffer(list):
+    def __init__(self):
+        super().__init__()
+        self.times = []
+
+    def append(self, value, t=None):
+        self.times.append(time.monotonic())
+        super().append(value)
+
+
+def receiver_cpu_s(receiver):
+    for thread in psutil.Process().threads():
+        if thread.id == receiver.native_id:
+            return thread.user_time + thread.system_time
+    return 0.0
+
+
+def run_case(n, shared_port):
+    ptys = [open_pty() for _ in range(1 if shared_port else n)]
+    ports = [name for _, _, name in ptys]
+
+    # (master fd, device id, registry key) per simulated transmitter
+    transmitters = []
+    for i in range(n):
+        if shared_port:
+            transmitters.append((ptys[0][0], i + 1, f"{ports[0]}#{i + 1}"))
+        else:
+            transmitters.append((ptys[i][0], 0, ports[i]))
+
+    devices = DeviceRegistry()
+    buffers = {}
+    for _, _, key in transmitters:
+        buffers[key] = TimedBuffer()
+        devices.add(DeviceState(key, buffers[key], [], {}))
+
+    receiver = MotionReceiver(
+        port=ports, baudrate=9600, devices=devices, use_mock_if_fail=False
+    )
+    with contextlib.redirect_stdout(io.StringIO()):
+        receiver.start()
+        time.sleep(0.2)
+
+    encoders = [FrameEncoder(device=device_id) for _, device_id, _ in transmitters]
+    sent = {key: [] for _, _, key in transmitters}
+    interval = 1.0 / RATE_PER_DEVICE
+    cpu_before = receiver_cpu_s(receiver)
+    deadline = time.monotonic() + DURATION_S
+    next_tick = time.monotonic()
+    while time.monotonic() < deadline:
+        for (master, _, key), encoder in zip(transmitters, encoders):
+            frame = encoder.encode("MOTION", len(sent[key]) & 1)
+            sent[key].append(time.monotonic())
+            os.write(master, frame)
+        next_tick += interval
+        time.sleep(max(0.0, next_tick - time.monotonic()))
+
+    time.sleep(0.5)
+    cpu = receiver_cpu_s(receiver) - cpu_before
+    receiver.stop()
+    receiver.join(timeout=2)
+    for master, slave, _ in ptys:
+        os.close(master)
+        os.close(slave)
+
+    latencies = []
+    total_sent = total_recv = 0
+    for key, times in sent.items():
+        received = buffers[key].times
+        total_sent += len(times)
+        total_recv += len(received)
+        latencies.extend(r - s for s, r in zip(times, received))
+    latencies.sort()
+    return {
+        "sent": total_sent,
+        "received": total_recv,
+        "p50_ms": latencies[len(latencies) // 2] * 1000 if latencies else 0.0,
+        "p99_ms": latencies[int(len(latencies) * 0.99)] * 1000 if latencies else 0.0,
+        "cpu_pct": cpu / DURATION_S * 100,
+    }
+
+
+def main():
+    print(
+        f"{'layout':>8} {'N':>4} {'sent':>7} {'recv':>7} {'p50 ms':>8}"
+        f" {'p99 ms':>8} {'rx cpu%':>8}"
+    )
+    for shared_port, layout in ((False, "ports"), (True, "ids")):
+        for n in COUNTS:
+            r = run_case(n, shared_port)
+            print(
+                f"{layout:>8} {n:>4} {r['sent']:>7} {r['received']:>7}"
+                f" {r['p50_ms']:>8.2f} {r['p99_ms']:>8.2f} {r['cpu_pct']:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+In-memory measurement history: deque of metrics dicts versus columns.
+
+Fills a window of MEASUREMENT_WINDOW rows both ways and reports RAM per
+row (tracemalloc), the cost of one append, and the cost of the slices
+graphs and exports take: the newest 600 motion values and the rows of the
+last 10 minutes.
+
+Run from the project root:
+    python -m benchmarks.bench_history
+"""
+
+import time
+import tracemalloc
+from collections import deque
+from datetime import datetime
+
+from utils.measurement_history import MeasurementHistory, MeasurementRow
+
+WINDOW = 3600
+SLICE = 600
+REPEAT = 200
+VERSION = {"control_station": "v1.0", "transmitter": "v1.0"}
+
+
+def old_metrics(i):
+    # the dict _periodic_update used to build every tick
+    return {
+        "motion": float(i & 1),
+        "motion_time": datetime.now(),
+        "cpu": 12.5 + i % 7,
+        "ram": 48.1,
+        "disk": 61.0,
+        "net_up": 0.4 * i,
+        "net_down": 1.2 * i,
+        "timestamp": datetime.now(),
+        "version": VERSION,
+        "transmitter_status": {
+            "motion": float(i & 1),
+            "cpu": 12.5 + i % 7,
+            "ram": 48.1,
+            "disk": 61.0,
+            "net_up": 0.4 * i,
+            "net_down": 1.2 * i,
+            "timestamp": datetime.now(),
+            "version": VERSION,
+        },
+    }
+
+
+def new_row(i):
+    now = time.time()
+    return MeasurementRow(
+        now, float(i & 1), now, 12.5 + i % 7, 48.1, 61.0, 0.4 * i, 1.2 * i
+    )
+
+
+def fill(create, make):
+    # the container is created under tracemalloc: columns are preallocated
+    tracemalloc.start()
+    history = create()
+    start = time.perf_counter()
+    for i in range(WINDOW):
+        history.append(make(i))
+    elapsed = time.perf_counter() - start
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return history, used / WINDOW, elapsed / WINDOW * 1e6
+
+
+def timed(fn):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        fn()
+    return (time.perf_counter() - start) / REPEAT * 1e6
+
+
+def main():
+    history, old_bytes, old_us = fill(lambda: deque(maxlen=WINDOW), old_metrics)
+    cutoff = history[-SLICE]["timestamp"]
+    old_tail = timed(lambda: [m["motion"] for m in list(history)[-SLICE:]])
+    old_range = timed(lambda: [m for m in history if m["timestamp"] >= cutoff])
+
+    columns, new_bytes, new_us = fill(
+        lambda: MeasurementHistory(WINDOW), new_row
+    )
+    since = columns.row(-SLICE).timestamp
+    new_tail = timed(lambda: columns.tail(SLICE, ("motion",)))
+    new_range = timed(lambda: columns.between(since))
+
+    print(f"{WINDOW} rows")
+    print(
+        f"{'':20} {'bytes/row':>10} {'append us':>10}"
+        f" {'tail us':>10} {'range us':>10}"
+    )
+    print(
+        f"{'deque of dicts':20} {old_bytes:>10.0f} {old_us:>10.1f}"
+        f" {old_tail:>10.1f} {old_range:>10.1f}"
+    )
+    print(
+        f"{'columns':20} {new_bytes:>10.0f} {new_us:>10.1f}"
+        f" {new_tail:>10.1f} {new_range:>10.1f}"
+    )
+    print(f"column storage: {columns.bytes_per_row()} bytes/row")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Serial ingest benchmark: legacy `readline()` + fixed sleep loop versus the
+buffered framer used by MotionReceiver.
+
+A simulated UART releases bytes at the pace of the configured baud rate
+(10 bits per byte) while the transmitter sends back-to-back lines. We
+report sustained lines/s and the latency between the last byte of a line
+arriving on the wire and the value landing in the motion buffer.
+
+Run from the project root:
+    python -m benchmarks.bench_ingest
+"""
+
+import contextlib
+import io
+import threading
+import time
+
+from utils.motion_receiver import MotionReceiver
+
+BAUDRATES = (9600, 115200, 921600)
+DURATION_S = 3.0
+LINE = b"MOTION:1\n"
+
+
+class SimulatedSerial:
+    """
+    Minimal pyserial stand-in whose bytes become readable at wire speed.
+    """
+
+    def __init__(self, payload, baudrate, timeout=1.0):
+        self.payload = payload
+        self.byte_time = 10.0 / baudrate
+        self.timeout = timeout
+        self.pos = 0
+        self.t0 = time.monotonic()
+
+    def available_at(self, index):
+        return self.t0 + (index + 1) * self.byte_time
+
+    def _arrived(self):
+        n = int((time.monotonic() - self.t0) / self.byte_time)
+        return min(n, len(self.payload))
+
+    @property
+    def in_waiting(self):
+        return self._arrived() - self.pos
+
+    def _wait_for(self, index, deadline):
+        while index >= self._arrived():
+            now = time.monotonic()
+            if now >= deadline or index >= len(self.payload):
+                return False
+            time.sleep(min(self.byte_time, deadline - now))
+        return True
+
+    def read(self, size=1):
+        deadline = time.monotonic() + self.timeout
+        self._wait_for(self.pos + size - 1, deadline)
+        end = min(self.pos + size, self._arrived())
+        data = self.payload[self.pos : end]
+        self.pos = end
+        return data
+
+    def readline(self):
+        deadline = time.monotonic() + self.timeout
+        end = self.payload.find(b"\n", self.pos)
+        if end < 0 or not self._wait_for(end, deadline):
+            return self.read(self.in_waiting)
+        data = self.payload[self.pos : end + 1]
+        self.pos = end + 1
+        return data
+
+
+class TimedBuffer(list):
+    def __init__(self):
+        super().__init__()
+        self.times = []
+
+    def append(self, value, t=None):
+        self.times.append(time.monotonic())
+        super().append(value)
+
+
+def legacy_loop(receiver, stop):
+    while not stop.is_set():
+        raw = receiver.serial.readline()
+        if raw:
+            receiver.dispatch(raw)
+        time.sleep(0.1)
+
+
+def framed_loop(receiver, stop):
+    while not stop.is_set():
+        chunk = receiver.read_chunk()
+        if chunk:
+            receiver.handle_chunk(chunk)
+
+
+def run_case(loop, baudrate):
+    lines = int(DURATION_S * baudrate / (10 * len(LINE))) + 1
+    serial_port = SimulatedSerial(LINE * lines, baudrate, timeout=0.2)
+    buffer = TimedBuffer()
+    receiver = MotionReceiver(
+        port=None,
+        baudrate=baudrate,
+        motion_buffer=buffer,
+        log_buffer=[],
+        transmitter_status={},
+    )
+    receiver.serial = serial_port
+
+    stop = threading.Event()
+    worker = threading.Thread(target=loop, args=(receiver, stop), daemon=True)
+    with contextlib.redirect_stdout(io.StringIO()):
+        worker.start()
+        time.sleep(DURATION_S)
+        stop.set()
+        worker.join()
+
+    latencies = sorted(
+        t - serial_port.available_at((i + 1) * len(LINE) - 1)
+        for i, t in enumerate(buffer.times)
+    )
+    p50 = latencies[len(latencies) // 2] * 1000 if latencies else 0.0
+    p99 = latencies[int(len(latencies) * 0.99)] * 1000 if latencies else 0.0
+    return len(buffer) / DURATION_S, p50, p99
+
+
+def main():
+    print(f"{'baud':>8} {'path':>8} {'lines/s':>10} {'p50 ms':>10} {'p99 ms':>10}")
+    for baudrate in BAUDRATES:
+        for name, loop in (("legacy", legacy_loop), ("framed", framed_loop)):
+            rate, p50, p99 = run_case(loop, baudrate)
+            print(f"{baudrate:>8} {name:>8} {rate:>10.1f} {p50:>10.1f} {p99:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
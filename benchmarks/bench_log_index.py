@@ -0,0 +1,133 @@
+"""
+Log search over a year of daily log files: LogIndex versus reading the
+text files.
+
+Writes 365 days of synthetic logs (--lines per day, mostly INFO with some
+warnings and rare errors) with their index files, then times the queries
+the Logs page makes: the newest page, one hour of a given day, errors
+across the year, and substring searches over a week and over the year.
+The naive baseline reads and parses every line of every file.
+
+Run from the project root:
+    python -m benchmarks.bench_log_index
+"""
+
+import argparse
+import logging
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from utils.log_index import (
+    LOG_FILENAME,
+    LogIndex,
+    format_line,
+    index_path,
+    pack_record,
+    parse_line,
+)
+
+DAYS = 365
+REPEAT = 5
+MESSAGES = [
+    "[/dev/ttyAMA0] motion detected in zone {}",
+    "[/dev/ttyAMA0] heartbeat ok, uptime {} s",
+    "[/dev/ttyUSB1] battery {} %",
+    "[/dev/ttyUSB1] sensor recalibrated ({} ms)",
+]
+
+
+def write_year(log_dir, lines_per_day, first_day, days=DAYS):
+    rng = random.Random(5)
+    for d in range(days):
+        day = first_day + timedelta(days=d)
+        path = log_dir / day.strftime("%Y-%m-%d") / LOG_FILENAME
+        path.parent.mkdir(parents=True)
+        step = 86400 / lines_per_day
+        lines, records, offset = [], [], 0
+        for i in range(lines_per_day):
+            t = day + timedelta(seconds=i * step)
+            roll = rng.random()
+            if roll < 0.0005:
+                level, message = logging.ERROR, f"/dev/ttyAMA0 lost: error {i}"
+            elif roll < 0.02:
+                level, message = logging.WARNING, f"link loss {rng.randint(1, 9)} %"
+            else:
+                level = logging.INFO
+                message = rng.choice(MESSAGES).format(rng.randint(0, 999))
+            line = format_line(t, level, message)
+            records.append(pack_record(t.timestamp(), offset, len(line), level))
+            offset += len(line)
+            lines.append(line)
+        path.write_bytes(b"".join(lines))
+        index_path(path).write_bytes(b"".join(records))
+
+
+def naive(log_dir, start=None, end=None, text=None, level=None, limit=50):
+    # what it takes without an index: parse every line, newest first
+    results = []
+    needle = text.lower() if text else None
+    for day_dir in sorted(log_dir.iterdir(), reverse=True):
+        lines = (day_dir / LOG_FILENAME).read_bytes().splitlines(keepends=True)
+        for raw in reversed(lines):
+            t, line_level, message = parse_line(raw)
+            if start is not None and t < start or end is not None and t >= end:
+                continue
+            if level is not None and line_level < level:
+                continue
+            if needle is not None and needle not in message.lower():
+                continue
+            results.append(message)
+            if len(results) >= limit:
+                return results
+    return results
+
+
+def timed(fn):
+    times = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Log index benchmark")
+    parser.add_argument("--lines", type=int, default=2000, help="lines per day")
+    args = parser.parse_args()
+
+    first_day = datetime(2025, 1, 1)
+    with tempfile.TemporaryDirectory() as directory:
+        log_dir = Path(directory)
+        write_year(log_dir, args.lines, first_day)
+        size_mb = sum(p.stat().st_size for p in log_dir.rglob("*")) / 1e6
+        print(f"{DAYS} days x {args.lines} lines, {size_mb:.0f} MB with indexes")
+
+        index = LogIndex(log_dir)
+        hour = (first_day + timedelta(days=200, hours=9)).timestamp()
+        week = (first_day + timedelta(days=300)).timestamp()
+        week_end = week + 7 * 86400
+        cases = [
+            ("newest page", {}),
+            ("one hour, day 200", {"start": hour, "end": hour + 3600}),
+            ("errors, whole year", {"level": logging.ERROR}),
+            ("text, one week", {"text": "zone 42", "start": week, "end": week_end}),
+            ("text, no match, year", {"text": "no such line"}),
+        ]
+        print(f"{'query':24} {'index ms':>10} {'naive ms':>10} {'hits':>6}")
+        for name, kwargs in cases:
+            index_ms, hits = timed(lambda: index.query(limit=50, **kwargs))
+            naive_ms, expected = timed(lambda: naive(log_dir, **kwargs))
+            same = [e.message for e in hits] == expected
+            print(
+                f"{name:24} {index_ms:>10.1f} {naive_ms:>10.1f} {len(hits):>6}"
+                + ("" if same else "  MISMATCH")
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Receiver throughput with per-line print() versus the leveled, sampled
+logger.
+
+Console output goes to a pseudo-terminal drained by a background thread,
+which is close to what a Pi writing to its console or journald pays per
+line. Cases: the old two print() calls per line, logger at INFO (per-line
+tracing off), and logger at DEBUG with 1-in-100 and 1-in-1 sampling.
+
+POSIX only. Run from the project root:
+    python -m benchmarks.bench_logging
+"""
+
+import contextlib
+import logging
+import os
+import threading
+import time
+
+from utils import logger as hmi_logger
+from utils.motion_receiver import MotionReceiver
+
+LINES = 50_000
+
+
+class PrintingReceiver(MotionReceiver):
+    """
+    The receive path as it was: two print() calls for every line.
+    """
+
+    def dispatch(self, frame, channel=None):
+        line = frame.strip()
+        print(f"Received: {line.decode('utf-8', 'replace')}")
+        ok = super().dispatch(frame, channel)
+        print(f"ExtractedMotion value: {self.motion_buffer.latest()}")
+        return ok
+
+
+@contextlib.contextmanager
+def pty_console():
+    master, slave = os.openpty()
+    stop = threading.Event()
+
+    def drain():
+        while not stop.is_set():
+            try:
+                os.read(master, 65536)
+            except OSError:
+                return
+
+    reader = threading.Thread(target=drain, daemon=True)
+    reader.start()
+    console = os.fdopen(slave, "w", buffering=1)
+    try:
+        yield console
+    finally:
+        stop.set()
+        console.close()
+        os.close(master)
+
+
+def run(receiver_cls, stream):
+    receiver = receiver_cls(port=None, baudrate=9600, use_mock_if_fail=False)
+    start = time.perf_counter()
+    for i in range(0, len(stream), 512):
+        receiver.handle_chunk(stream[i : i + 512])
+    return LINES / (time.perf_counter() - start)
+
+
+def main():
+    stream = b"".join(f"MOTION:{i & 1}\n".encode() for i in range(LINES))
+    results = []
+    with pty_console() as console:
+        with contextlib.redirect_stdout(console):
+            results.append(("print() per line", run(PrintingReceiver, stream)))
+
+        handler = logging.StreamHandler(console)
+        handler.setFormatter(logging.Formatter(hmi_logger.LOG_FORMAT))
+        root = logging.getLogger()
+        root.addHandler(handler)
+        rx_logger = hmi_logger.get_logger("motion_receiver")
+        for name, level, every in (
+            ("logger INFO", logging.INFO, 100),
+            ("logger DEBUG 1/100", logging.DEBUG, 100),
+            ("logger DEBUG 1/1", logging.DEBUG, 1),
+        ):
+            root.setLevel(level)
+            rx_logger.sample_every = every
+            results.append((name, run(MotionReceiver, stream)))
+        root.removeHandler(handler)
+
+    print(f"{'receive path':>20} {'lines/s':>10}")
+    for name, rate in results:
+        print(f"{name:>20} {rate:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
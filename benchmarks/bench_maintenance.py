@@ -0,0 +1,177 @@
+"""
+Background storage maintenance: space saved, CPU cost and the effect on
+a busy foreground thread.
+
+Writes --days of synthetic log files (with their indexes) and --days of
+1 Hz measurements and motion sample batches to segment stores, then runs
+one StorageMaintenance pass on its own low-priority thread while the main
+thread runs a 10 ms tick loop standing in for acquisition and the UI.
+Reports bytes before/after, the pass's CPU time and the tick lateness
+against an idle baseline, then checks that LogIndex and the export row
+readers return the same data from the compressed files. Finally a quota
+of half the remaining space is enforced.
+
+Run from the project root:
+    python -m benchmarks.bench_maintenance
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks.bench_log_index import write_year
+from utils.compression import available
+from utils.log_index import LogIndex
+from utils.measurement_history import MeasurementRow
+from utils.measurements import (
+    encode_measurement,
+    encode_samples,
+    measurement_rows,
+    sample_rows,
+)
+from utils.segment_store import SegmentStore
+from utils.storage_maintenance import StorageMaintenance, _size
+
+TICK_S = 0.01
+
+
+def write_stores(base, days, first_day):
+    rng = random.Random(9)
+    history = SegmentStore(base / "history")
+    samples = SegmentStore(base / "samples")
+    start = first_day.timestamp()
+    cpu, ram, motion = 20.0, 45.0, 0.0
+    for i in range(days * 86400):
+        t = start + i
+        cpu = min(100.0, max(0.0, cpu + rng.gauss(0, 2)))
+        ram = min(100.0, max(0.0, ram + rng.gauss(0, 0.1)))
+        if rng.random() < 0.01:
+            motion = 0.0 if motion else round(rng.uniform(0.2, 3.0), 2)
+        row = MeasurementRow(
+            t, motion, t - 0.2, cpu, ram, 61.0, rng.uniform(0, 4), rng.uniform(0, 9)
+        )
+        history.append(encode_measurement(row), t)
+        samples.append(encode_samples([motion] * 2, [t - 0.5, t - 0.1]), t)
+    history.close()
+    samples.close()
+
+
+def age_files(directory):
+    # maintenance leaves files alone until they have settled for an hour
+    old = time.time() - 2 * 86400
+    for path in Path(directory).rglob("*"):
+        os.utime(path, (old, old))
+
+
+def ticks(duration_s=None, until=None):
+    """
+    Lateness (ms) of a TICK_S sleep loop, for `duration_s` or until
+    `until()` is true.
+    """
+    late = []
+    end = time.monotonic() + (duration_s or 0)
+    while (until is None and time.monotonic() < end) or (until and not until()):
+        due = time.monotonic() + TICK_S
+        time.sleep(TICK_S)
+        sum(range(2000))  # a little foreground work per tick
+        late.append((time.monotonic() - due) * 1000)
+    return late
+
+
+def snapshot(log_dir, base):
+    index = LogIndex(log_dir)
+    queries = [
+        [e.message for e in index.query(limit=50)],
+        [e.message for e in index.query(text="zone 42", limit=50)],
+        [e.message for e in index.query(level=40, limit=50)],
+    ]
+    history = SegmentStore(base / "history")
+    samples = SegmentStore(base / "samples")
+    rows = sum(1 for _ in measurement_rows(history))
+    sample_count = sum(1 for _ in sample_rows(samples))
+    history.close()
+    samples.close()
+    return queries, rows, sample_count
+
+
+def run(codec, days, lines):
+    with tempfile.TemporaryDirectory() as directory:
+        log_dir = Path(directory) / "logs"
+        base = Path(directory) / "measurements"
+        first_day = datetime(2025, 1, 1)
+        write_year(log_dir, lines, first_day, days=days)
+        write_stores(base, days, first_day)
+        age_files(directory)
+        before = snapshot(log_dir, base)
+        sizes = {"logs": _size(log_dir), "segments": _size(base)}
+
+        idle = ticks(duration_s=2.0)
+        maintenance = StorageMaintenance(
+            log_dir,
+            store_dirs=[base / "history", base / "samples"],
+            codec=codec,
+            first_run_s=0.0,
+        )
+        wall = time.perf_counter()
+        maintenance.start()
+        busy = ticks(until=lambda: maintenance.passes > 0)
+        wall = time.perf_counter() - wall
+        maintenance.stop()
+
+        print(f"\n{codec}: {days} days")
+        for name, path in (("logs", log_dir), ("segments", base)):
+            after = _size(path)
+            print(
+                f"  {name:9} {sizes[name] / 1e6:8.1f} MB -> {after / 1e6:6.1f} MB"
+                f"  ({sizes[name] / max(after, 1):.1f}x)"
+            )
+        stats = maintenance.stats()
+        print(
+            f"  pass: {stats['compressed']} files, {stats['cpu_s']:.1f} s CPU,"
+            f" {wall:.1f} s wall,"
+            f" {stats['bytes_in'] / 1e6 / max(stats['cpu_s'], 1e-9):.0f} MB/CPU-s"
+        )
+        for name, late in (("idle", idle), ("during pass", busy)):
+            late.sort()
+            print(
+                f"  tick lateness {name:12} p50 {statistics.median(late):5.2f} ms"
+                f"  p99 {late[int(len(late) * 0.99)]:5.2f} ms  max {late[-1]:6.2f} ms"
+            )
+        same = snapshot(log_dir, base) == before
+        print(f"  readers after compression: {'identical' if same else 'DIFFERENT'}")
+
+        used = _size(log_dir) + _size(base)
+        quota = StorageMaintenance(
+            log_dir,
+            store_dirs=[base / "history", base / "samples"],
+            codec="",
+            quota_bytes=used // 2,
+        )
+        quota.run_once()
+        print(
+            f"  quota {used // 2 / 1e6:.1f} MB: removed {quota.removed} oldest"
+            f" files/days ({quota.removed_bytes / 1e6:.1f} MB),"
+            f" now {(_size(log_dir) + _size(base)) / 1e6:.1f} MB,"
+            f" newest log page {len(LogIndex(log_dir).query(limit=50))} lines"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Storage maintenance benchmark")
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--lines", type=int, default=2000, help="log lines per day")
+    args = parser.parse_args()
+    for codec in ("gzip", "zstd"):
+        if available(codec):
+            run(codec, args.days, args.lines)
+        else:
+            print(f"\n{codec}: not available (pip install zstandard)")
+
+
+if __name__ == "__main__":
+    main()
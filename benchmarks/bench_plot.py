@@ -0,0 +1,148 @@
+"""
+Graphs page plotting: the matplotlib figure (as before) versus native
+canvas items moved with coords().
+
+1. Startup: time to import each backend in a fresh interpreter, against
+   a bare `import tkinter`.
+2. Frames: --frames updates of the live view (a 50-sample motion series
+   sliding by one sample per frame), each followed by root.update() so
+   the redraw Tk or matplotlib schedules is included. Reports wall time
+   per frame (p50/p99) and this thread's CPU time per frame. Needs a
+   display (on a headless Pi, run it under xvfb-run); without one, only
+   matplotlib's Agg rasterization per frame is measured, which is the
+   part the canvas backend does not do at all.
+
+Run from the project root:
+    python -m benchmarks.bench_plot
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+import tkinter as tk
+
+SAMPLES = 50
+IMPORT_RUNS = 5
+
+
+def import_ms(module):
+    code = (
+        "import time; start = time.perf_counter(); import tkinter, "
+        f"{module}; print((time.perf_counter() - start) * 1000)"
+    )
+    runs = []
+    for _ in range(IMPORT_RUNS):
+        out = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        runs.append(float(out.stdout))
+    return statistics.median(runs)
+
+
+def series(frame):
+    # one sample per second, toggling every 10 samples
+    x = [float(i - SAMPLES + 1) for i in range(SAMPLES)]
+    y = [1.0 if ((frame + i) // 10) % 2 else 0.0 for i in range(SAMPLES)]
+    return x, y
+
+
+def run_frames(name, update, frames, after=None):
+    times = []
+    start_cpu = time.thread_time()
+    for frame in range(frames):
+        x, y = series(frame)
+        start = time.perf_counter()
+        update(x, y)
+        if after is not None:
+            after()
+        times.append((time.perf_counter() - start) * 1000)
+    cpu_ms = (time.thread_time() - start_cpu) * 1000 / frames
+    times.sort()
+    p50 = statistics.median(times)
+    p99 = times[int(len(times) * 0.99)]
+    print(f"  {name:28} {p50:8.2f} {p99:8.2f} {cpu_ms:9.2f}")
+
+
+def live_axes(plot):
+    plot.set_axes(
+        title=f"Last {SAMPLES} Motion Values",
+        xlabel="Seconds before latest sample",
+        ylabel="Value",
+        ylim=(-0.1, 1.1),
+        yticks=(0.0, 1.0),
+        marker=True,
+    )
+
+
+def frames_tk(root, frames):
+    from components.canvas_plot import CanvasPlot
+    from components.mpl_plot import MatplotlibPlot
+
+    for name, plot_class in (
+        ("matplotlib (before)", MatplotlibPlot),
+        ("canvas", CanvasPlot),
+    ):
+        plot = plot_class(root)
+        plot.pack(fill="both", expand=True)
+        live_axes(plot)
+        root.update()
+        run_frames(
+            name,
+            lambda x, y: plot.set_data(x, y, xlim=(x[0] - 0.5, 0.5)),
+            frames,
+            root.update,
+        )
+        plot.destroy()
+
+
+def frames_agg(frames):
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    figure = Figure(figsize=(5, 2), dpi=100)
+    ax = figure.add_subplot(111)
+    (line,) = ax.plot([], [], "-o")
+    ax.set_ylim(-0.1, 1.1)
+    canvas = FigureCanvasAgg(figure)
+
+    def update(x, y):
+        line.set_data(x, y)
+        ax.set_xlim(x[0] - 0.5, 0.5)
+        canvas.draw()
+
+    run_frames("matplotlib Agg draw", update, frames)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Graphs page plot benchmark")
+    parser.add_argument("--frames", type=int, default=300)
+    args = parser.parse_args()
+
+    bare = import_ms("sys")
+    print(f"import time (ms, median of {IMPORT_RUNS}, incl. tkinter):")
+    print(f"  {'tkinter only':28} {bare:8.1f}")
+    for name, module in (
+        ("matplotlib (before)", "components.mpl_plot"),
+        ("canvas", "components.canvas_plot"),
+    ):
+        print(f"  {name:28} {import_ms(module):8.1f}")
+
+    print(f"\nper frame over {args.frames} frames:   p50 ms   p99 ms    CPU ms")
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        frames_agg(args.frames)
+        print(
+            f"no display ({e}); the canvas backend needs one, try:"
+            f" xvfb-run python -m {__spec__.name}"
+        )
+        return
+    root.geometry("480x240")
+    frames_tk(root, args.frames)
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Wire format benchmark: legacy ASCII lines versus binary protocol frames.
+
+Reports bytes per sample (and the resulting samples/s ceiling at 9600
+baud) plus the receive-side cost of framing and decoding each format.
+
+Run from the project root:
+    python -m benchmarks.bench_protocol
+"""
+
+import contextlib
+import io
+import json
+import time
+
+from utils.motion_receiver import MotionReceiver
+from utils.protocol import FrameEncoder
+from utils.ring_buffer import TimedRingBuffer
+
+SAMPLES = 100_000
+BAUDRATE = 9600
+
+PERF_STATUS = {
+    "cpu": 12.5,
+    "ram": 48.1,
+    "disk": 61.0,
+    "net_up": 0.4,
+    "net_down": 1.2,
+    "version": "Raspberypi 1b+ v1.2",
+}
+
+
+def text_stream(n):
+    return b"".join(f"MOTION:{i & 1}\n".encode() for i in range(n))
+
+
+def binary_stream(n):
+    encoder = FrameEncoder()
+    return b"".join(encoder.encode("MOTION", i & 1) for i in range(n))
+
+
+def receive(stream):
+    receiver = MotionReceiver(
+        port=None,
+        baudrate=BAUDRATE,
+        motion_buffer=TimedRingBuffer(SAMPLES),
+        log_buffer=[],
+        transmitter_status={},
+    )
+    chunk_size = 256
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(0, len(stream), chunk_size):
+            receiver.handle_chunk(stream[i : i + chunk_size])
+    elapsed = time.perf_counter() - start
+    assert len(receiver.motion_buffer) == SAMPLES
+    return elapsed / SAMPLES * 1e6
+
+
+def main():
+    text = text_stream(SAMPLES)
+    binary = binary_stream(SAMPLES)
+
+    byte_time = 10.0 / BAUDRATE
+    print(f"{'format':>10} {'bytes/sample':>13} {'max/s @9600':>12} {'us/sample':>10}")
+    for name, stream in (("text", text), ("binary", binary)):
+        per_sample = len(stream) / SAMPLES
+        print(
+            f"{name:>10} {per_sample:>13.1f} {1 / (per_sample * byte_time):>12.1f}"
+            f" {receive(stream):>10.2f}"
+        )
+
+    # the text format carries no sequence number, timestamp or checksum;
+    # this is what it would cost to add them as ASCII
+    text_equiv = len(b"MOTION:1,65535,4294967295,FFFF\n")
+    print(f"{'text+meta':>10} {text_equiv:>13.1f} {1 / (text_equiv * byte_time):>12.1f}")
+
+    perf_json = json.dumps({"type": "PERFORMANCE_STATUS", "data": PERF_STATUS})
+    perf_binary = FrameEncoder().encode("PERFORMANCE_STATUS", PERF_STATUS)
+    print()
+    print(f"PERFORMANCE_STATUS json: {len(perf_json) + 1} bytes")
+    print(f"PERFORMANCE_STATUS binary: {len(perf_binary)} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Reconnect benchmark: the serial port disappears mid-run and comes back.
+
+The receiver is pointed at a symlink to the slave side of a pty. For each
+outage length the pty is torn down and the link removed, then a new pty is
+linked in its place and a fake transmitter starts sending again. Reports
+the supervisor's time-to-reconnect and the extra wait after the port was
+back, which is what the backoff costs.
+
+POSIX only. Run from the project root:
+    python -m benchmarks.bench_reconnect
+"""
+
+import os
+import tempfile
+import time
+
+from benchmarks.fake_transmitter import FakeTransmitter, open_pty
+from utils.log_sink import AsyncLogSink
+from utils.logger import setup_logging
+from utils.motion_receiver import MotionReceiver
+
+OUTAGES_S = (0.5, 2.0, 5.0)
+RATE = 50
+
+
+def attach(link):
+    master, slave, name = open_pty()
+    if os.path.lexists(link):
+        os.remove(link)
+    os.symlink(name, link)
+    return master, slave
+
+
+def detach(link, master, slave):
+    os.remove(link)
+    os.close(master)
+    os.close(slave)
+
+
+def run_case(outage_s, workdir):
+    link = os.path.join(workdir, "ttyTX")
+    master, slave = attach(link)
+    sink = AsyncLogSink(workdir)
+    sink.start()
+    receiver = MotionReceiver(
+        port=link, baudrate=9600, use_mock_if_fail=False, log_sink=sink
+    )
+    supervisor = receiver.channels[0].supervisor
+    supervisor.discover = False
+    supervisor.cache = None
+    receiver.start()
+
+    transmitter = FakeTransmitter(master, rate=RATE, duration_s=1.0)
+    transmitter.start()
+    transmitter.join()
+
+    detach(link, master, slave)
+    time.sleep(outage_s)
+    master, slave = attach(link)
+    back_at = time.monotonic()
+
+    transmitter = FakeTransmitter(master, rate=RATE, duration_s=2.0 + outage_s)
+    transmitter.start()
+    while receiver.serial is None and time.monotonic() - back_at < 60:
+        time.sleep(0.005)
+    reopened_after = time.monotonic() - back_at
+    transmitter.join()
+    time.sleep(0.2)
+
+    receiver.stop()
+    receiver.join(timeout=2)
+    sink.stop()
+    detach(link, master, slave)
+    return {
+        "reconnect_s": supervisor.last_reconnect_s or 0.0,
+        "wait_after_back_s": reopened_after,
+    }
+
+
+def main():
+    # the outages are deliberate; keep their log lines off the table
+    setup_logging("CRITICAL")
+    print(f"{'outage s':>9} {'reconnect s':>12} {'wait after back s':>18}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for outage_s in OUTAGES_S:
+            r = run_case(outage_s, workdir)
+            print(
+                f"{outage_s:>9.1f} {r['reconnect_s']:>12.2f}"
+                f" {r['wait_after_back_s']:>18.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
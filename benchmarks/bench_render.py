@@ -0,0 +1,123 @@
+"""
+UI rendering per tick: every page updated with unconditional widget
+calls (as before) versus the raised page only, through WidgetBindings
+that skip unchanged values.
+
+Builds the real pages under a Tk root with a small stand-in for the
+parts of MotionApp they read, then drives --ticks ticks of synthetic
+data (a motion sample per tick, slowly drifting metrics) and reports
+widget updates per tick and the Tk thread CPU time per tick, including
+the idle redraws Tk runs afterwards. Needs a display (on a headless Pi,
+run it under xvfb-run).
+
+Run from the project root:
+    python -m benchmarks.bench_render
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+import tkinter as tk
+
+from components import RenderScheduler, WidgetBinding
+from pages import DashboardPage, GraphsPage, LogsPage, MonitoringPage, PowerOnPage
+from utils.device_registry import DeviceRegistry
+from utils.link_stats import LinkStats
+from utils.measurement_history import MeasurementHistory, MeasurementRow
+from utils.ring_buffer import RingBuffer, TimedRingBuffer
+from utils.rollups import Rollups
+
+
+class Controller:
+    """
+    The parts of MotionApp the pages read.
+    """
+
+    def __init__(self, rollups):
+        self.devices = DeviceRegistry()
+        self.selected_device = None
+        self.system_on = True
+        self.background_thread = None
+        self.link_stats = LinkStats()
+        self.rollups = rollups
+        self.measurement_history = MeasurementHistory(600)
+        self.renderer = None
+
+    def select_device(self, key):
+        pass
+
+
+def run(root, pages, name, raised, visible_only, skip_unchanged, ticks):
+    WidgetBinding.skip_unchanged = skip_unchanged
+    for page in pages.values():
+        for value in vars(page).values():
+            if isinstance(value, WidgetBinding):
+                value.invalidate()
+    renderer = RenderScheduler(pages, visible_only=visible_only)
+    pages[raised].controller.renderer = renderer
+    pages[raised].tkraise()
+    renderer.show(raised)
+    root.update()
+
+    rng = random.Random(1)
+    motion = TimedRingBuffer(50)
+    logs = RingBuffer(10, None)
+    cpu = 20.0
+    updates, skipped = WidgetBinding.updates, WidgetBinding.skipped
+    start = time.thread_time()
+    for i in range(ticks):
+        value = 1.0 if (i // 10) % 2 else 0.0
+        motion.append(value)
+        cpu = min(100.0, max(0.0, cpu + rng.gauss(0, 0.05)))
+        row = MeasurementRow(time.time(), value, None, cpu, 45.0, 61.0, 0.0, 0.0)
+        renderer.render(row, motion, logs)
+        root.update()
+    cpu_ms = (time.thread_time() - start) * 1000 / ticks
+    print(
+        f"{name:44} {(WidgetBinding.updates - updates) / ticks:8.1f}"
+        f" {(WidgetBinding.skipped - skipped) / ticks:8.1f} {cpu_ms:9.2f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="UI render benchmark")
+    parser.add_argument("--ticks", type=int, default=200)
+    args = parser.parse_args()
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        sys.exit(f"needs a display ({e}); try: xvfb-run python -m {__spec__.name}")
+    root.geometry("480x300")
+
+    with tempfile.TemporaryDirectory() as directory:
+        controller = Controller(Rollups(directory))
+        pages = {}
+        for page_class in (
+            PowerOnPage,
+            DashboardPage,
+            MonitoringPage,
+            GraphsPage,
+            LogsPage,
+        ):
+            page = page_class(parent=root, controller=controller)
+            page.grid(row=0, column=0, sticky="nsew")
+            pages[page_class.__name__] = page
+
+        print(f"{'per tick':44} {'updates':>8} {'skipped':>8} {'CPU ms':>9}")
+        cases = [
+            ("all pages, every call (before)", "DashboardPage", False, False),
+            ("raised Dashboard, bindings", "DashboardPage", True, True),
+            ("raised Monitoring, bindings", "MonitoringPage", True, True),
+            ("raised Graphs, bindings", "GraphsPage", True, True),
+        ]
+        for name, raised, visible_only, skip in cases:
+            run(root, pages, name, raised, visible_only, skip, args.ticks)
+        controller.rollups.close()
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Per-tick allocation benchmark: deque + list() copies versus RingBuffer.
+
+Simulates the UI tick: the receiver appends a few samples, then the tick
+hands the motion and log history to five pages. The old path copies both
+deques with list() once per tick and the graph slices the copy; the new
+path passes the ring buffers and only the graph copies its window via
+tail(). Allocated bytes are measured with tracemalloc.
+
+Run from the project root:
+    python -m benchmarks.bench_ring
+"""
+
+import time
+import tracemalloc
+from collections import deque
+
+from utils.ring_buffer import RingBuffer
+
+TICKS = 2000
+PAGES = 5
+SAMPLES_PER_TICK = 2
+LOGS_LENGTH = 10
+
+
+def deque_tick(motion, logs, window):
+    motion_series, log_series = list(motion), list(logs)
+    for _ in range(PAGES):
+        pass
+    y = motion_series[-window:]
+    x = list(range(len(y)))
+    return x, y, log_series
+
+
+def ring_tick(motion, logs, window, state):
+    for _ in range(PAGES):
+        pass
+    if motion.write_index != state["cursor"]:
+        state["cursor"] = motion.write_index
+        y = motion.tail(window)
+        return range(len(y)), y
+    return None
+
+
+def measure(window):
+    motion_d = deque([0.0] * window, maxlen=window)
+    logs_d = deque(maxlen=LOGS_LENGTH)
+    motion_r = RingBuffer(window, "d", fill=0.0)
+    logs_r = RingBuffer(LOGS_LENGTH, None)
+    state = {"cursor": None}
+
+    results = {}
+    for name, tick, buffers in (
+        ("deque", lambda: deque_tick(motion_d, logs_d, window), (motion_d, logs_d)),
+        ("ring", lambda: ring_tick(motion_r, logs_r, window, state), (motion_r, logs_r)),
+    ):
+        motion, logs = buffers
+        tracemalloc.start()
+        allocated = 0
+        start = time.perf_counter()
+        for i in range(TICKS):
+            for _ in range(SAMPLES_PER_TICK):
+                motion.append(float(i & 1))
+            logs.append("MOTION DETECTED")
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            tick()
+            allocated += tracemalloc.get_traced_memory()[1] - before
+        elapsed = time.perf_counter() - start
+        tracemalloc.stop()
+        results[name] = (allocated / TICKS, elapsed / TICKS * 1e6)
+    return results
+
+
+def main():
+    print(f"{'window':>7} {'buffer':>7} {'bytes/tick':>11} {'us/tick':>8}")
+    for window in (50, 1000, 10000):
+        for name, (per_tick, us) in measure(window).items():
+            print(f"{window:>7} {name:>7} {per_tick:>11.0f} {us:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Rollups: cost of keeping minute/hour/day buckets current, and what a long
+span costs to graph from them versus rescanning the raw samples.
+
+Feeds one day of 10 Hz motion samples (in 1 s ticks, as the HMI does) and
+per-second measurement rows, reports the update cost per sample, then
+times the motion-active series for a day from the minute tier against
+recomputing it from the raw sample store.
+
+Run from the project root:
+    python -m benchmarks.bench_rollups
+"""
+
+import tempfile
+import time
+from pathlib import Path
+
+from utils.measurement_history import MeasurementRow
+from utils.measurements import decode_samples, encode_samples
+from utils.rollups import Rollups
+from utils.segment_store import SegmentStore
+
+DAY_S = 86400
+RATE = 10
+REPEAT = 20
+
+
+def feed(rollups, samples, start):
+    sample_s = 0.0
+    for second in range(DAY_S):
+        t = start + second
+        times = [t + i / RATE for i in range(RATE)]
+        values = [float((second // 20) % 3 == 0)] * RATE
+        q = time.perf_counter()
+        rollups.add_samples(values, times)
+        sample_s += time.perf_counter() - q
+        rollups.add_measurement(MeasurementRow(t, 0.0, t, 12.0, 48.0, 61.0, 0.4, 1.2))
+        samples.append(encode_samples(values, times), times[-1])
+    return sample_s
+
+
+def active_from_raw(store, since):
+    # what a graph would need without rollups: every sample of the span
+    active = {}
+    last_t, last_v = None, 0.0
+    for _, payload in store.records(since=since):
+        values, times = decode_samples(payload)
+        for value, t in zip(values, times):
+            if last_v and last_t is not None:
+                minute = t - t % 60
+                active[minute] = active.get(minute, 0.0) + min(t - last_t, 5.0)
+            last_t, last_v = t, value
+    return active
+
+
+def timed(fn):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        result = fn()
+    return (time.perf_counter() - start) / REPEAT * 1000, result
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        rollups = Rollups(Path(directory) / "rollups")
+        samples = SegmentStore(Path(directory) / "samples")
+        start = time.time() - DAY_S
+        sample_s = feed(rollups, samples, start)
+        print(f"update: {sample_s / (DAY_S * RATE) * 1e6:.2f} us per motion sample")
+
+        rollup_ms, buckets = timed(lambda: rollups.series("minute", since=start))
+        raw_ms, active = timed(lambda: active_from_raw(samples, start))
+        print(
+            f"day graph from minute rollups: {rollup_ms:8.2f} ms,"
+            f" {len(buckets)} buckets"
+        )
+        print(
+            f"day graph from raw samples:    {raw_ms:8.2f} ms,"
+            f" {DAY_S * RATE} samples"
+        )
+        print(
+            f"motion active: {sum(b.active_s for b in buckets):.0f} s (rollups),"
+            f" {sum(active.values()):.0f} s (raw)"
+        )
+        rollups.close()
+        samples.close()
+
+
+if __name__ == "__main__":
+    main()
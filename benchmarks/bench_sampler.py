@@ -0,0 +1,109 @@
+"""
+UI tick cost of the system metrics: psutil on the Tk thread versus the
+background SystemSampler.
+
+1. The cost of each psutil read the tick used to make.
+2. The metrics part of a tick, timed on this thread: the old inline
+   reads (including the 100 ms sleep between the two network counter
+   reads) versus picking up the sampler's latest snapshot.
+3. What the sampler itself costs: its thread CPU time per second with the
+   default cadences.
+
+Run from the project root:
+    python -m benchmarks.bench_sampler
+"""
+
+import statistics
+import time
+
+import psutil
+
+from utils.measurement_history import MeasurementRow
+from utils.system_sampler import SystemSampler
+
+CALLS = 200
+LEGACY_TICKS = 20
+TICKS = 2000
+SAMPLER_S = 10.0
+
+
+def per_call(fn):
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        fn()
+    return (time.perf_counter() - start) / CALLS * 1e6
+
+
+def legacy_tick():
+    # what _periodic_update did on the Tk thread
+    cpu = psutil.cpu_percent(interval=None)
+    ram = psutil.virtual_memory().percent
+    disk = psutil.disk_usage("/").percent
+    net1 = psutil.net_io_counters()
+    time.sleep(0.1)
+    net2 = psutil.net_io_counters()
+    sent_kbps = (net2.bytes_sent - net1.bytes_sent) / 1024.0 / 0.1
+    recv_kbps = (net2.bytes_recv - net1.bytes_recv) / 1024.0 / 0.1
+    return MeasurementRow(time.time(), 0.0, None, cpu, ram, disk, sent_kbps, recv_kbps)
+
+
+def sampler_tick(sampler):
+    system = sampler.snapshot
+    return MeasurementRow(
+        time.time(),
+        0.0,
+        None,
+        system.cpu,
+        system.ram,
+        system.disk,
+        system.net_up,
+        system.net_down,
+    )
+
+
+def timed(fn, n):
+    times = []
+    for _ in range(n):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    times.sort()
+    return statistics.median(times), times[int(len(times) * 0.99)], times[-1]
+
+
+def main():
+    print("psutil read cost:")
+    for name, fn in (
+        ("cpu_percent", lambda: psutil.cpu_percent(interval=None)),
+        ("virtual_memory", psutil.virtual_memory),
+        ("disk_usage", lambda: psutil.disk_usage("/")),
+        ("net_io_counters", psutil.net_io_counters),
+    ):
+        print(f"  {name:16} {per_call(fn):8.1f} us")
+
+    sampler = SystemSampler()
+    sampler.start()
+    time.sleep(1.5)
+    print("\nmetrics part of a UI tick (ms):       p50      p99      max")
+    for name, fn, n in (
+        ("inline psutil + sleep", legacy_tick, LEGACY_TICKS),
+        ("sampler snapshot", lambda: sampler_tick(sampler), TICKS),
+    ):
+        p50, p99, worst = timed(fn, n)
+        print(f"  {name:32} {p50:8.3f} {p99:8.3f} {worst:8.3f}")
+
+    cpu, rounds = sampler.cpu_s, sampler.rounds
+    time.sleep(SAMPLER_S)
+    cpu = sampler.cpu_s - cpu
+    rounds = sampler.rounds - rounds
+    sampler.stop()
+    print(
+        f"\nsampler thread: {rounds / SAMPLER_S:.1f} rounds/s,"
+        f" {cpu / SAMPLER_S * 1000:.2f} ms CPU per second"
+        f" ({cpu / SAMPLER_S * 100:.2f} % of one core)"
+    )
+    print(f"last snapshot: {sampler.snapshot}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+SQLite time-series store: batched insert throughput and range queries.
+
+Writes --rows motion samples (default 10M) spread over 8 transmitters at
+10 Hz through SQLiteStore's writer thread, then times random one-hour
+range queries on one transmitter: counting motion events and fetching the
+samples. The database lives in a temporary directory.
+
+Run from the project root:
+    python -m benchmarks.bench_sqlite
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from utils.sqlite_store import SQLiteStore
+
+DEVICES = [f"/dev/ttyUSB{i}" for i in range(8)]
+PERIOD_S = 0.1
+CHUNK = 1000
+QUERIES = 200
+WINDOW_S = 3600
+
+
+def fill(db, rows):
+    rng = random.Random(1)
+    start = time.time() - rows // len(DEVICES) * PERIOD_S
+    per_device = rows // len(DEVICES)
+    value = 0.0
+    for offset in range(0, per_device, CHUNK):
+        n = min(CHUNK, per_device - offset)
+        times = [start + (offset + i) * PERIOD_S for i in range(n)]
+        for device in DEVICES:
+            values = []
+            for _ in range(n):
+                # motion comes and goes every few seconds
+                if rng.random() < 0.02:
+                    value = 1.0 - value
+                values.append(value)
+            # keep the queue short instead of letting it drop entries
+            while db.entries.qsize() > 64:
+                time.sleep(0.001)
+            db.add_samples(device, values, times)
+    return start, start + per_device * PERIOD_S
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def time_queries(fn, start, end):
+    rng = random.Random(2)
+    times = []
+    results = []
+    for _ in range(QUERIES):
+        t0 = rng.uniform(start, end - WINDOW_S)
+        q = time.perf_counter()
+        results.append(fn(t0, t0 + WINDOW_S))
+        times.append((time.perf_counter() - q) * 1000)
+    return times, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite store benchmark")
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.db")
+        db = SQLiteStore(path, batch_rows=50_000)
+        db.start()
+        t = time.perf_counter()
+        start, end = fill(db, args.rows)
+        db.stop(timeout=600)
+        elapsed = time.perf_counter() - t
+        stats = db.stats()
+        size_mb = sum(
+            os.path.getsize(os.path.join(directory, f)) for f in os.listdir(directory)
+        ) / 1e6
+
+        print(f"{stats['written']} samples, {len(DEVICES)} devices, {size_mb:.0f} MB")
+        print(
+            f"insert: {stats['written'] / elapsed:,.0f} rows/s"
+            f" in {stats['transactions']} transactions, {stats['dropped']} dropped"
+        )
+
+        device = DEVICES[3]
+        for name, fn in (
+            ("count_events 1 h", lambda a, b: db.count_events(a, b, device)),
+            ("samples 1 h", lambda a, b: len(db.samples(a, b, device))),
+            ("count_events 1 h, all", lambda a, b: db.count_events(a, b)),
+        ):
+            times, results = time_queries(fn, start, end)
+            print(
+                f"{name:24} p50 {statistics.median(times):7.2f} ms"
+                f"  p99 {percentile(times, 0.99):7.2f} ms"
+                f"  (avg {statistics.mean(results):,.0f} per window)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Measurement history: growing list of dicts versus the segment store.
+
+Reports RAM used by one day of per-second measurements kept as a list of
+dicts (the old `measurement_history`) against the bounded RAM window plus
+on-disk bytes of the segment store, the cost of one append, and whether a
+writer killed with SIGKILL mid-run leaves a store that reopens cleanly.
+Torn and half-written records are tested in tests/test_segment_store.py.
+
+Run from the project root:
+    python -m benchmarks.bench_store
+"""
+
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+from utils.measurement_history import MeasurementHistory, MeasurementRow
+from utils.measurements import decode_measurement, encode_measurement
+from utils.segment_store import SegmentStore
+
+ROWS = 86400  # one day at the default 1 s tick
+WINDOW = 3600
+
+
+def make_metrics(i):
+    now = datetime.now()
+    status = {
+        "motion": float(i & 1),
+        "cpu": 12.5,
+        "ram": 48.1,
+        "disk": 61.0,
+        "net_up": 0.4,
+        "net_down": 1.2,
+        "timestamp": now,
+        "version": "v1",
+    }
+    return dict(status, motion_time=now, transmitter_status=status)
+
+
+def ram_list():
+    tracemalloc.start()
+    history = [make_metrics(i) for i in range(ROWS)]
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return used, len(history)
+
+
+def ram_store(directory):
+    tracemalloc.start()
+    history = MeasurementHistory(WINDOW)
+    store = SegmentStore(directory)
+    start = time.perf_counter()
+    for i in range(ROWS):
+        now = time.time()
+        row = MeasurementRow(now, float(i & 1), now, 12.5, 48.1, 61.0, 0.4, 1.2)
+        history.append(row)
+        store.append(encode_measurement(row), now)
+    elapsed = time.perf_counter() - start
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    store.close()
+    return used, store.size_bytes(), elapsed / ROWS * 1e6
+
+
+WRITER = """
+import sys
+from utils.segment_store import SegmentStore
+store = SegmentStore(sys.argv[1], max_segment_bytes=64 * 1024)
+payload = bytes(56)
+while True:
+    store.append(payload)
+"""
+
+
+def crash_check(directory):
+    writer = subprocess.Popen([sys.executable, "-c", WRITER, directory])
+    time.sleep(1.0)
+    os.kill(writer.pid, signal.SIGKILL)
+    writer.wait()
+
+    store = SegmentStore(directory)
+    count = sum(1 for _ in store.records())
+    store.close()
+    return count, store.truncated_bytes
+
+
+def main():
+    list_bytes, rows = ram_list()
+    with tempfile.TemporaryDirectory() as directory:
+        store_ram, disk_bytes, append_us = ram_store(directory)
+        rows_back = sum(
+            1
+            for ts, payload in SegmentStore(directory).records()
+            if decode_measurement(ts, payload)
+        )
+
+    print(f"{rows} rows (one day at 1 s)")
+    print(f"list of dicts in RAM: {list_bytes / 1e6:8.1f} MB")
+    print(f"store, RAM window:    {store_ram / 1e6:8.1f} MB ({WINDOW} rows)")
+    print(f"store, on disk:       {disk_bytes / 1e6:8.1f} MB")
+    print(f"append:               {append_us:8.1f} us/row")
+    print(f"rows read back:       {rows_back}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        count, cut = crash_check(directory)
+    print(f"after SIGKILL: {count} records recovered, {cut} bytes of torn record cut")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Warm restart from the memory-mapped ring files: startup time and crash
+recovery.
+
+1. Startup: restoring the recent window (MOTION_HISTORY_LENGTH samples,
+   MEASUREMENT_WINDOW rows) by mapping the ring files, versus reading the
+   last hour back from the segment store.
+2. Crashes: a writer appending as fast as it can is killed with SIGKILL
+   at random points, repeatedly; after each kill the ring must reopen
+   with a contiguous run of intact records and the writer continues.
+
+The torn-write states a power cut can leave behind are tested in
+tests/test_mmap_ring.py.
+
+Run from the project root:
+    python -m benchmarks.bench_warm_start
+"""
+
+import os
+import random
+import signal
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from utils.measurement_history import MeasurementRow
+from utils.measurements import decode_measurement, encode_measurement
+from utils.mmap_ring import MmapRing
+from utils.recent_history import RecentHistory
+from utils.segment_store import SegmentStore
+
+MOTION = 50
+WINDOW = 3600
+CRASHES = 20
+CAPACITY = 1000
+RECORD = struct.Struct("<Q56x")  # payload: its own sequence number
+
+WRITER = """
+import struct, sys
+from utils.mmap_ring import MmapRing
+record = struct.Struct("<Q56x")
+ring = MmapRing(sys.argv[1], %d, record.size)
+print(ring.write_index, flush=True)
+while True:
+    ring.append(record.pack(ring.write_index))
+""" % CAPACITY
+
+
+def startup(directory):
+    recent = RecentHistory(directory / "recent", MOTION, WINDOW)
+    store = SegmentStore(directory / "history")
+    now = time.time() - WINDOW
+    for i in range(WINDOW):
+        row = MeasurementRow(now + i, 1.0, now + i, 12.0, 48.0, 61.0, 0.4, 1.2)
+        recent.add_measurement(row)
+        store.append(encode_measurement(row), row.timestamp)
+    recent.add_samples([1.0] * MOTION, [now + i for i in range(MOTION)])
+    recent.close()
+    store.close()
+
+    start = time.perf_counter()
+    recent = RecentHistory(directory / "recent", MOTION, WINDOW)
+    values, _ = recent.samples()
+    rows = recent.measurements()
+    ring_ms = (time.perf_counter() - start) * 1000
+    recent.close()
+
+    start = time.perf_counter()
+    store = SegmentStore(directory / "history")
+    parsed = [
+        decode_measurement(ts, payload)
+        for ts, payload in store.records(since=time.time() - 2 * WINDOW)
+    ]
+    store_ms = (time.perf_counter() - start) * 1000
+    print(
+        f"restore from ring files: {ring_ms:7.2f} ms"
+        f" ({len(values)} samples, {len(rows)} rows)"
+    )
+    print(f"parse segment store:     {store_ms:7.2f} ms ({len(parsed)} rows)")
+
+
+def check(ring):
+    """
+    The recovered run is contiguous and every payload is its own seq.
+    """
+    seqs = [RECORD.unpack(raw)[0] for raw in ring.records()]
+    expected = list(range(ring.start_index, ring.write_index))
+    return seqs == expected and len(seqs) <= CAPACITY
+
+
+def crashes(directory):
+    path = directory / "crash.ring"
+    last = 0
+    failures = 0
+    rng = random.Random(3)
+    for _ in range(CRASHES):
+        writer = subprocess.Popen(
+            [sys.executable, "-c", WRITER, str(path)], stdout=subprocess.PIPE
+        )
+        started_at = int(writer.stdout.readline())
+        time.sleep(rng.uniform(0.05, 0.3))
+        os.kill(writer.pid, signal.SIGKILL)
+        writer.wait()
+        writer.stdout.close()
+
+        ring = MmapRing(path, CAPACITY, RECORD.size)
+        ok = check(ring) and started_at >= last and ring.write_index >= started_at
+        failures += not ok
+        last = ring.write_index
+        ring.close()
+    print(
+        f"SIGKILL x{CRASHES}: {CRASHES - failures} clean recoveries,"
+        f" {last} records written in total"
+    )
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        startup(directory)
+        crashes(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Record raw serial traffic and play it back through MotionReceiver.
+
+A capture made in the field reproduces an incident, or serves as a
+deterministic load test on any Linux box without XBee hardware.
+
+Run from the project root:
+    python -m benchmarks.capture_replay record /dev/ttyAMA0 field.cap
+    python -m benchmarks.capture_replay replay field.cap --speed 10
+    python -m benchmarks.capture_replay replay field.cap --speed 0
+
+The HMI itself records when CAPTURE_FILE is set in config.json, and plays a
+capture when a port is named "replay:<file>".
+"""
+
+import argparse
+import time
+
+import serial
+
+from utils.motion_receiver import MotionReceiver
+from utils.serial_capture import CaptureWriter, REPLAY_PREFIX
+
+
+def record(port, path, baudrate):
+    ser = serial.Serial(port, baudrate, timeout=1)
+    with CaptureWriter(path) as writer:
+        print(f"Recording {port} to {path}, Ctrl+C to stop")
+        try:
+            while True:
+                chunk = ser.read(ser.in_waiting or 1)
+                if chunk:
+                    writer.write(chunk)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            ser.close()
+    print(f"{writer.chunks} chunks, {writer.bytes} bytes")
+
+
+def replay(path, speed):
+    receiver = MotionReceiver(
+        port=REPLAY_PREFIX + path, baudrate=None, use_mock_if_fail=False
+    )
+    receiver.replay_speed = speed
+    t0 = time.monotonic()
+    receiver.start()
+    while not receiver.serial or not receiver.serial.finished:
+        if not receiver.is_alive():
+            break
+        time.sleep(0.05)
+    # let the last chunk go through the framer
+    time.sleep(0.2)
+    receiver.stop()
+    receiver.join(timeout=2.0)
+    elapsed = time.monotonic() - t0
+
+    snap = receiver.stats.snapshot()
+    print(f"replayed {path} at {'max' if not speed else f'{speed}x'} in {elapsed:.2f}s")
+    print(f"frames: {snap['frames_total']}  bytes: {snap['bytes_total']}")
+    print(f"parse errors: {receiver.parse_errors}")
+    print(f"motion samples: {receiver.motion_buffer.write_index}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n\n")[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    rec = sub.add_parser("record", help="capture a serial port to a file")
+    rec.add_argument("port")
+    rec.add_argument("path")
+    rec.add_argument("--baudrate", type=int, default=9600)
+    rep = sub.add_parser("replay", help="play a capture through the receiver")
+    rep.add_argument("path")
+    rep.add_argument(
+        "--speed", type=float, default=1.0, help="N times real time, 0 = max"
+    )
+    args = parser.parse_args()
+
+    if args.command == "record":
+        record(args.port, args.path, args.baudrate)
+    else:
+        replay(args.path, args.speed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Synthetic transmitter writing to the master side of a pseudo-terminal.
+
+The receiver opens the slave side as if it were the XBee UART. Message
+rate, burst profile, message mix and error injection are configurable, and
+the send time of every message is kept so a benchmark can measure
+end-to-end latency.
+
+POSIX only.
+"""
+
+import json
+import os
+import random
+import threading
+import time
+
+from utils import protocol
+
+DEFAULT_MIX = {"MOTION": 1.0}
+
+PERF_STATUS = {
+    "cpu": 12.5,
+    "ram": 48.1,
+    "disk": 61.0,
+    "net_up": 0.4,
+    "net_down": 1.2,
+    "version": "Raspberypi 1b+ v1.2",
+}
+
+
+def open_pty():
+    """
+    Return (master fd, slave fd, slave device path).
+    """
+    master, slave = os.openpty()
+    return master, slave, os.ttyname(slave)
+
+
+class FakeTransmitter(threading.Thread):
+    """
+    Sends `rate` messages per second (None = as fast as the pty accepts)
+    for `duration_s`. With `burst` > 1 the same average rate is sent as
+    back-to-back bursts of that many messages. `mix` maps message types to
+    relative weights and `error_rate` is the share of messages that get a
+    corrupted byte or a burst of line noise. `drop_rate` and `dup_rate`
+    simulate a radio that loses or repeats whole frames.
+
+    `sent_at` maps a message key to its send time: the count of binary
+    frames encoded before it (the frame's SEQ is this count wrapped to 16
+    bits), or the counter carried as the value of text MOTION lines.
+    """
+
+    def __init__(
+        self,
+        fd,
+        rate=100,
+        duration_s=5.0,
+        burst=1,
+        mix=None,
+        error_rate=0.0,
+        drop_rate=0.0,
+        dup_rate=0.0,
+        wire="binary",
+        device=0,
+        seed=1,
+    ):
+        super().__init__(daemon=True)
+        self.fd = fd
+        self.rate = rate
+        self.duration_s = duration_s
+        self.burst = max(1, burst)
+        self.mix = mix or DEFAULT_MIX
+        self.error_rate = error_rate
+        self.drop_rate = drop_rate
+        self.dup_rate = dup_rate
+        self.wire = wire
+        self.encoder = protocol.FrameEncoder(device=device)
+        self.random = random.Random(seed)
+        self.running = False
+
+        self.sent = 0
+        self.sent_bytes = 0
+        self.corrupted = 0
+        self.dropped = 0
+        self.duplicated = 0
+        self.sent_at = {}
+        self.frames = 0
+        self.elapsed_s = 0.0
+
+    def encode(self, type_name):
+        """
+        Return (key, bytes) for one message; key is None when the message
+        cannot be matched on the receive side.
+        """
+        if type_name == "MOTION":
+            value = self.sent & 1
+        elif type_name == "LOGS":
+            value = f"synthetic log line {self.sent}"
+        else:
+            value = PERF_STATUS
+
+        if self.wire == "binary":
+            # unlike SEQ this never wraps, so long runs match up
+            key = self.frames
+            self.frames += 1
+            return key, self.encoder.encode(type_name, value)
+
+        if type_name == "MOTION":
+            # the counter doubles as the motion value so lines can be matched
+            return self.sent, f"MOTION:{self.sent}\n".encode()
+        if isinstance(value, dict):
+            value = json.dumps(value)
+        return None, f"{type_name}:{value}\n".encode()
+
+    def corrupt(self, data):
+        self.corrupted += 1
+        if self.random.random() < 0.5:
+            i = self.random.randrange(len(data))
+            return data[:i] + bytes([data[i] ^ 0x5A]) + data[i + 1 :]
+        noise = bytes(self.random.randrange(256) for _ in range(8))
+        return noise + data
+
+    def next_type(self):
+        types = list(self.mix)
+        return self.random.choices(types, weights=[self.mix[t] for t in types])[0]
+
+    def run(self):
+        self.running = True
+        interval = self.burst / self.rate if self.rate else 0.0
+        t0 = time.monotonic()
+        deadline = t0 + self.duration_s
+        next_burst = t0
+        while self.running and time.monotonic() < deadline:
+            for _ in range(self.burst):
+                key, data = self.encode(self.next_type())
+                if self.error_rate and self.random.random() < self.error_rate:
+                    data = self.corrupt(data)
+                    key = None
+                if self.drop_rate and self.random.random() < self.drop_rate:
+                    self.dropped += 1
+                    self.sent += 1
+                    continue
+                if self.dup_rate and self.random.random() < self.dup_rate:
+                    self.duplicated += 1
+                    data += data
+                now = time.monotonic()
+                if key is not None:
+                    self.sent_at[key] = now
+                try:
+                    os.write(self.fd, data)
+                except OSError:
+                    self.running = False
+                    break
+                self.sent += 1
+                self.sent_bytes += len(data)
+            if interval:
+                next_burst += interval
+                time.sleep(max(0.0, next_burst - time.monotonic()))
+        self.elapsed_s = time.monotonic() - t0
+
+    def stop(self):
+        self.running = False
@@ -1 +1,5 @@
 from .preferences_window import PreferencesWindow
+from .device_selector import DeviceSelector
+from .export_progress import ExportProgress
+from .rendering import RenderScheduler, WidgetBinding
+from .canvas_plot import CanvasPlot
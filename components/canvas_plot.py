@@ -0,0 +1,241 @@
+import math
+import tkinter as tk
+
+# space around the plot area for the title, labels and ticks (px)
+MARGIN_LEFT = 40
+MARGIN_TOP = 18
+MARGIN_RIGHT = 10
+MARGIN_BOTTOM = 30
+TICK_PX = 4
+MARKER_RADIUS = 3
+
+
+def nice_ticks(lo, hi, count=5):
+    """
+    About `count` round tick values (1, 2 or 5 times a power of ten
+    apart) between `lo` and `hi`.
+    """
+    span = hi - lo
+    if span <= 0:
+        return [lo]
+    raw = span / count
+    magnitude = 10 ** math.floor(math.log10(raw))
+    step = next(m * magnitude for m in (1, 2, 5, 10) if m * magnitude >= raw)
+    first = math.ceil(lo / step) * step
+    return [first + i * step for i in range(int((hi - first) / step + 1e-9) + 1)]
+
+
+def _tick_label(value):
+    return f"{value:g}" if abs(value) >= 1e-9 else "0"
+
+
+# -----------------------------
+# Native canvas plot
+# -----------------------------
+class CanvasPlot(tk.Canvas):
+    """
+    Line and step plots drawn with native canvas items, as a light
+    replacement for a matplotlib figure.
+
+    Every item (frame, labels, ticks, the line and its markers) is created
+    once and moved with `coords()` when the data changes, so an update is
+    one coords call for the line plus one per marker, and Tk only redraws
+    the damaged area; nothing is rasterized in Python. Tick items are only
+    touched when the axis limits or the widget size change.
+    """
+
+    def __init__(
+        self,
+        parent,
+        bg="#252526",
+        fg="#ffffff",
+        color="#007acc",
+        font=("Segoe UI", 7),
+        **kwargs,
+    ):
+        super().__init__(parent, bg=bg, highlightthickness=0, **kwargs)
+        self.fg = fg
+        self.color = color
+        self.font = font
+
+        self.xlim = (0.0, 1.0)
+        self.ylim = (0.0, 1.0)
+        self.yticks = ()
+        self.marker = False
+        self.step = False
+        self.x = []
+        self.y = []
+
+        self._area = (0, 0, 1, 1)  # left, top, right, bottom of the plot area
+        self._frame = self.create_rectangle(0, 0, 0, 0, outline="#666666")
+        self._title = self.create_text(
+            0, 0, text="", fill=fg, font=(font[0], font[1] + 1), anchor="n"
+        )
+        self._xlabel = self.create_text(0, 0, text="", fill=fg, font=font, anchor="s")
+        self._ylabel = self.create_text(
+            0, 0, text="", fill=fg, font=font, anchor="n", angle=90
+        )
+        self._line = self.create_line(0, 0, 0, 0, fill=color, width=2, state="hidden")
+        self._line_shown = False
+        self._markers = []
+        self._markers_shown = 0
+        # per axis: (tick mark, grid line or None, label) per tick, reused
+        self._ticks = {"x": [], "y": []}
+        self._ticks_shown = {"x": 0, "y": 0}
+        self._xticks_for = None
+
+        self.bind("<Configure>", self._on_resize)
+
+    # -----------------------------
+    # Public interface (shared with MatplotlibPlot)
+    # -----------------------------
+    def set_axes(
+        self,
+        title="",
+        xlabel="",
+        ylabel="",
+        ylim=(0.0, 1.0),
+        yticks=(),
+        marker=False,
+        step=False,
+    ):
+        """
+        Labels, fixed y range and ticks; `marker` draws a dot per point,
+        `step` holds each value until the next x (steps-post).
+        """
+        self.ylim = ylim
+        self.yticks = tuple(yticks)
+        self.marker = marker
+        self.step = step
+        self.itemconfigure(self._title, text=title)
+        self.itemconfigure(self._xlabel, text=xlabel)
+        self.itemconfigure(self._ylabel, text=ylabel)
+        self._layout()
+
+    def set_data(self, x, y, xlim=None):
+        self.x = x
+        self.y = y
+        if xlim is not None and tuple(xlim) != self.xlim:
+            self.xlim = tuple(xlim)
+            self._draw_xticks()
+        self._draw_data()
+
+    # -----------------------------
+    # Drawing
+    # -----------------------------
+    def _on_resize(self, event):
+        self._layout()
+
+    def _layout(self):
+        width, height = self.winfo_width(), self.winfo_height()
+        left, top = MARGIN_LEFT, MARGIN_TOP
+        right = max(width - MARGIN_RIGHT, left + 1)
+        bottom = max(height - MARGIN_BOTTOM, top + 1)
+        self._area = (left, top, right, bottom)
+
+        self.coords(self._frame, left, top, right, bottom)
+        self.coords(self._title, (left + right) / 2, 2)
+        self.coords(self._xlabel, (left + right) / 2, height - 1)
+        self.coords(self._ylabel, 2, (top + bottom) / 2)
+
+        items = self._tick_items("y", len(self.yticks))
+        for (mark, grid, label), value in zip(items, self.yticks):
+            py = self._py(value)
+            self.coords(mark, left - TICK_PX, py, left, py)
+            self.coords(grid, left, py, right, py)
+            self.coords(label, left - TICK_PX - 2, py)
+            self.itemconfigure(label, text=_tick_label(value))
+        self._xticks_for = None
+        self._draw_xticks()
+        self._draw_data()
+
+    def _tick_items(self, axis, count):
+        pool = self._ticks[axis]
+        while len(pool) < count:
+            # y ticks get a grid line and a label left of the axis
+            grid = axis == "y"
+            pool.append(
+                (
+                    self.create_line(0, 0, 0, 0, fill="#888888", state="hidden"),
+                    self.create_line(
+                        0, 0, 0, 0, fill="#3c3c3c", dash=(2, 2), state="hidden"
+                    )
+                    if grid
+                    else None,
+                    self.create_text(
+                        0,
+                        0,
+                        text="",
+                        fill=self.fg,
+                        font=self.font,
+                        anchor="e" if grid else "n",
+                        state="hidden",
+                    ),
+                )
+            )
+            # the data line stays on top of the grid
+            self.tag_raise(self._line)
+        shown = self._ticks_shown[axis]
+        for i in range(min(count, shown), max(count, shown)):
+            for item in pool[i]:
+                if item is not None:
+                    self.itemconfigure(item, state="normal" if i < count else "hidden")
+        self._ticks_shown[axis] = count
+        return pool[:count]
+
+    def _draw_xticks(self):
+        key = (self.xlim, self._area)
+        if key == self._xticks_for:
+            return
+        self._xticks_for = key
+        left, _, right, bottom = self._area
+        ticks = nice_ticks(*self.xlim)
+        items = self._tick_items("x", len(ticks))
+        for (mark, _, label), value in zip(items, ticks):
+            px = self._px(value)
+            self.coords(mark, px, bottom, px, bottom + TICK_PX)
+            self.coords(label, px, bottom + TICK_PX + 1)
+            self.itemconfigure(label, text=_tick_label(value))
+
+    def _px(self, x):
+        left, _, right, _ = self._area
+        lo, hi = self.xlim
+        return left + (x - lo) / ((hi - lo) or 1.0) * (right - left)
+
+    def _py(self, y):
+        _, top, _, bottom = self._area
+        lo, hi = self.ylim
+        return bottom - (y - lo) / ((hi - lo) or 1.0) * (bottom - top)
+
+    def _draw_data(self):
+        lo, hi = self.xlim
+        points = [
+            (self._px(x), self._py(y)) for x, y in zip(self.x, self.y) if lo <= x <= hi
+        ]
+        coords = []
+        for i, (px, py) in enumerate(points):
+            if self.step and i:
+                coords += (px, points[i - 1][1])
+            coords += (px, py)
+
+        shown = len(coords) >= 4
+        if shown:
+            self.coords(self._line, coords)
+        if shown != self._line_shown:
+            self._line_shown = shown
+            self.itemconfigure(self._line, state="normal" if shown else "hidden")
+
+        count = len(points) if self.marker else 0
+        markers = self._markers
+        while len(markers) < count:
+            oval = self.create_oval(
+                0, 0, 0, 0, fill=self.color, outline="", state="hidden"
+            )
+            markers.append(oval)
+        r = MARKER_RADIUS
+        for marker, (px, py) in zip(markers, points[:count]):
+            self.coords(marker, px - r, py - r, px + r, py + r)
+        shown = self._markers_shown
+        for i in range(min(count, shown), max(count, shown)):
+            self.itemconfigure(markers[i], state="normal" if i < count else "hidden")
+        self._markers_shown = count
@@ -0,0 +1,52 @@
+import tkinter as tk
+
+from .rendering import WidgetBinding
+
+
+class DeviceSelector(tk.Frame):
+    """
+    Drop-down listing the transmitters the control station has heard from.
+    Picking one makes it the controller's selected device.
+    """
+
+    def __init__(self, parent, controller, bg="#252526"):
+        super().__init__(parent, bg=bg)
+        self.controller = controller
+        self._keys = []
+
+        tk.Label(
+            self,
+            text="Transmitter:",
+            bg=bg,
+            fg="#ffffff",
+            font=("Segoe UI", 8),
+        ).pack(side="left")
+
+        self.selected_var = tk.StringVar(value="--")
+        self.menu = tk.OptionMenu(self, self.selected_var, "--")
+        self.menu.config(
+            font=("Segoe UI", 8),
+            bg="#333333",
+            fg="#ffffff",
+            activebackground="#007acc",
+            highlightthickness=0,
+        )
+        self.menu.pack(side="left", padx=5)
+        self.bind_selected = WidgetBinding(self.selected_var)
+
+    def refresh(self):
+        devices = getattr(self.controller, "devices", None)
+        keys = devices.keys() if devices is not None else []
+        if keys != self._keys:
+            self._keys = keys
+            menu = self.menu["menu"]
+            menu.delete(0, "end")
+            for key in keys:
+                menu.add_command(label=str(key), command=lambda k=key: self._on_select(k))
+
+        selected = getattr(self.controller, "selected_device", None)
+        self.bind_selected.set(str(selected) if selected is not None else "--")
+
+    def _on_select(self, key):
+        self.controller.select_device(key)
+        self.refresh()
@@ -0,0 +1,60 @@
+import tkinter as tk
+
+from utils.constants import HMI_COLORS
+
+POLL_MS = 200
+
+
+class ExportProgress(tk.Toplevel):
+    """
+    Small dialog that follows an ExcelExporter running in the background:
+    polls its row count with `after()`, offers Cancel and calls
+    `on_done(exporter)` once the thread has finished.
+    """
+
+    def __init__(self, parent, exporter, on_done):
+        super().__init__(parent)
+        self.exporter = exporter
+        self.on_done = on_done
+        self.title("Save Measurements")
+        self.resizable(False, False)
+        self.configure(bg=HMI_COLORS["BACKGROUND"], padx=20, pady=15)
+        self.transient(parent)
+        self.protocol("WM_DELETE_WINDOW", self.cancel)
+
+        self.status = tk.Label(
+            self,
+            text="Exporting…",
+            bg=HMI_COLORS["BACKGROUND"],
+            fg=HMI_COLORS["FOREGROUND"],
+            font=("Segoe UI", 9),
+        )
+        self.status.pack(anchor="w", pady=(0, 10))
+
+        self.btn_cancel = tk.Button(
+            self,
+            text="Cancel",
+            bg=HMI_COLORS["DANGER"],
+            fg=HMI_COLORS["TEXT_BRIGHT"],
+            command=self.cancel,
+        )
+        self.btn_cancel.pack(anchor="e")
+
+        self.after(POLL_MS, self._poll)
+
+    def cancel(self):
+        self.exporter.cancel()
+        self.btn_cancel.config(state="disabled")
+        self.status.config(text="Cancelling…")
+
+    def _poll(self):
+        if self.exporter.done.is_set():
+            self.destroy()
+            self.on_done(self.exporter)
+            return
+        if not self.exporter.cancelled:
+            text = f"Exporting… {self.exporter.rows_written:,} rows"
+            for title, parts in self.exporter.continued.items():
+                text += f"\n{title} is split over {parts} sheets"
+            self.status.config(text=text, justify="left")
+        self.after(POLL_MS, self._poll)
@@ -0,0 +1,54 @@
+import tkinter as tk
+
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+import matplotlib
+
+matplotlib.use("Agg")  # backend for embeddable canvas
+
+
+# -----------------------------
+# Matplotlib plot
+# -----------------------------
+class MatplotlibPlot(tk.Frame):
+    """
+    CanvasPlot's interface drawn by a matplotlib figure, for
+    GRAPH_BACKEND "matplotlib". Not imported unless selected: matplotlib
+    dominates startup time on the Pi.
+    """
+
+    def __init__(self, parent, bg="#252526", **kwargs):
+        super().__init__(parent, bg=bg, **kwargs)
+        self.figure = Figure(figsize=(5, 2), dpi=100)
+        self.ax = self.figure.add_subplot(111)
+        (self.line,) = self.ax.plot([], [], "-o")
+
+        self.canvas = FigureCanvasTkAgg(self.figure, master=self)
+        self.canvas.get_tk_widget().pack(fill="both", expand=True)
+
+    def set_axes(
+        self,
+        title="",
+        xlabel="",
+        ylabel="",
+        ylim=(0.0, 1.0),
+        yticks=(),
+        marker=False,
+        step=False,
+    ):
+        self.ax.set_title(title, fontdict={"fontsize": 8})
+        self.ax.set_xlabel(xlabel)
+        self.ax.set_ylabel(ylabel)
+        self.ax.set_ylim(*ylim)
+        self.ax.set_yticks(list(yticks))
+        self.line.set_marker("o" if marker else "")
+        self.line.set_drawstyle("steps-post" if step else "default")
+        self.figure.tight_layout()
+        self.canvas.draw_idle()
+
+    def set_data(self, x, y, xlim=None):
+        self.line.set_data(x, y)
+        if xlim is not None:
+            self.ax.set_xlim(*xlim)
+        self.canvas.draw_idle()
@@ -0,0 +1,111 @@
+import time
+import tkinter as tk
+
+_UNSET = object()
+
+
+# -----------------------------
+# Widget bindings
+# -----------------------------
+class WidgetBinding:
+    """
+    One widget option (`text`, `image`, `bg`, a progress bar's `value`)
+    or a tk Variable, driven by a value. `set` only calls into Tk when the
+    value differs from the one on screen, so a page can push its whole
+    state every tick for the price of a comparison per widget.
+
+    `updates` and `skipped` count across all bindings, for RenderScheduler.
+    """
+
+    updates = 0
+    skipped = 0
+    # False makes every set() call Tk, as before bindings (benchmarks)
+    skip_unchanged = True
+
+    __slots__ = ("target", "option", "value")
+
+    def __init__(self, target, option="text"):
+        self.target = target
+        self.option = option
+        self.value = _UNSET
+
+    def set(self, value):
+        if value == self.value and WidgetBinding.skip_unchanged:
+            WidgetBinding.skipped += 1
+            return False
+        self.value = value
+        if isinstance(self.target, tk.Variable):
+            self.target.set(value)
+        else:
+            self.target[self.option] = value
+        WidgetBinding.updates += 1
+        return True
+
+    def invalidate(self):
+        # the next set() goes to Tk whatever the value
+        self.value = _UNSET
+
+
+# -----------------------------
+# Render scheduler
+# -----------------------------
+class RenderScheduler:
+    """
+    Hands each tick's data to the raised page only; hidden pages are not
+    touched. A page that is raised is brought up to date at once from the
+    latest tick's data, so it never shows stale values until the next tick.
+
+    The widget updates, skipped updates and Tk thread CPU time of the
+    last render are kept for the Monitoring page, with running totals.
+    """
+
+    def __init__(self, pages, visible_only=True):
+        self.pages = pages
+        self.visible_only = visible_only
+        self.current = None
+        self.latest = None  # (metrics, motion_series, logs) of the last tick
+
+        self.renders = 0
+        self.total_updates = 0
+        self.total_skipped = 0
+        self.total_cpu_s = 0.0
+        self.last_updates = 0
+        self.last_skipped = 0
+        self.last_cpu_ms = 0.0
+
+    def show(self, name):
+        self.current = name
+        if self.latest is not None:
+            self._render([self.pages[name]])
+
+    def render(self, metrics, motion_series, logs):
+        self.latest = (metrics, motion_series, logs)
+        if self.visible_only and self.current is not None:
+            pages = [self.pages[self.current]]
+        else:
+            pages = list(self.pages.values())
+        self._render(pages)
+
+    def _render(self, pages):
+        updates, skipped = WidgetBinding.updates, WidgetBinding.skipped
+        cpu = time.thread_time()
+        for page in pages:
+            page.update_data(*self.latest)
+        cpu = time.thread_time() - cpu
+
+        self.last_updates = WidgetBinding.updates - updates
+        self.last_skipped = WidgetBinding.skipped - skipped
+        self.last_cpu_ms = cpu * 1000
+        self.renders += 1
+        self.total_updates += self.last_updates
+        self.total_skipped += self.last_skipped
+        self.total_cpu_s += cpu
+
+    def stats(self):
+        renders = max(self.renders, 1)
+        return {
+            "renders": self.renders,
+            "updates_per_render": self.total_updates / renders,
+            "skipped_per_render": self.total_skipped / renders,
+            "cpu_ms_per_render": self.total_cpu_s * 1000 / renders,
+        }
@@ -13,5 +13,9 @@ class BasePage(tk.Frame):
         """
         Called every second by the controller.
         Child classes override this method.
+
+        `motion_series` and `logs` are the live RingBuffers of the selected
+        transmitter; read what you need (`latest()`, `tail(n)`,
+        `since(cursor)`) rather than copying them.
         """
         pass
@@ -6,6 +6,7 @@ import platform
 # import project metadata
 from .base_page import BasePage
 from utils.constants import CONSTANTS
+from components import DeviceSelector, WidgetBinding
 
 os_name = platform.system()
 os_version = platform.version()
@@ -43,6 +44,9 @@ class DashboardPage(BasePage):
         )
         motion_frame.grid(row=0, column=0, sticky="nsew", padx=10, pady=10)
 
+        self.device_selector = DeviceSelector(motion_frame, controller)
+        self.device_selector.pack(anchor="center", pady=(3, 0))
+
         self.motion_value_label = tk.Label(
             motion_frame,
             image=self.light_on_img
@@ -184,23 +188,36 @@ class DashboardPage(BasePage):
         )
         info_label.pack(anchor="w", padx=10)
 
+        # Tk is only called for values that changed since the last tick
+        self.bind_motion_text = WidgetBinding(self.motion_value_label)
+        self.bind_motion_image = WidgetBinding(self.motion_value_label, "image")
+        self.bind_motion_state = WidgetBinding(self.motion_state_var)
+        self.bind_cpu = WidgetBinding(self.cpu_label)
+        self.bind_ram = WidgetBinding(self.ram_label)
+        self.bind_disk = WidgetBinding(self.disk_label)
+        self.bind_os = WidgetBinding(self.os_label)
+        self.bind_device = WidgetBinding(self.device_label)
+        self.bind_net = WidgetBinding(self.net_label)
+        self.bind_system_state = WidgetBinding(self.system_state_label)
+
         # Initial button state
         self.set_station(self.selected_station)
 
     def update_data(self, metrics, motion_series, logs):
         self.last_metrics = metrics
+        self.device_selector.refresh()
         mv = metrics["motion"]
-        self.motion_value_label.config(text=f"{mv:.2f}")
+        self.bind_motion_text.set(f"{mv:.2f}")
 
-        self.motion_state_var.set("Motion Present" if mv == 1 else "Motion Absent")
+        self.bind_motion_state.set("Motion Present" if mv == 1 else "Motion Absent")
 
         # dynamic image update
         # if mv >= 0.5:
         if mv == 1:
-            self.motion_value_label.config(image=self.light_on_img)
+            self.bind_motion_image.set(self.light_on_img)
         else:
             # wait for 5 seconds
-            self.motion_value_label.config(image=self.light_off_img)
+            self.bind_motion_image.set(self.light_off_img)
 
         self.update_display()
 
@@ -250,20 +267,18 @@ class DashboardPage(BasePage):
         net_down = ms.get("net_down", 0.0)
         os_label = ms.get("os", f"{os_name} {os_version} {os_release}")
 
-        self.cpu_label.config(text=f"CPU: {cpu:.1f} %")
-        self.ram_label.config(text=f"RAM: {ram:.1f} %")
-        self.disk_label.config(text=f"Disk: {disk:.1f} %")
-        self.os_label.config(text=f"OS: {os_label[0:15]}")
-        self.device_label.config(
-            text=f"Device: {CONSTANTS.get('DEVICE_VERSION').get('control_station')}"
+        self.bind_cpu.set(f"CPU: {cpu:.1f} %")
+        self.bind_ram.set(f"RAM: {ram:.1f} %")
+        self.bind_disk.set(f"Disk: {disk:.1f} %")
+        self.bind_os.set(f"OS: {os_label[0:15]}")
+        self.bind_device.set(
+            f"Device: {CONSTANTS.get('DEVICE_VERSION').get('control_station')}"
         )
         # self.device_label.config(
         #     text=f"Device: {CONSTANTS.get('DEVICE_VERSION').get(self.selected_station.lower())}"
         # )
-        self.net_label.config(
-            text=f"Net: up {net_up:.1f} kB/s, down {net_down:.1f} kB/s"
-        )
+        self.bind_net.set(f"Net: up {net_up:.1f} kB/s, down {net_down:.1f} kB/s")
 
-        self.system_state_label.config(
-            text="System is ON" if self.controller.system_on else "System is OFF"
+        self.bind_system_state.set(
+            "System is ON" if self.controller.system_on else "System is OFF"
         )
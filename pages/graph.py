@@ -1,14 +1,31 @@
+import time
 import tkinter as tk
 from .base_page import BasePage
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-
-import matplotlib
-
-matplotlib.use("Agg")  # backend for embeddable canvas
 
 # import project metadata
 from utils.constants import CONSTANTS
+from components import CanvasPlot, DeviceSelector
+
+# span label -> (rollup tier, span in s, x unit in s, x unit name); the
+# live view plots the raw samples of the selected transmitter instead, and
+# the "tick" tier the per-tick motion column of the measurement history
+SPANS = {
+    "Live": None,
+    "Last 10 minutes": ("tick", 600, 60, "Minutes"),
+    "Last hour": ("minute", 3600, 60, "Minutes"),
+    "Last day": ("minute", 86400, 3600, "Hours"),
+    "Last month": ("hour", 31 * 86400, 86400, "Days"),
+    "Last year": ("day", 366 * 86400, 86400, "Days"),
+}
+
+
+def _make_plot(parent):
+    if CONSTANTS.get("GRAPH_BACKEND", "canvas") == "matplotlib":
+        # only imported when selected: matplotlib dominates startup time
+        from components.mpl_plot import MatplotlibPlot
+
+        return MatplotlibPlot(parent)
+    return CanvasPlot(parent)
 
 
 # -----------------------------
@@ -30,33 +47,125 @@ class GraphsPage(BasePage):
         )
         frame.grid(row=0, column=0, sticky="nsew", padx=10, pady=10)
 
-        self.figure = Figure(figsize=(5, 2), dpi=100)
-        self.ax = self.figure.add_subplot(111)
-        self.ax.set_title(
-            f"Last {CONSTANTS.get('MOTION_HISTORY_LENGTH')} Motion Values",
-            fontdict={"fontsize": 8},
+        controls = tk.Frame(frame, bg="#252526")
+        controls.pack(anchor="w", fill="x", padx=5, pady=(3, 0))
+        self.device_selector = DeviceSelector(controls, controller)
+        self.device_selector.pack(side="left")
+
+        # longer spans are drawn from the minute/hour/day rollups
+        self.span_var = tk.StringVar(value="Live")
+        span_menu = tk.OptionMenu(
+            controls, self.span_var, *SPANS, command=lambda _: self._span_changed()
         )
-        self.ax.set_xlabel("Sample")
-        self.ax.set_ylabel("Value")
-        self.ax.set_ylim(-0.1, 1.1)
-        self.ax.set_yticks([0.0, 1.0])
-        (self.line,) = self.ax.plot(
-            range(CONSTANTS.get("MOTION_HISTORY_LENGTH")),
-            [0] * CONSTANTS.get("MOTION_HISTORY_LENGTH"),
-            "-o",
+        span_menu.config(
+            font=("Segoe UI", 8),
+            bg="#333333",
+            fg="#ffffff",
+            activebackground="#007acc",
+            highlightthickness=0,
         )
-        self.figure.tight_layout()
+        span_menu.pack(side="left", padx=10)
+
+        # native canvas items by default, matplotlib if GRAPH_BACKEND says so
+        self.plot = _make_plot(frame)
+        self.plot.pack(fill="both", expand=True)
+        self._set_axes(None)
+
+        self.cursor = None
+
+    def _set_axes(self, span):
+        if span is None:
+            self.plot.set_axes(
+                title=f"Last {CONSTANTS.get('MOTION_HISTORY_LENGTH')} Motion Values",
+                xlabel="Seconds before latest sample",
+                ylabel="Value",
+                ylim=(-0.1, 1.1),
+                yticks=(0.0, 1.0),
+                marker=True,
+            )
+        elif span[0] == "tick":
+            self.plot.set_axes(
+                title="Motion Value per Tick",
+                xlabel=f"{span[3]} ago",
+                ylabel="Value",
+                ylim=(-0.1, 1.1),
+                yticks=(0.0, 1.0),
+                step=True,
+            )
+        else:
+            # one step per bucket
+            tier, _, _, unit = span
+            self.plot.set_axes(
+                title=f"Motion Active per {tier.capitalize()}",
+                xlabel=f"{unit} ago",
+                ylabel="Active (%)",
+                ylim=(-5, 105),
+                yticks=(0, 50, 100),
+                step=True,
+            )
 
-        self.canvas = FigureCanvasTkAgg(self.figure, master=frame)
-        self.canvas.get_tk_widget().pack(fill="both", expand=True)
+    def _span_changed(self):
+        self.cursor = None
+        self._set_axes(SPANS[self.span_var.get()])
+        self.plot.set_data([], [])
 
     def update_data(self, metrics, motion_series, logs):
+        self.device_selector.refresh()
+        span = SPANS[self.span_var.get()]
+        if span is not None:
+            if span[0] == "tick":
+                self._plot_history(*span)
+            else:
+                self._plot_rollups(*span)
+            return
         if not motion_series:
             return
 
-        y = motion_series[-CONSTANTS.get("MOTION_HISTORY_LENGTH") :]
-        x = list(range(len(y)))
-        self.line.set_xdata(x)
-        self.line.set_ydata(y)
-        self.ax.set_xlim(-0.5, max(11.5, len(y)))
-        self.canvas.draw_idle()
+        # nothing new since the last redraw of this buffer
+        cursor = (id(motion_series), motion_series.write_index)
+        if cursor == self.cursor:
+            return
+        self.cursor = cursor
+
+        # plot at the real receive times, newest sample at 0
+        y, times = motion_series.tail_with_times(
+            CONSTANTS.get("MOTION_HISTORY_LENGTH")
+        )
+        newest = times[-1]
+        x = [t - newest for t in times]
+        self.plot.set_data(x, y, xlim=(min(x[0], -1.0) - 0.5, 0.5))
+
+    def _plot_history(self, tier, span_s, unit_s, unit):
+        history = self.controller.measurement_history
+        cursor = (tier, history.write_index)
+        if not history or cursor == self.cursor:
+            return
+        self.cursor = cursor
+
+        # array slices of two columns, no row objects
+        now = time.time()
+        columns = history.between(now - span_s, names=("timestamp", "motion"))
+        x = [(t - now) / unit_s for t in columns["timestamp"]]
+        self.plot.set_data(x, columns["motion"], xlim=(-span_s / unit_s, 0))
+
+    def _plot_rollups(self, tier, span_s, unit_s, unit):
+        now = time.time()
+        buckets = self.controller.rollups.series(tier, since=now - span_s)
+        if not buckets:
+            return
+        # the open bucket changes every tick; closed ones never do
+        newest = buckets[-1]
+        cursor = (tier, span_s, len(buckets), newest.start, newest.active_s)
+        if cursor == self.cursor:
+            return
+        self.cursor = cursor
+
+        seconds = self.controller.rollups.tiers[tier].seconds
+        x = []
+        y = []
+        for b in buckets:
+            # the open bucket is measured against the time elapsed so far
+            length = min(seconds, max(now - b.start, 1.0))
+            x.append((b.start - now) / unit_s)
+            y.append(min(100.0, b.active_s / length * 100))
+        self.plot.set_data(x, y, xlim=(-span_s / unit_s, 0))
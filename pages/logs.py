@@ -1,9 +1,25 @@
+import logging
+import time
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
 from .base_page import BasePage
+from utils.log_index import LOG_FILENAME, LogIndex
+from utils.motion_receiver import LOG_DIR
 
 # import project metadata
 from metadata import PROJECT_METADATA
 
+PAGE_SIZE = 100
+POLL_MS = 50
+SPANS = {
+    "Any time": None,
+    "Last hour": 3600,
+    "Last day": 86400,
+    "Last week": 7 * 86400,
+}
+LEVELS = {"All": None, "Warnings": logging.WARNING, "Errors": logging.ERROR}
+LEVEL_COLORS = {logging.WARNING: "#dcdcaa", logging.ERROR: "#f44747"}
+
 
 # -----------------------------
 # Logs Page
@@ -45,64 +61,189 @@ class LogsPage(BasePage):
         )
         self.lbl_rx_status.pack(anchor="w", padx=10, pady=2)
 
-        # Performance cards
+        # Log history
         self.logs_frame = tk.LabelFrame(
             self,
-            text="Performance Logs",
+            text="Log History",
             bg="#252526",
             fg="#ffffff",
             font=("Segoe UI", 8, "bold"),
         )
         self.logs_frame.grid(row=1, columnspan=2, sticky="nsew", padx=10, pady=5)
 
-        # Create canvas and scrollbar
-        self.canvas = tk.Canvas(
-            self.logs_frame, bg="#252526", height=150, highlightthickness=0
-        )
-        self.scrollbar = tk.Scrollbar(
-            self.logs_frame, orient="vertical", command=self.canvas.yview
-        )
-        self.scrollable_frame = tk.Frame(self.canvas, bg="#252526")
+        controls = tk.Frame(self.logs_frame, bg="#252526")
+        controls.pack(fill="x", padx=5, pady=(3, 0))
 
-        self.scrollable_frame.bind(
-            "<Configure>",
-            lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all")),
+        self.search_var = tk.StringVar()
+        search = tk.Entry(
+            controls,
+            textvariable=self.search_var,
+            bg="#333333",
+            fg="#ffffff",
+            insertbackground="#ffffff",
+            font=("Segoe UI", 8),
+            width=24,
         )
+        search.pack(side="left")
+        search.bind("<Return>", lambda e: self._search())
 
-        self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
-        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.span_var = tk.StringVar(value="Any time")
+        self.level_var = tk.StringVar(value="All")
+        for var, options in ((self.span_var, SPANS), (self.level_var, LEVELS)):
+            menu = tk.OptionMenu(
+                controls, var, *options, command=lambda _: self._search()
+            )
+            menu.config(
+                font=("Segoe UI", 8),
+                bg="#333333",
+                fg="#ffffff",
+                activebackground="#007acc",
+                highlightthickness=0,
+            )
+            menu.pack(side="left", padx=(10, 0))
 
-        self.canvas.pack(side="left", fill="both", expand=True)
-        self.scrollbar.pack(side="right", fill="y")
+        for text, command in (
+            ("Older", self._older),
+            ("Newer", self._newer),
+            ("Search", self._search),
+        ):
+            tk.Button(
+                controls,
+                text=text,
+                command=command,
+                bg="#333333",
+                fg="#ffffff",
+                activebackground="#007acc",
+                font=("Segoe UI", 8),
+            ).pack(side="right", padx=(5, 0))
+
+        self.page_label = tk.Label(
+            controls, text="", bg="#252526", fg="#aaaaaa", font=("Segoe UI", 8)
+        )
+        self.page_label.pack(side="right", padx=5)
 
-        self.logs_text = tk.Label(
-            self.scrollable_frame,
-            text="Logs: No logs yet",
+        body = tk.Frame(self.logs_frame, bg="#252526")
+        body.pack(fill="both", expand=True, padx=5, pady=5)
+        self.listbox = tk.Listbox(
+            body,
             bg="#252526",
             fg="#ffffff",
             font=("Segoe UI", 8),
+            height=8,
+            borderwidth=0,
+            highlightthickness=0,
+            activestyle="none",
+        )
+        self.scrollbar = tk.Scrollbar(
+            body, orient="vertical", command=self.listbox.yview
+        )
+        self.listbox.configure(yscrollcommand=self.scrollbar.set)
+        self.listbox.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.index = LogIndex(LOG_DIR)
+        # `before` cursors of the pages above the one shown; empty on the
+        # newest page, which follows the log as it is written
+        self.pages = []
+        self.entries = []
+        self.seen_size = None
+        # queries read the log files, so they run on a worker thread and
+        # the result is picked up with after(); only the newest is shown
+        self.worker = ThreadPoolExecutor(max_workers=1)
+        self.generation = 0
+        self.pending = None
+
+    def _query(self):
+        span = SPANS[self.span_var.get()]
+        query = {
+            "start": None if span is None else time.time() - span,
+            "text": self.search_var.get().strip() or None,
+            "level": LEVELS[self.level_var.get()],
+            "limit": PAGE_SIZE,
+            "before": self.pages[-1] if self.pages else None,
+        }
+        self.generation += 1
+        self.pending = self.worker.submit(self._run_query, self.generation, query)
+        self.after(POLL_MS, self._poll, self.pending, self.generation)
+
+    def _run_query(self, generation, query):
+        def superseded():
+            # by a newer query, or the page was destroyed
+            return generation != self.generation
+
+        if superseded():
+            return None
+        return self.index.query(cancelled=superseded, **query)
+
+    def _poll(self, future, generation):
+        if not future.done():
+            self.after(POLL_MS, self._poll, future, generation)
+            return
+        if generation != self.generation:
+            return
+        self.pending = None
+        try:
+            entries = future.result()
+        except Exception as e:
+            # e.g. a damaged .idx; keep the page and say why it is stale
+            self.page_label.config(text=f"error: {e!r}")
+            return
+        self._show(entries)
+
+    def _show(self, entries):
+        self.entries = entries
+        self.listbox.delete(0, "end")
+        for i, entry in enumerate(self.entries):
+            stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(entry.timestamp))
+            self.listbox.insert("end", f"{stamp}  {entry.message}")
+            color = LEVEL_COLORS.get(entry.level)
+            if color:
+                self.listbox.itemconfig(i, fg=color)
+        first = len(self.pages) * PAGE_SIZE
+        self.page_label.config(
+            text=f"{first + 1}-{first + len(self.entries)}" if self.entries else "-"
         )
-        self.logs_text.pack(anchor="w", padx=10, pady=2)
+
+    def _search(self):
+        self.pages = []
+        self._query()
+
+    def _older(self):
+        if len(self.entries) == PAGE_SIZE:
+            self.pages.append(self.entries[-1].cursor)
+            self._query()
+
+    def _newer(self):
+        if self.pages:
+            self.pages.pop()
+            self._query()
+
+    def destroy(self):
+        # stop a long scan after its current day and drop queued ones, so
+        # closing the app does not wait for them
+        self.generation += 1
+        self.worker.shutdown(wait=False, cancel_futures=True)
+        super().destroy()
+
+    def _today_size(self):
+        path = LOG_DIR / time.strftime("%Y-%m-%d") / LOG_FILENAME
+        try:
+            return path.stat().st_size
+        except OSError:
+            return 0
 
     def update_data(self, metrics, motion_series, logs):
-        pass
-        # Let's clear the frame first to be safe and clean.
-        # logs = metrics.get("logs", "Logs not sent")
-
-        # print(f'logs: {logs}')
-        # if len(logs) > 0:
-        #     for widget in self.scrollable_frame.winfo_children():
-        #         widget.destroy()
-
-        #     for log in logs:
-        #         label = tk.Label(
-        #             self.scrollable_frame,
-        #             text=f"{log}",
-        #             bg="#252526",
-        #             fg="#ffffff",
-        #             font=("Segoe UI", 8),
-        #         )
-        #         label.pack(anchor="w", padx=10, pady=1)
+        # only the newest page follows the log, and only when the sink has
+        # written something since the last query and that query is done
+        # (the page is only updated while it is raised). `logs` is not
+        # needed: every line in it also went to the sink, which flushes the
+        # log with each batch, and today's index tail is read from the log
+        if self.pages or self.pending is not None:
+            return
+        size = self._today_size()
+        if size != self.seen_size:
+            self.seen_size = size
+            self._query()
 
         # # if self.controller.system_on and motion_series and any(motion_series):
         # if not self.controller.transmitter_status:
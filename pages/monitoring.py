@@ -1,5 +1,7 @@
+import time
 import tkinter as tk
 from .base_page import BasePage
+from components import WidgetBinding
 
 # import project metadata
 from metadata import PROJECT_METADATA
@@ -31,6 +33,13 @@ class SimpleProgressBar(tk.Canvas):
             self._draw()
 
 
+# no motion sample for this long means the transmitter went quiet
+TX_SILENCE_S = 5.0
+# the render figures differ every tick; averaging them over this long keeps
+# their label from being the one widget updated on every tick
+RENDER_STATS_S = 5.0
+
+
 # -----------------------------
 # Monitoring Page
 # -----------------------------
@@ -71,6 +80,15 @@ class MonitoringPage(BasePage):
         )
         self.lbl_rx_status.pack(anchor="w", padx=10, pady=2)
 
+        self.lbl_link = tk.Label(
+            dev_frame,
+            text="Link: --",
+            bg="#252526",
+            fg="#ffffff",
+            font=("Segoe UI", 8),
+        )
+        self.lbl_link.pack(anchor="w", padx=10, pady=2)
+
         # Performance cards
         perf_frame = tk.LabelFrame(
             self,
@@ -150,32 +168,91 @@ class MonitoringPage(BasePage):
         )
         self.software_version_label.pack(anchor="w", padx=10, pady=3)
 
+        # what rendering the raised page cost on the last tick
+        self.lbl_render = tk.Label(
+            net_frame,
+            text="UI: --",
+            bg="#252526",
+            fg="#aaaaaa",
+            font=("Segoe UI", 8),
+        )
+        self.lbl_render.pack(anchor="w", padx=10, pady=1)
+
+        # Tk is only called for values that changed since the last tick
+        self.bind_cpu_bar = WidgetBinding(self.cpu_bar, "value")
+        self.bind_ram_bar = WidgetBinding(self.ram_bar, "value")
+        self.bind_disk_bar = WidgetBinding(self.disk_bar, "value")
+        self.bind_cpu = WidgetBinding(self.cpu_text)
+        self.bind_ram = WidgetBinding(self.ram_text)
+        self.bind_disk = WidgetBinding(self.disk_text)
+        self.bind_net_up = WidgetBinding(self.net_up_label)
+        self.bind_net_down = WidgetBinding(self.net_down_label)
+        self.bind_tx_status = WidgetBinding(self.lbl_tx_status)
+        self.bind_rx_status = WidgetBinding(self.lbl_rx_status)
+        self.bind_link = WidgetBinding(self.lbl_link)
+        self.bind_render = WidgetBinding(self.lbl_render)
+        # renderer totals (renders, updates, cpu s) at the last refresh
+        self.render_totals = (0, 0, 0.0)
+        self.render_stats_at = 0.0
+
     def update_data(self, metrics, motion_series, logs):
         cpu = metrics["cpu"]
         ram = metrics["ram"]
         disk = metrics["disk"]
 
-        self.cpu_bar["value"] = cpu
-        self.ram_bar["value"] = ram
-        self.disk_bar["value"] = disk
+        # bars move in whole pixels; a tenth of a percent is plenty
+        self.bind_cpu_bar.set(round(cpu, 1))
+        self.bind_ram_bar.set(round(ram, 1))
+        self.bind_disk_bar.set(round(disk, 1))
 
-        self.cpu_text.config(text=f"CPU: {cpu:.1f} %")
-        self.ram_text.config(text=f"RAM: {ram:.1f} %")
-        self.disk_text.config(text=f"Disk: {disk:.1f} %")
+        self.bind_cpu.set(f"CPU: {cpu:.1f} %")
+        self.bind_ram.set(f"RAM: {ram:.1f} %")
+        self.bind_disk.set(f"Disk: {disk:.1f} %")
 
-        self.net_up_label.config(text=f"Up: {metrics['net_up']:.1f} kB/s")
-        self.net_down_label.config(text=f"Down: {metrics['net_down']:.1f} kB/s")
+        self.bind_net_up.set(f"Up: {metrics['net_up']:.1f} kB/s")
+        self.bind_net_down.set(f"Down: {metrics['net_down']:.1f} kB/s")
 
-        if self.controller.system_on and motion_series and any(motion_series):
+        last_sample = motion_series.latest_time()
+        if (
+            self.controller.system_on
+            and last_sample is not None
+            and time.monotonic() - last_sample < TX_SILENCE_S
+        ):
             tx_status = "Transmitter: Sending data"
         elif self.controller.system_on:
             tx_status = "Transmitter: Connected"
         else:
             tx_status = "Transmitter: Off"
 
-        self.lbl_tx_status.config(text=tx_status)
-        self.lbl_rx_status.config(
-            text="Control Station: Receiving data"
-            if self.controller.system_on
-            else "Control Station: Idle"
+        self.bind_tx_status.set(tx_status)
+        receiver = self.controller.background_thread
+        if self.controller.system_on and receiver:
+            # port in use, or how long the link has been down; includes
+            # the time the last reconnect took
+            rx_status = f"Control Station: {receiver.connection_status()}"
+        else:
+            rx_status = "Control Station: Idle"
+        self.bind_rx_status.set(rx_status)
+
+        link = self.controller.link_stats
+        self.bind_link.set(
+            f"Link loss: {link.loss_pct():.1f} % ({link.lost} lost,"
+            f" {link.duplicates} dup, {link.reordered} late)"
         )
+
+        now = time.monotonic()
+        if now >= self.render_stats_at:
+            renderer = self.controller.renderer
+            renders, updates, cpu_s = self.render_totals
+            self.render_totals = (
+                renderer.renders,
+                renderer.total_updates,
+                renderer.total_cpu_s,
+            )
+            self.render_stats_at = now + RENDER_STATS_S
+            renders = max(renderer.renders - renders, 1)
+            updates = (renderer.total_updates - updates) / renders
+            cpu_ms = (renderer.total_cpu_s - cpu_s) * 1000 / renders
+            self.bind_render.set(
+                f"UI: {updates:.0f} widget updates, {cpu_ms:.1f} ms per tick"
+            )
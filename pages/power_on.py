@@ -59,7 +59,6 @@ class PowerOnPage(BasePage):
     def _on_power_on_clicked(self):
         self.controller.turn_system_on()
         # show toolbar again using stored pack options
-        print(getattr(self.controller, "toolbar", None))
         if getattr(self.controller, "toolbar", None):
             # self.controller.toolbar.pack(**self.controller._toolbar_pack_opts)
             self.controller.toolbar.grid(row=0, column=0, sticky="nsew")
@@ -1,14 +1,27 @@
-import RPi.GPIO as GPIO
+import argparse
 import serial
 import time
+from collections import deque
 from datetime import datetime
 import psutil
 import json
 
-# Serial setup
-ser = serial.Serial("/dev/ttyAMA0", 9600, timeout=1)
+from utils.protocol import PROBE, FrameEncoder
+from utils.pin_driver import RPiPinDriver, FakePinDriver
+from utils.edge_capture import EdgeCapture
+from utils.motion_batcher import MotionBatcher
+from utils.logger import get_logger, setup_logging
+
+logger = get_logger("pi_sender")
 
 INPUT_PIN = 17
+# "binary": CRC-checked frames (utils/protocol.py); a single MOTION sample
+# is larger than its text line, the saving comes from BATCHING
+# "text": legacy "TYPE:value" lines for older control stations
+WIRE_PROTOCOL = "binary"
+# transmitter id on a shared coordinator (binary protocol only); 0 means
+# "the only transmitter on this link" and keeps frames v1 compatible
+DEVICE_ID = 0
 MESSAGE_TYPES = {
     "MOTION": "MOTION",
     "LOGS": "LOGS",
@@ -17,16 +30,39 @@ MESSAGE_TYPES = {
 
 
 class PiSender:
-    def __init__(self):
+    # polling loop timings (seconds)
+    POLL_INTERVAL_S = 0.5
+    DETECTION_HOLD_S = (1, 2)
+    # edge mode: resend the current state when no edge happened for this long
+    HEARTBEAT_S = 0.5
+    # binary protocol only: run-length encode unchanged motion samples and
+    # send them at most BATCH_MAX_DELAY_S late (state changes go out at once)
+    BATCHING = True
+    BATCH_MAX_DELAY_S = 5.0
+    # how often the transmitter reports its own CPU/RAM/disk/network
+    PERF_STATUS_INTERVAL_S = 30
+
+    def __init__(self, ser, pin=None, warmup_s=10, device_id=DEVICE_ID):
+        self.ser = ser
+        self.pin = pin if pin is not None else RPiPinDriver(INPUT_PIN)
+        self.warmup_s = warmup_s
+        self.encoder = FrameEncoder(device=device_id)
+        self.running = False
+        self.capture = None
+        self.edge_latencies = deque(maxlen=256)
+        self.batcher = None
+        self.last_perf_status = 0.0
+        # prime the non-blocking cpu/network counters
+        psutil.cpu_percent(interval=None)
+        self._last_net = (time.monotonic(), psutil.net_io_counters())
         self.initialize_gpio()
         self.send_perf_status()
 
     def initialize_gpio(self):
         # GPIO setup
-        GPIO.setmode(GPIO.BCM)
-        GPIO.setup(INPUT_PIN, GPIO.IN, pull_up_down=GPIO.PUD_DOWN)
-        print("Initializing GPIO pins.............................")
-        time.sleep(10)  # give module time to initialize
+        self.pin.setup()
+        logger.info("Initializing GPIO pins, waiting %ss", self.warmup_s)
+        time.sleep(self.warmup_s)  # give module time to initialize
 
     # def send_message(self, type, msg):
     #     data = {"type": type, "data": msg}
@@ -36,30 +72,76 @@ class PiSender:
     #     print(f"Sent: {str_data}")
 
     def send_message(self, type, msg):
+        if WIRE_PROTOCOL == "binary":
+            self.ser.write(self.encoder.encode(type, msg))
+            return
+
+        if isinstance(msg, dict):
+            msg = json.dumps(msg, ensure_ascii=True)
         data = f"{type}:{msg}"
 
         # str_data = json.dumps(data, ensure_ascii=True)
-        ser.write(data.encode("utf-8") + b"\n")
+        self.ser.write(data.encode("utf-8") + b"\n")
 
         # print(f"Sent: {str_data}")
 
+    def send_motion(self, state):
+        if not self.BATCHING or WIRE_PROTOCOL != "binary":
+            self.send_message(MESSAGE_TYPES.get("MOTION"), state)
+            return
+
+        if self.batcher is None:
+            self.batcher = MotionBatcher(
+                sample_period_ms=int(self.sample_period_s() * 1000),
+                max_delay_s=self.BATCH_MAX_DELAY_S,
+            )
+        batch = self.batcher.add(state, self.encoder.timestamp_ms())
+        if batch:
+            self.send_message("MOTION_BATCH", batch)
+
+    def flush_motion(self):
+        batch = self.batcher.flush() if self.batcher else None
+        if batch:
+            self.send_message("MOTION_BATCH", batch)
+
+    def sample_period_s(self):
+        return self.HEARTBEAT_S if self.capture else self.POLL_INTERVAL_S
+
     def read_message(self):
-        line = ser.readline()
+        line = self.ser.readline()
         if line:
-            return line.decode("utf-8").strip()
+            return line.decode("utf-8", "replace").strip()
         return None
 
+    def poll_incoming(self):
+        # non-blocking unless a partial line is waiting
+        if self.ser.in_waiting:
+            incoming = self.read_message()
+            if incoming:
+                self.handle_incoming(incoming)
+
+    def handle_incoming(self, message):
+        if message == PROBE:
+            # a control station scanning its ports for us: answer now,
+            # batched motion may not go out for BATCH_MAX_DELAY_S
+            self.send_perf_status()
+            return
+        logger.info("Received: %s", message, key="incoming")
+
     def send_perf_status(self):
-        # simple network throughput estimation (kB/s)
-        net1 = psutil.net_io_counters()
-        time.sleep(0.1)
-        net2 = psutil.net_io_counters()
-        sent_kbps = (net2.bytes_sent - net1.bytes_sent) / 1024.0 / 0.1
-        recv_kbps = (net2.bytes_recv - net1.bytes_recv) / 1024.0 / 0.1
+        # network throughput (kB/s) since the previous report; no sleeping
+        # so edges keep flowing while we sample
+        now = time.monotonic()
+        net = psutil.net_io_counters()
+        last_at, last_net = self._last_net
+        elapsed = max(now - last_at, 1e-3)
+        sent_kbps = (net.bytes_sent - last_net.bytes_sent) / 1024.0 / elapsed
+        recv_kbps = (net.bytes_recv - last_net.bytes_recv) / 1024.0 / elapsed
+        self._last_net = (now, net)
         data = {
             "type": MESSAGE_TYPES.get("PERFORMANCE_STATUS"),
             "data": {
-                "cpu": psutil.cpu_percent(interval=1),
+                "cpu": psutil.cpu_percent(interval=None),
                 "memory": psutil.virtual_memory().percent,
                 "disk": psutil.disk_usage("/").percent,
                 "net_up": sent_kbps,
@@ -68,34 +150,129 @@ class PiSender:
                 "version": "Raspberypi 1b+ v1.2",
             },
         }
-        # self.send_message(MESSAGE_TYPES.get("PERFORMANCE_STATUS"), data)
+        self.last_perf_status = now
+        self.send_message(MESSAGE_TYPES.get("PERFORMANCE_STATUS"), data["data"])
+
+    def maybe_send_perf_status(self):
+        if time.monotonic() - self.last_perf_status >= self.PERF_STATUS_INTERVAL_S:
+            self.send_perf_status()
 
     def run(self):
+        """
+        Legacy polling loop: samples the pin every POLL_INTERVAL_S and holds
+        for DETECTION_HOLD_S after a detection.
+        """
+        self.running = True
         try:
-            while True:
+            while self.running:
                 # Send a test message
-                sensor_value = GPIO.input(INPUT_PIN)
+                sensor_value = self.pin.read()
                 # self.send_message(MESSAGE_TYPES.get("LOGS"), message)
                 if sensor_value == 1:
-                    self.send_message(MESSAGE_TYPES.get("MOTION"), sensor_value)
-                    time.sleep(1)
+                    self.send_motion(sensor_value)
+                    time.sleep(self.DETECTION_HOLD_S[0])
                     self.send_message(MESSAGE_TYPES.get("LOGS"), "MOTION DETECTED")
-                    time.sleep(2)
+                    time.sleep(self.DETECTION_HOLD_S[1])
                 else:
-                    self.send_message(MESSAGE_TYPES.get("MOTION"), sensor_value)
-                    time.sleep(0.5)
+                    self.send_motion(sensor_value)
+                    time.sleep(self.POLL_INTERVAL_S)
+
+                self.maybe_send_perf_status()
 
                 # Read incoming message (if any)
                 incoming = self.read_message()
                 if incoming:
-                    print(f"Received: {incoming}")
+                    self.handle_incoming(incoming)
 
+            self.flush_motion()
         except KeyboardInterrupt:
-            print("Exiting Pi A...")
-            ser.close()
+            logger.info("Exiting Pi A...")
+            self.flush_motion()
+            self.ser.close()
+
+    def run_edges(self):
+        """
+        Edge driven loop: every rising/falling edge captured by the GPIO
+        layer is transmitted as soon as it is dequeued. While the pin is
+        idle the current state is sampled every HEARTBEAT_S (and batched
+        when BATCHING is on).
+        """
+        self.capture = EdgeCapture(self.pin)
+        self.capture.start()
+        self.running = True
+        self.send_motion(self.capture.level)
+        try:
+            while self.running:
+                edge = self.capture.get(timeout=self.HEARTBEAT_S)
+                self.poll_incoming()
+                if edge is None:
+                    self.send_motion(self.capture.level)
+                    self.maybe_send_perf_status()
+                    continue
+
+                self.send_motion(edge.level)
+                self.edge_latencies.append(time.monotonic() - edge.timestamp)
+                if edge.level == 1:
+                    self.send_message(MESSAGE_TYPES.get("LOGS"), "MOTION DETECTED")
+            self.flush_motion()
+
+        except KeyboardInterrupt:
+            logger.info("Exiting Pi A...")
+            self.flush_motion()
+            self.ser.close()
+        finally:
+            self.pin.cleanup()
+
+    def edge_stats(self):
+        latencies = sorted(self.edge_latencies)
+        capture = self.capture
+        return {
+            "edges_captured": capture.edges_captured if capture else 0,
+            "edges_missed": capture.edges_missed if capture else 0,
+            "edges_dropped": capture.edges_dropped if capture else 0,
+            "latency_p50_ms": latencies[len(latencies) // 2] * 1000
+            if latencies
+            else 0.0,
+            "latency_max_ms": latencies[-1] * 1000 if latencies else 0.0,
+        }
+
+    def stop(self):
+        self.running = False
 
 
 if __name__ == "__main__":
-    print("Pi A running (Coordinator)")
-    pi_sender = PiSender()
-    pi_sender.run()
+    parser = argparse.ArgumentParser(description="PIR motion transmitter")
+    parser.add_argument(
+        "--mode",
+        choices=("edge", "poll"),
+        default="edge",
+        help="edge: interrupt driven capture, poll: legacy sampling loop",
+    )
+    parser.add_argument(
+        "--fake-gpio",
+        action="store_true",
+        help="use an in-memory pin instead of RPi.GPIO",
+    )
+    parser.add_argument(
+        "--device-id",
+        type=int,
+        default=DEVICE_ID,
+        help="transmitter id (1-255) when several share one coordinator",
+    )
+    parser.add_argument(
+        "--log-level",
+        default="INFO",
+        help="DEBUG, INFO, WARNING or ERROR",
+    )
+    args = parser.parse_args()
+
+    setup_logging(args.log_level)
+    logger.info("Pi A running (Coordinator)")
+    # Serial setup
+    ser = serial.Serial("/dev/ttyAMA0", 9600, timeout=1)
+    pin = FakePinDriver(INPUT_PIN) if args.fake_gpio else RPiPinDriver(INPUT_PIN)
+    pi_sender = PiSender(ser, pin, device_id=args.device_id)
+    if args.mode == "edge":
+        pi_sender.run_edges()
+    else:
+        pi_sender.run()
@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+from openpyxl import load_workbook
+
+from utils.excel_export import ExcelExporter, ExcelSheet
+
+
+class SheetLimitTest(unittest.TestCase):
+    """
+    Rows beyond the per-worksheet limit go on in continuation sheets.
+    """
+
+    def export(self, sheets, max_sheet_rows):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "export.xlsx")
+        exporter = ExcelExporter(path, sheets, max_sheet_rows=max_sheet_rows)
+        exporter.run()
+        self.assertIsNone(exporter.error)
+        return exporter, load_workbook(path, read_only=True)
+
+    def test_continuation_sheets(self):
+        rows = [[datetime(2026, 1, 1, 0, 0, i), float(i % 2)] for i in range(7)]
+        sheets = [
+            ExcelSheet("Summary", ["Name"], [["a"]]),
+            ExcelSheet("Motion Samples", ["Received", "Value"], rows, (0,)),
+        ]
+        exporter, wb = self.export(sheets, max_sheet_rows=4)
+
+        self.assertEqual(
+            wb.sheetnames,
+            ["Summary", "Motion Samples", "Motion Samples (2)", "Motion Samples (3)"],
+        )
+        self.assertEqual(exporter.continued, {"Motion Samples": 3})
+        self.assertEqual(exporter.rows_written, 8)
+        values = []
+        for title in wb.sheetnames[1:]:
+            header, *data = wb[title].iter_rows(values_only=True)
+            self.assertEqual(header, ("Received", "Value"))
+            self.assertLessEqual(len(data), 3)
+            values.extend(data)
+        self.assertEqual([v[0].second for v in values], list(range(7)))
+        wb.close()
+
+    def test_long_title(self):
+        title = "A sheet title of thirty-one ch."
+        sheet = ExcelSheet(title, ["x"], [[i] for i in range(3)])
+        _, wb = self.export([sheet], max_sheet_rows=2)
+        self.assertEqual(wb.sheetnames[2], "A sheet title of thirty-one (3)")
+        wb.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
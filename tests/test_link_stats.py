@@ -0,0 +1,59 @@
+import unittest
+
+from utils.link_stats import RESTART_BACKSTEP_MS, LinkStats
+
+
+def feed(stats, seqs, timestamp=None):
+    return [stats.observe(seq, timestamp, now=0.0) for seq in seqs]
+
+
+class LinkStatsTest(unittest.TestCase):
+    def counts(self, stats):
+        return (
+            stats.received,
+            stats.lost,
+            stats.duplicates,
+            stats.reordered,
+            stats.resyncs,
+        )
+
+    def test_gap(self):
+        stats = LinkStats()
+        feed(stats, [0, 1, 4, 5])
+        self.assertEqual(self.counts(stats), (4, 2, 0, 0, 0))
+        self.assertAlmostEqual(stats.loss_pct(now=0.0), 2 / 6 * 100.0)
+
+    def test_duplicate(self):
+        stats = LinkStats()
+        self.assertEqual(feed(stats, [0, 1, 2, 1, 2]), [True] * 3 + [False] * 2)
+        self.assertEqual(self.counts(stats), (3, 0, 2, 0, 0))
+
+    def test_reorder(self):
+        stats = LinkStats()
+        self.assertEqual(feed(stats, [0, 2, 1, 3]), [True] * 4)
+        self.assertEqual(self.counts(stats), (4, 0, 0, 1, 0))
+        self.assertEqual(stats.loss_pct(now=0.0), 0.0)
+
+    def test_u16_wrap(self):
+        stats = LinkStats()
+        feed(stats, [0xFFFE, 0xFFFF, 0, 2])
+        self.assertEqual(self.counts(stats), (4, 1, 0, 0, 0))
+        self.assertFalse(stats.observe(0xFFFF, now=0.0))
+
+    def test_restart(self):
+        stats = LinkStats()
+        stats.observe(100, timestamp=5000, now=0.0)
+        stats.observe(101, timestamp=5100, now=0.0)
+        # counter and clock began again: a resync, not 65000 lost frames
+        stats.observe(0, timestamp=5100 - RESTART_BACKSTEP_MS - 1, now=0.0)
+        stats.observe(1, timestamp=4200, now=0.0)
+        self.assertEqual(self.counts(stats), (4, 0, 0, 0, 1))
+
+    def test_too_old(self):
+        stats = LinkStats(window=8)
+        feed(stats, [100, 50])
+        self.assertEqual(self.counts(stats), (2, 0, 0, 0, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from utils.log_index import LogIndex
+from utils.log_sink import AsyncLogSink
+
+
+class CancelTest(unittest.TestCase):
+    """
+    A cancelled query stops before the next day and returns what it has.
+    """
+
+    def test_cancel_between_days(self):
+        with tempfile.TemporaryDirectory() as directory:
+            sink = AsyncLogSink(directory)
+            sink.start()
+            today = datetime.now()
+            for days_ago in (2, 1, 0):
+                sink.write(f"day -{days_ago}", timestamp=today - timedelta(days_ago))
+            sink.stop()
+
+            index = LogIndex(directory)
+            messages = [entry.message for entry in index.query()]
+            self.assertEqual(messages, ["day -0", "day -1", "day -2"])
+
+            checks = []
+
+            def cancelled():
+                checks.append(None)
+                return len(checks) > 1
+
+            messages = [entry.message for entry in index.query(cancelled=cancelled)]
+            self.assertEqual(messages, ["day -0"])
+
+
+if __name__ == "__main__":
+    unittest.main()
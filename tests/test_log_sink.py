@@ -0,0 +1,56 @@
+import tempfile
+import time
+import unittest
+from datetime import datetime
+
+from utils.log_index import LogIndex
+from utils.log_sink import AsyncLogSink
+
+
+class LineBreakTest(unittest.TestCase):
+    """
+    A message with CR/LF (a binary LOGS payload) stays one line and one
+    index record.
+    """
+
+    def test_message_with_newlines(self):
+        with tempfile.TemporaryDirectory() as directory:
+            sink = AsyncLogSink(directory)
+            sink.start()
+            now = datetime.now()
+            sink.write("first\nsecond\r\nthird", timestamp=now)
+            sink.write("after", timestamp=now)
+            sink.stop()
+
+            entries = LogIndex(directory).query()
+            self.assertEqual(
+                [entry.message for entry in entries],
+                ["after", "first\\nsecond\\r\\nthird"],
+            )
+
+
+class VisibilityTest(unittest.TestCase):
+    """
+    A line is queryable as soon as its batch is written: the log is flushed
+    with every batch and today's index tail is read from it, so the Logs
+    page does not wait for the flush interval.
+    """
+
+    def test_query_before_flush_interval(self):
+        with tempfile.TemporaryDirectory() as directory:
+            sink = AsyncLogSink(directory, flush_interval_s=60.0)
+            sink.start()
+            self.addCleanup(sink.stop)
+            sink.write("[/dev/ttyUSB0] hello")
+            deadline = time.monotonic() + 5.0
+            while sink.written < 1 and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+            entries = LogIndex(directory).query()
+            self.assertEqual(
+                [entry.message for entry in entries], ["[/dev/ttyUSB0] hello"]
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
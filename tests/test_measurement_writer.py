@@ -0,0 +1,84 @@
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from utils.device_registry import DeviceState
+from utils.measurement_history import MeasurementRow
+from utils.measurement_writer import MeasurementWriter
+from utils.measurements import measurement_rows, sample_rows
+from utils.ring_buffer import TimedRingBuffer
+from utils.segment_store import SegmentStore
+
+
+class FailingStore(SegmentStore):
+    """
+    SegmentStore whose first append raises something other than OSError.
+    """
+
+    failures = 1
+
+    def append(self, payload, timestamp=None):
+        if self.failures:
+            self.failures -= 1
+            raise ValueError("bad row")
+        super().append(payload, timestamp)
+
+
+def row(timestamp):
+    return MeasurementRow(timestamp, 0.0, None, 1.0, 2.0, 3.0, 0.0, 0.0)
+
+
+class MeasurementWriterTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        base = Path(directory.name)
+        self.measurements = FailingStore(base / "measurements")
+        self.samples = SegmentStore(base / "samples")
+        self.writer = MeasurementWriter(
+            self.measurements, self.samples, base / "samples", interval_s=0.05
+        )
+        self.writer.attach("/dev/ttyUSB0")
+        self.addCleanup(self.measurements.close)
+        self.addCleanup(self.samples.close)
+
+    def test_more_samples_than_the_buffer_holds(self):
+        device = DeviceState("/dev/ttyUSB0", TimedRingBuffer(50))
+        other = DeviceState("/dev/ttyUSB1", TimedRingBuffer(50))
+        now = time.monotonic()
+        for i in range(200):
+            device.motion_buffer.append(float(i % 2), now + i)
+            self.writer.add_samples(device, (float(i % 2),), (now + i,))
+        self.writer.add_samples(other, [1.0] * 120, [now] * 120)
+        self.writer.start()
+        self.writer.stop()
+
+        self.assertEqual(len(list(sample_rows(self.samples))), 200)
+        other_store = self.writer.sample_store("/dev/ttyUSB1")
+        self.assertEqual(len(list(sample_rows(other_store))), 120)
+        self.assertEqual(self.writer.stats()["samples"], 320)
+
+    def test_error_does_not_stop_the_thread(self):
+        self.writer.start()
+        self.writer.add_measurement(row(1000.0))
+        self.writer.add_measurement(row(1001.0))
+        self.writer.stop()
+
+        self.assertFalse(self.writer.is_alive())
+        self.assertEqual(self.writer.write_errors, 1)
+        rows = list(measurement_rows(self.measurements))
+        self.assertEqual([r[0].timestamp() for r in rows], [1001.0])
+
+    def test_full_sample_queue_is_counted(self):
+        writer = MeasurementWriter(
+            self.measurements, self.samples, None, max_sample_queue=1
+        )
+        device = DeviceState("/dev/ttyUSB0", TimedRingBuffer(50))
+        writer.add_samples(device, (1.0,), (0.0,))
+        writer.add_samples(device, (1.0, 0.0), (0.0, 1.0))
+        self.assertEqual(writer.stats()["dropped_samples"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import struct
+import tempfile
+import unittest
+from pathlib import Path
+
+from utils.mmap_ring import HEADER_SIZE, MmapRing, _HEADER, _SLOT
+
+CAPACITY = 16
+RECORD = struct.Struct("<Q56x")  # payload: its own sequence number
+
+
+class TornWriteTest(unittest.TestCase):
+    """
+    The states a power cut can leave behind are recovered to a contiguous
+    run of intact records.
+    """
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / "torn.ring"
+
+    def fresh(self, n):
+        ring = MmapRing(self.path, CAPACITY, RECORD.size)
+        for _ in range(n):
+            ring.append(RECORD.pack(ring.write_index))
+        return ring
+
+    def slot_offset(self, ring, seq):
+        return HEADER_SIZE + (seq % ring.capacity) * ring.slot_size
+
+    def assertRecovered(self, start, end):
+        ring = MmapRing(self.path, CAPACITY, RECORD.size)
+        self.addCleanup(ring.close)
+        self.assertEqual((ring.start_index, ring.write_index), (start, end))
+        seqs = [RECORD.unpack(raw)[0] for raw in ring.records()]
+        self.assertEqual(seqs, list(range(start, end)))
+
+    def test_payload_without_slot_header(self):
+        ring = self.fresh(20)
+        start = self.slot_offset(ring, 20) + _SLOT.size
+        ring._map[start : start + RECORD.size] = RECORD.pack(20)
+        ring.close()
+        self.assertRecovered(5, 20)
+
+    def test_slot_without_ring_header(self):
+        ring = self.fresh(20)
+        index = ring.write_index
+        ring.append(RECORD.pack(20))
+        ring.write_index = index
+        ring._write_header()
+        ring.close()
+        self.assertRecovered(5, 21)
+
+    def test_torn_ring_header(self):
+        # slots are scanned instead
+        ring = self.fresh(20)
+        ring._map[_HEADER.size - 4 : _HEADER.size] = b"\xff" * 4
+        ring.close()
+        self.assertRecovered(4, 20)
+
+    def test_garbage_in_newest_slot(self):
+        # header advanced past a slot that never made it to disk
+        ring = self.fresh(20)
+        offset = self.slot_offset(ring, 19)
+        ring._map[offset : offset + ring.slot_size] = os.urandom(ring.slot_size)
+        ring.close()
+        self.assertRecovered(4, 19)
+
+
+if __name__ == "__main__":
+    unittest.main()
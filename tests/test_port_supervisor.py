@@ -0,0 +1,131 @@
+import os
+import random
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from utils import protocol
+from utils.port_supervisor import Backoff, PortCache, PortSupervisor
+
+
+class FakeSerial:
+    """
+    Serial port that answers a probe with `answer` (nothing if None).
+    """
+
+    def __init__(self, name, answer=None):
+        self.name = name
+        self.answer = answer
+        self.timeout = None
+        self.written = b""
+        self.closed = False
+        self._pending = b""
+
+    @property
+    def in_waiting(self):
+        return len(self._pending)
+
+    def write(self, data):
+        self.written += data
+        if data == protocol.PROBE_LINE and self.answer is not None:
+            self._pending += self.answer
+
+    def read(self, size=1):
+        chunk, self._pending = self._pending[:size], self._pending[size:]
+        return chunk
+
+    def close(self):
+        self.closed = True
+
+
+def opener(ports):
+    def open_port(name):
+        if name not in ports:
+            raise OSError(f"could not open port {name}")
+        return ports[name]
+
+    return open_port
+
+
+def comports(*names):
+    return mock.patch(
+        "serial.tools.list_ports.comports",
+        return_value=[SimpleNamespace(device=name) for name in names],
+    )
+
+
+class BackoffTest(unittest.TestCase):
+    def test_jitter_bounds(self):
+        random.seed(1)
+        backoff = Backoff(initial_s=1.0, max_s=8.0, factor=2.0, jitter=0.5)
+        for step in (1.0, 2.0, 4.0, 8.0, 8.0, 8.0):
+            delay = backoff.next_delay()
+            self.assertTrue(step * 0.5 <= delay <= step, (step, delay))
+        backoff.reset()
+        self.assertTrue(0.5 <= backoff.next_delay() <= 1.0)
+
+
+class PortSupervisorTest(unittest.TestCase):
+    def setUp(self):
+        fd, self.cache_path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        self.addCleanup(os.remove, self.cache_path)
+        self.frame = protocol.FrameEncoder().encode("MOTION", 1)
+
+    def supervisor(self, ports, **kwargs):
+        return PortSupervisor(
+            "/dev/configured",
+            opener(ports),
+            cache=PortCache(self.cache_path),
+            probe_timeout_s=0.3,
+            **kwargs,
+        )
+
+    def test_probe_answered(self):
+        port = FakeSerial("/dev/ttyUSB1", answer=self.frame)
+        supervisor = self.supervisor({"/dev/ttyUSB1": port})
+        self.assertIs(supervisor.probe("/dev/ttyUSB1"), port)
+        self.assertEqual(port.written, protocol.PROBE_LINE)
+        self.assertFalse(port.closed)
+
+    def test_probe_text_answer(self):
+        # transmitters on the legacy text protocol are found too
+        port = FakeSerial("/dev/ttyUSB1", answer=b"PERFORMANCE_STATUS:{}\n")
+        supervisor = self.supervisor({"/dev/ttyUSB1": port})
+        self.assertIs(supervisor.probe("/dev/ttyUSB1"), port)
+
+    def test_probe_silent(self):
+        port = FakeSerial("/dev/ttyUSB1")
+        supervisor = self.supervisor({"/dev/ttyUSB1": port})
+        self.assertIsNone(supervisor.probe("/dev/ttyUSB1"))
+        self.assertTrue(port.closed)
+
+    def test_discover_and_cache_hit(self):
+        silent = FakeSerial("/dev/ttyUSB0")
+        answering = FakeSerial("/dev/ttyUSB1", answer=self.frame)
+        ports = {"/dev/ttyUSB0": silent, "/dev/ttyUSB1": answering}
+        supervisor = self.supervisor(ports)
+        with comports("/dev/ttyUSB0", "/dev/ttyUSB1"):
+            self.assertIs(supervisor.connect(), answering)
+        self.assertEqual(supervisor.connected_port, "/dev/ttyUSB1")
+        self.assertEqual(PortCache(self.cache_path).load(), "/dev/ttyUSB1")
+
+        # next start: the cached port is probed before any scan
+        answering.written = b""
+        supervisor = self.supervisor(ports)
+        with comports() as scan:
+            self.assertIs(supervisor.connect(), answering)
+        scan.assert_not_called()
+        self.assertEqual(supervisor.connected_port, "/dev/ttyUSB1")
+
+    def test_nothing_found_backs_off(self):
+        supervisor = self.supervisor({}, backoff=Backoff(initial_s=1.0))
+        with comports():
+            self.assertIsNone(supervisor.connect())
+        self.assertTrue(0.0 < supervisor.wait_s() <= 1.0)
+        self.assertIn("reconnecting", supervisor.status_text())
+
+
+if __name__ == "__main__":
+    unittest.main()
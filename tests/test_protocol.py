@@ -0,0 +1,49 @@
+import subprocess
+import sys
+import unittest
+
+from utils import protocol
+
+
+class MalformedPayloadTest(unittest.TestCase):
+    """
+    Payloads that pass the CRC but are too short or misaligned decode to
+    None instead of raising.
+    """
+
+    def test_short_performance_status(self):
+        self.assertIsNone(protocol.decode_performance_status(b"\x00" * 19))
+        status = protocol.decode_performance_status(
+            protocol.encode_performance_status({"cpu": 1.0, "version": "v"})
+        )
+        self.assertEqual((status["cpu"], status["version"]), (1.0, "v"))
+
+    def test_misaligned_motion_batch(self):
+        self.assertIsNone(protocol.decode_motion_batch(b""))
+        self.assertIsNone(protocol.decode_motion_batch(b"\x64\x00\x01"))
+        self.assertEqual(protocol.decode_motion_batch(b"\x64\x00"), (100, []))
+        batch = (100, [(1, 5, 1000), (0, 3, 1500)])
+        self.assertEqual(
+            protocol.decode_motion_batch(protocol.encode_motion_batch(batch)), batch
+        )
+
+
+class SenderImportTest(unittest.TestCase):
+    """
+    The transmitter's modules import without the station-only ones.
+    """
+
+    def test_no_station_modules(self):
+        code = (
+            "import sys, utils.protocol, utils.pin_driver, utils.edge_capture, "
+            "utils.motion_batcher; print(sorted(m for m in sys.modules "
+            "if m in ('serial', 'utils.constants', 'utils.motion_receiver')))"
+        )
+        out = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        self.assertEqual(out.stdout.strip(), "[]")
+
+
+if __name__ == "__main__":
+    unittest.main()
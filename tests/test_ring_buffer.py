@@ -0,0 +1,51 @@
+import unittest
+
+from utils.ring_buffer import RingBuffer, TimedRingBuffer
+
+
+def store_unpublished(ring, value):
+    # what append() has done when a reader runs between its store and the
+    # write_index update
+    i = ring.write_index
+    ring._claimed = i + 1
+    ring._data[i % ring.capacity] = value
+
+
+class LappedReadTest(unittest.TestCase):
+    """
+    A slot the producer overwrites while a reader copies it is dropped,
+    even before the producer publishes the new write index.
+    """
+
+    def test_since(self):
+        ring = RingBuffer(4)
+        ring.extend([0.0, 1.0, 2.0, 3.0])
+        copy = ring._copy
+
+        def racing_copy(start, end, data=None):
+            store_unpublished(ring, 4.0)
+            return copy(start, end, data)
+
+        ring._copy = racing_copy
+        items, cursor = ring.since(0)
+        self.assertEqual((list(items), cursor), ([1.0, 2.0, 3.0], 4))
+
+    def test_since_with_times(self):
+        ring = TimedRingBuffer(4)
+        ring.extend([0.0, 1.0, 2.0, 3.0], [10.0, 11.0, 12.0, 13.0])
+        store_unpublished(ring, 4.0)
+        ring._times[0] = 14.0
+        items, times, cursor = ring.since_with_times(0)
+        self.assertEqual(list(items), [1.0, 2.0, 3.0])
+        self.assertEqual((list(times), cursor), ([11.0, 12.0, 13.0], 4))
+
+    def test_full_window_kept(self):
+        ring = RingBuffer(4)
+        ring.extend([0.0, 1.0, 2.0, 3.0, 4.0])
+        self.assertEqual(list(ring.tail(4)), [1.0, 2.0, 3.0, 4.0])
+        items, cursor = ring.since(0)
+        self.assertEqual((list(items), cursor), ([1.0, 2.0, 3.0, 4.0], 5))
+
+
+if __name__ == "__main__":
+    unittest.main()
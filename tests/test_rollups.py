@@ -0,0 +1,66 @@
+import os
+import tempfile
+import time
+import unittest
+from datetime import datetime
+
+from utils.measurement_history import MeasurementRow
+from utils.rollups import Rollups, RollupBucket
+
+
+class DaylightSavingTest(unittest.TestCase):
+    """
+    Day buckets start at local midnight on both sides of a DST change.
+    """
+
+    def setUp(self):
+        self.tz = os.environ.get("TZ")
+        os.environ["TZ"] = "Europe/Berlin"
+        time.tzset()
+        self.directory = tempfile.TemporaryDirectory()
+        self.rollups = Rollups(self.directory.name)
+
+    def tearDown(self):
+        self.rollups.close()
+        self.directory.cleanup()
+        if self.tz is None:
+            del os.environ["TZ"]
+        else:
+            os.environ["TZ"] = self.tz
+        time.tzset()
+
+    def day_length_h(self, day):
+        tier = self.rollups.tiers["day"]
+        start = tier.bucket_start(datetime(*day, 12).timestamp())
+        self.assertEqual(datetime.fromtimestamp(start), datetime(*day))
+        tier._open(RollupBucket(start))
+        return (tier._end - start) / 3600
+
+    def test_day_lengths(self):
+        self.assertEqual(self.day_length_h((2026, 3, 28)), 24)
+        self.assertEqual(self.day_length_h((2026, 3, 29)), 23)
+        self.assertEqual(self.day_length_h((2026, 10, 25)), 25)
+
+
+class CheckpointTest(unittest.TestCase):
+    def test_open_buckets_survive_a_crash(self):
+        # the three rows must fall into one hour bucket
+        if time.time() % 3600 > 3600 - 5:
+            time.sleep(6)
+        with tempfile.TemporaryDirectory() as directory:
+            rollups = Rollups(directory, checkpoint_interval_s=1)
+            now = time.time()
+            for i in range(3):
+                rollups.add_measurement(
+                    MeasurementRow(now + i, 0.0, None, 10.0, 1.0, 1.0, 0.0, 0.0)
+                )
+            # no close(): reopen from what the checkpoints wrote
+            reopened = Rollups(directory)
+            for name in ("hour", "day"):
+                self.assertGreaterEqual(reopened.tiers[name].current.count[1], 2)
+            reopened.close()
+            rollups.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
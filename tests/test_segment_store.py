@@ -0,0 +1,76 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from utils.segment_store import SegmentStore
+
+PAYLOAD = bytes(range(56))
+RECORD_SIZE = 16 + len(PAYLOAD)
+
+
+class RecoveryTest(unittest.TestCase):
+    """
+    On open, the newest segment is cut at the first incomplete or corrupt
+    record; every record before it is kept and appends carry on after it.
+    """
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        store = SegmentStore(self.directory)
+        for i in range(10):
+            store.append(PAYLOAD, 1000.0 + i)
+        store.close()
+        (self.segment,) = self.directory.glob("*.seg")
+        self.size = self.segment.stat().st_size
+
+    def reopen(self):
+        store = SegmentStore(self.directory)
+        self.addCleanup(store.close)
+        return store
+
+    def timestamps(self, store):
+        return [timestamp for timestamp, _ in store.records()]
+
+    def test_torn_last_record(self):
+        # a crash cut the last record's payload short
+        with open(self.segment, "r+b") as f:
+            f.truncate(self.size - 20)
+        store = self.reopen()
+        self.assertEqual(store.recovered_records, 9)
+        self.assertEqual(store.truncated_bytes, RECORD_SIZE - 20)
+        self.assertEqual(self.segment.stat().st_size, self.size - RECORD_SIZE)
+
+        store.append(PAYLOAD, 2000.0)
+        expected = [1000.0 + i for i in range(9)] + [2000.0]
+        self.assertEqual(self.timestamps(store), expected)
+
+    def test_half_written_record(self):
+        # a power cut left a zero-filled block where the next record began
+        with open(self.segment, "ab") as f:
+            f.write(bytes(30))
+        store = self.reopen()
+        self.assertEqual(store.recovered_records, 10)
+        self.assertEqual(store.truncated_bytes, 30)
+        self.assertEqual(self.segment.stat().st_size, self.size)
+        self.assertEqual(len(self.timestamps(store)), 10)
+
+    def test_corrupt_last_record(self):
+        with open(self.segment, "r+b") as f:
+            f.seek(self.size - 1)
+            f.write(b"\xff")
+        store = self.reopen()
+        self.assertEqual(store.recovered_records, 9)
+        self.assertEqual(store.truncated_bytes, RECORD_SIZE)
+
+    def test_segment_without_header(self):
+        with open(self.segment, "r+b") as f:
+            f.truncate(5)
+        store = self.reopen()
+        self.assertFalse(self.segment.exists())
+        self.assertEqual(self.timestamps(store), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
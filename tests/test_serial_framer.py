@@ -0,0 +1,59 @@
+import unittest
+
+from utils.protocol import FrameEncoder, NOT_A_FRAME, frame_length
+from utils.serial_framer import SerialFramer
+
+
+def feed_bytewise(framer, data):
+    out = []
+    for i in range(len(data)):
+        framer.feed(data[i : i + 1])
+        out.extend(framer.frames())
+    return out
+
+
+def feed_all(framer, data):
+    framer.feed(data)
+    return list(framer.frames())
+
+
+class SyncInTextTest(unittest.TestCase):
+    """
+    0xA5 (SYNC) inside a text line, e.g. UTF-8 "¥" (C2 A5) or "å" (C3 A5),
+    stays part of the line instead of starting a bogus frame.
+    """
+
+    def test_frame_length_rejects_text_after_sync(self):
+        self.assertEqual(frame_length("¥5\n".encode(), 1), NOT_A_FRAME)
+        self.assertEqual(frame_length("å\n".encode(), 1), NOT_A_FRAME)
+
+    def test_lines_with_sync_are_delivered_whole(self):
+        lines = ["LOGS:price ¥5", "MOTION:1", "LOGS:på", "MOTION:0"]
+        data = b"".join(line.encode() + b"\n" for line in lines)
+        for frames in (
+            feed_bytewise(SerialFramer(), data),
+            feed_all(SerialFramer(), data),
+        ):
+            self.assertEqual(frames, [line.encode() for line in lines])
+
+    def test_frames_around_text_with_sync(self):
+        encoder = FrameEncoder()
+        data = (
+            encoder.encode("MOTION", 1)
+            + "LOGS:¥\n".encode()
+            + encoder.encode("LOGS", "å")
+            + b"MOTION:1\n"
+        )
+        framer = SerialFramer()
+        frames = feed_bytewise(framer, data)
+        self.assertEqual(len(frames), 4)
+        self.assertEqual(frames[0].payload, b"\x01")
+        self.assertEqual(frames[1], "LOGS:¥".encode())
+        self.assertEqual(frames[2].payload, "å".encode())
+        self.assertEqual(frames[3], b"MOTION:1")
+        self.assertEqual((framer.dropped_bytes, framer.crc_errors), (0, 0))
+        self.assertEqual(framer.buffer, b"")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,2 +1,15 @@
-from .motion_receiver import MotionReceiver
-from .constants import CONSTANTS
+# MotionReceiver and CONSTANTS are station-only (pyserial, config.json); they
+# are imported on first use so the transmitter can import utils.protocol,
+# pin_driver, edge_capture and motion_batcher on their own
+
+
+def __getattr__(name):
+    if name == "MotionReceiver":
+        from .motion_receiver import MotionReceiver
+
+        return MotionReceiver
+    if name == "CONSTANTS":
+        from .constants import CONSTANTS
+
+        return CONSTANTS
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,109 @@
+import gzip
+import os
+from pathlib import Path
+
+try:
+    import zstandard
+except ImportError:  # optional; gzip is always there
+    zstandard = None
+
+CODECS = {"gzip": ".gz", "zstd": ".zst"}
+SUFFIXES = tuple(CODECS.values())
+TMP_SUFFIX = ".tmp"
+
+
+# -----------------------------
+# Transparent reading
+# -----------------------------
+def is_compressed(path):
+    return Path(path).suffix in SUFFIXES
+
+
+def plain_name(name):
+    """
+    File name without a compression suffix.
+    """
+    for suffix in SUFFIXES:
+        if name.endswith(suffix):
+            return name[: -len(suffix)]
+    return name
+
+
+def find(path):
+    """
+    The file holding `path`: `path` itself or a compressed copy of it,
+    None if there is neither. The plain file wins if both exist (a crash
+    after compressing but before removing the original).
+    """
+    path = Path(path)
+    if path.exists():
+        return path
+    for suffix in SUFFIXES:
+        candidate = path.with_name(path.name + suffix)
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def open_read(path):
+    """
+    Open a plain or compressed file for binary reading.
+    """
+    path = Path(path)
+    if path.suffix == CODECS["gzip"]:
+        return gzip.open(path, "rb")
+    if path.suffix == CODECS["zstd"]:
+        if zstandard is None:
+            raise OSError(f"{path.name}: the zstandard package is not installed")
+        return zstandard.open(path, "rb")
+    return open(path, "rb")
+
+
+def read_bytes(path):
+    with open_read(path) as f:
+        return f.read()
+
+
+# -----------------------------
+# Compressing
+# -----------------------------
+def available(codec):
+    return codec == "gzip" or (codec == "zstd" and zstandard is not None)
+
+
+def _open_write(path, codec, level):
+    if codec == "zstd":
+        cctx = zstandard.ZstdCompressor(level=3 if level is None else level)
+        return zstandard.open(path, "wb", cctx=cctx)
+    return gzip.open(path, "wb", compresslevel=6 if level is None else level)
+
+
+def compress_file(path, codec="gzip", level=None, chunk_size=1 << 16):
+    """
+    Replace `path` by a compressed copy and return the new path.
+
+    The copy is written under a temporary name, fsynced and renamed into
+    place before the original is removed, so a crash at any point leaves
+    at least one complete file.
+    """
+    path = Path(path)
+    target = path.with_name(path.name + CODECS[codec])
+    tmp = target.with_name(target.name + TMP_SUFFIX)
+    try:
+        with open(path, "rb") as src, _open_write(tmp, codec, level) as dst:
+            while True:
+                chunk = src.read(chunk_size)
+                if not chunk:
+                    break
+                dst.write(chunk)
+        fd = os.open(tmp, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp, target)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    path.unlink()
+    return target
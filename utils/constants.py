@@ -23,6 +23,9 @@ DEFAULT_CONFIG = {
         "IS_FULLSCREEN": False,
         "MOTION_HISTORY_LENGTH": 50,
         "DEFAULT_SERIAL_PORT": "/dev/ttyAMA0",
+        # every port to serve, one transmitter each; replaces DEFAULT_SERIAL_PORT
+        # (list it too to keep it), empty means DEFAULT_SERIAL_PORT only
+        "SERIAL_PORTS": [],
         "DEFAULT_BAUDRATE": 9600,
         "LOGS_HISTORY_LENGTH": 10,
         "DEFAULT_SCREEN_SIZE": [480, 300],
@@ -43,6 +46,53 @@ DEFAULT_CONFIG = {
         # "LOG_DIR": Path.cwd(),
         "LOG_DIR": "hello",
         "USE_MOCK_DATA": False,
+        # console logging; at DEBUG only one received line in LOG_SAMPLE_EVERY is shown
+        "LOG_LEVEL": "INFO",
+        "LOG_SAMPLE_EVERY": 100,
+        # log file sink: queued lines, flush/fsync cadence in seconds
+        "LOG_QUEUE_SIZE": 1024,
+        "LOG_FLUSH_INTERVAL_S": 1.0,
+        "LOG_FSYNC_INTERVAL_S": 5.0,
+        # record raw serial chunks to this file ("" = off); "replay:<file>"
+        # ports play a capture back at REPLAY_SPEED x real time (0 = max)
+        "CAPTURE_FILE": "",
+        "REPLAY_SPEED": 1.0,
+        # link quality: duplicate detection window (frames), loss % window
+        "LINK_DEDUP_WINDOW": 64,
+        "LINK_LOSS_WINDOW_S": 60,
+        # reconnect: backoff bounds in seconds; with one configured port the
+        # other serial ports are probed and the last good one is cached.
+        # A transmitter answers a probe within a poll loop pass (up to ~3.5 s
+        # while it holds a detection); batched motion alone may be 5 s apart
+        "RECONNECT_INITIAL_S": 0.5,
+        "RECONNECT_MAX_S": 30.0,
+        "PORT_AUTO_DISCOVERY": True,
+        "PORT_PROBE_TIMEOUT_S": 4.0,
+        "PORT_CACHE_FILE": "last_port.json",
+        # measurement history: rows kept in RAM, on-disk segment store
+        "MEASUREMENT_WINDOW": 3600,
+        "MEASUREMENT_DIR": "measurements",
+        "SEGMENT_MAX_BYTES": 1048576,
+        "SEGMENT_MAX_AGE_S": 3600,
+        # seconds between saves of the open hour/day rollup buckets
+        "ROLLUP_CHECKPOINT_S": 300,
+        # optional SQLite time-series database ("" = off) for range queries
+        # over samples, motion events, metrics and logs of every transmitter
+        "SQLITE_PATH": "",
+        # background maintenance: compress closed log days and segments
+        # ("gzip", "zstd" with the zstandard package, "" = off), remove
+        # files older than RETENTION_DAYS and the oldest ones above
+        # STORAGE_QUOTA_MB (0 = keep everything)
+        "STORAGE_COMPRESSION": "gzip",
+        "COMPRESS_AFTER_DAYS": 1,
+        "RETENTION_DAYS": 0,
+        "STORAGE_QUOTA_MB": 0,
+        "MAINTENANCE_INTERVAL_S": 3600,
+        # seconds between two readings of each system metric, taken on a
+        # background thread
+        "SYSTEM_SAMPLE_INTERVALS_S": {"cpu": 1.0, "ram": 2.0, "disk": 30.0, "net": 1.0},
+        # Graphs page plot: "canvas" (native Tk items) or "matplotlib"
+        "GRAPH_BACKEND": "canvas",
     },
 }
 
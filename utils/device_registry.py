@@ -0,0 +1,70 @@
+import threading
+
+from utils.constants import CONSTANTS
+from utils.link_stats import LinkStats
+from utils.ring_buffer import RingBuffer, TimedRingBuffer
+
+
+# -----------------------------
+# Per-transmitter state
+# -----------------------------
+class DeviceState:
+    """
+    Buffers and status of one transmitter as seen by the control station.
+    """
+
+    def __init__(self, key, motion_buffer=None, log_buffer=None, transmitter_status=None):
+        motion_len = CONSTANTS.get("MOTION_HISTORY_LENGTH")
+        self.key = key
+        if motion_buffer is None:
+            motion_buffer = TimedRingBuffer(motion_len)
+        if log_buffer is None:
+            log_buffer = RingBuffer(CONSTANTS.get("LOGS_HISTORY_LENGTH"), None)
+        self.motion_buffer = motion_buffer
+        self.log_buffer = log_buffer
+        self.transmitter_status = (
+            transmitter_status if transmitter_status is not None else dict()
+        )
+        # sequence gaps / duplicates of the binary frames from this device
+        self.link = LinkStats(
+            CONSTANTS.get("LINK_DEDUP_WINDOW", 64),
+            CONSTANTS.get("LINK_LOSS_WINDOW_S", 60),
+        )
+
+
+class DeviceRegistry:
+    """
+    Transmitters known to the control station, keyed by
+    `device_key(port, device_id)`. Devices are created by the receiver
+    thread the first time they are heard and read by the Tk thread.
+    """
+
+    def __init__(self):
+        self._devices = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def device_key(port, device_id=0):
+        return port if not device_id else f"{port}#{device_id}"
+
+    def add(self, device):
+        with self._lock:
+            self._devices[device.key] = device
+        return device
+
+    def get(self, key):
+        device = self._devices.get(key)
+        if device is None:
+            with self._lock:
+                device = self._devices.get(key)
+                if device is None:
+                    device = DeviceState(key)
+                    self._devices[key] = device
+        return device
+
+    def keys(self):
+        with self._lock:
+            return list(self._devices)
+
+    def __len__(self):
+        return len(self._devices)
@@ -0,0 +1,48 @@
+import queue
+import time
+from collections import namedtuple
+
+Edge = namedtuple("Edge", ["timestamp", "level"])
+
+
+# -----------------------------
+# Edge capture
+# -----------------------------
+class EdgeCapture:
+    """
+    Records rising and falling edges of an input pin with monotonic
+    timestamps into a bounded queue, so the sender loop can transmit each
+    edge as soon as it happens instead of sampling the pin on a timer.
+    """
+
+    def __init__(self, driver, maxsize=1024):
+        self.driver = driver
+        self.edges = queue.Queue(maxsize=maxsize)
+        self.level = None
+        self.edges_captured = 0
+        self.edges_dropped = 0
+        self.edges_missed = 0
+
+    def start(self):
+        self.level = self.driver.read()
+        self.driver.add_edge_callback(self._on_edge)
+
+    def _on_edge(self, level):
+        timestamp = time.monotonic()
+        # two reports of the same level mean the opposite edge in between
+        # was too short for the GPIO layer to see
+        if level == self.level:
+            self.edges_missed += 1
+            return
+        self.level = level
+        self.edges_captured += 1
+        try:
+            self.edges.put_nowait(Edge(timestamp, level))
+        except queue.Full:
+            self.edges_dropped += 1
+
+    def get(self, timeout=None):
+        try:
+            return self.edges.get(timeout=timeout)
+        except queue.Empty:
+            return None
@@ -0,0 +1,114 @@
+import os
+import threading
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+
+TIME_FORMAT = "yyyy-mm-dd hh:mm:ss.000"
+# Excel opens at most this many rows per worksheet, header included
+MAX_SHEET_ROWS = 1048576
+MAX_TITLE_LENGTH = 31
+
+
+# -----------------------------
+# Streaming Excel export
+# -----------------------------
+class ExcelSheet:
+    """
+    One worksheet to export: `rows` is any iterable of row lists and is
+    only consumed on the export thread. Columns listed in `time_columns`
+    hold datetimes (or None) and get a millisecond date format.
+    """
+
+    def __init__(self, title, header, rows, time_columns=()):
+        self.title = title
+        self.header = header
+        self.rows = rows
+        self.time_columns = tuple(time_columns)
+
+
+class ExcelExporter(threading.Thread):
+    """
+    Writes `sheets` to `path` from a worker thread using openpyxl's
+    write-only workbook, which streams rows to disk so memory stays flat
+    whatever the row count.
+
+    The Tk thread polls `rows_written` / `done` (e.g. from `after()`) and
+    may call `cancel()`. The file is written under a temporary name and
+    only moved to `path` once complete, so a cancelled or failed export
+    leaves nothing behind.
+
+    A sheet with more rows than fit in one worksheet (`max_sheet_rows`)
+    goes on in continuation sheets, "Motion Samples (2)" and so on, each
+    with the header again; `continued` maps its title to the number of
+    worksheets used.
+    """
+
+    def __init__(self, path, sheets, max_sheet_rows=MAX_SHEET_ROWS):
+        super().__init__(daemon=True)
+        self.path = path
+        self.sheets = sheets
+        self.max_sheet_rows = max_sheet_rows
+        self.continued = {}
+        self.rows_written = 0
+        self.error = None
+        self.done = threading.Event()
+        self._cancel = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def run(self):
+        tmp_path = self.path + ".part"
+        try:
+            wb = Workbook(write_only=True)
+            for sheet in self.sheets:
+                if not self._write_sheet(wb, sheet):
+                    return
+            wb.save(tmp_path)
+            if self.cancelled:
+                return
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            self.error = e
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            self.done.set()
+
+    def _create_sheet(self, wb, sheet, part):
+        title = sheet.title
+        if part > 1:
+            suffix = f" ({part})"
+            title = title[: MAX_TITLE_LENGTH - len(suffix)] + suffix
+            self.continued[sheet.title] = part
+        ws = wb.create_sheet(title)
+        ws.append(sheet.header)
+        return ws
+
+    def _write_sheet(self, wb, sheet):
+        part = 1
+        ws = self._create_sheet(wb, sheet, part)
+        rows_left = self.max_sheet_rows - 1
+        time_columns = sheet.time_columns
+        cancel = self._cancel
+        for row in sheet.rows:
+            if cancel.is_set():
+                return False
+            if not rows_left:
+                part += 1
+                ws = self._create_sheet(wb, sheet, part)
+                rows_left = self.max_sheet_rows - 1
+            rows_left -= 1
+            for i in time_columns:
+                if row[i] is not None:
+                    cell = WriteOnlyCell(ws, value=row[i])
+                    cell.number_format = TIME_FORMAT
+                    row[i] = cell
+            ws.append(row)
+            self.rows_written += 1
+        return True
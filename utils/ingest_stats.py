@@ -0,0 +1,62 @@
+import time
+from collections import deque
+
+
+# -----------------------------
+# Ingest statistics
+# -----------------------------
+class IngestStats:
+    """
+    Rolling counters for the receive path: sustained frames per second over
+    a sliding window and the latency between a chunk leaving the serial
+    driver and its frames being stored.
+    """
+
+    def __init__(self, window_s=10.0, latency_samples=256):
+        self.window_s = window_s
+        self.frames_total = 0
+        self.bytes_total = 0
+        self.started_at = time.monotonic()
+        self._frame_times = deque()
+        self._latencies = deque(maxlen=latency_samples)
+
+    def record_chunk(self, size):
+        self.bytes_total += size
+
+    def record_frame(self, received_at, now=None):
+        if now is None:
+            now = time.monotonic()
+        self.frames_total += 1
+        self._frame_times.append(now)
+        self._latencies.append(now - received_at)
+
+        horizon = now - self.window_s
+        times = self._frame_times
+        while times and times[0] < horizon:
+            times.popleft()
+
+    def lines_per_second(self, now=None):
+        if now is None:
+            now = time.monotonic()
+        span = min(self.window_s, now - self.started_at)
+        if span <= 0:
+            return 0.0
+        horizon = now - self.window_s
+        count = sum(1 for t in self._frame_times if t >= horizon)
+        return count / span
+
+    def latency_ms(self, percentile=50):
+        if not self._latencies:
+            return 0.0
+        ordered = sorted(self._latencies)
+        idx = min(len(ordered) - 1, int(len(ordered) * percentile / 100.0))
+        return ordered[idx] * 1000.0
+
+    def snapshot(self):
+        return {
+            "frames_total": self.frames_total,
+            "bytes_total": self.bytes_total,
+            "lines_per_s": self.lines_per_second(),
+            "latency_p50_ms": self.latency_ms(50),
+            "latency_p99_ms": self.latency_ms(99),
+        }
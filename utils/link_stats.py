@@ -0,0 +1,130 @@
+import time
+from array import array
+
+SEQ_MODULO = 0x10000  # frame sequence numbers are u16 and wrap
+# a sender timestamp this far behind the newest one means it restarted
+RESTART_BACKSTEP_MS = 1000
+
+
+# -----------------------------
+# Link quality
+# -----------------------------
+class LinkStats:
+    """
+    Gap, duplicate and reorder tracking for one transmitter's sequence
+    numbers, O(1) per frame.
+
+    The newest `window` sequence numbers are remembered in a bitmask
+    (bit k = newest - k was seen), so a frame arriving twice within the
+    window is reported as a duplicate and a late frame that fills a gap is
+    counted as reordered instead of lost. Loss over the last `loss_window_s`
+    seconds is kept in per-second buckets for `loss_pct()`.
+    """
+
+    def __init__(self, window=64, loss_window_s=60):
+        self.window = window
+        self.loss_window_s = loss_window_s
+        self.received = 0
+        self.lost = 0
+        self.duplicates = 0
+        self.reordered = 0
+        self.resyncs = 0
+
+        self._newest = None
+        self._newest_ts = None
+        self._seen = 0
+        self._full = (1 << window) - 1
+        self._bucket_received = array("L", [0]) * loss_window_s
+        self._bucket_lost = array("l", [0]) * loss_window_s
+        self._bucket_second = array("q", [-1]) * loss_window_s
+
+    def _bucket(self, now):
+        second = int(now)
+        i = second % self.loss_window_s
+        if self._bucket_second[i] != second:
+            self._bucket_second[i] = second
+            self._bucket_received[i] = 0
+            self._bucket_lost[i] = 0
+        return i
+
+    def _resync(self, seq, timestamp):
+        self._newest = seq
+        self._newest_ts = timestamp
+        self._seen = 1
+
+    def observe(self, seq, timestamp=None, now=None):
+        """
+        Account for one frame. Returns False if it is a duplicate that
+        should be dropped.
+        """
+        i = self._bucket(time.monotonic() if now is None else now)
+
+        if self._newest is None:
+            self._resync(seq, timestamp)
+        elif (
+            timestamp is not None
+            and self._newest_ts is not None
+            and timestamp < self._newest_ts - RESTART_BACKSTEP_MS
+        ):
+            # sender restarted and its counter began again
+            self.resyncs += 1
+            self._resync(seq, timestamp)
+        else:
+            diff = (seq - self._newest) % SEQ_MODULO
+            if diff >= SEQ_MODULO // 2:
+                diff -= SEQ_MODULO
+
+            if diff > 0:
+                if diff > self.window:
+                    self._seen = 1
+                else:
+                    self._seen = ((self._seen << diff) | 1) & self._full
+                gap = diff - 1
+                self.lost += gap
+                self._bucket_lost[i] += gap
+                self._newest = seq
+                if timestamp is not None:
+                    self._newest_ts = timestamp
+            elif -diff < self.window:
+                bit = 1 << -diff
+                if self._seen & bit:
+                    self.duplicates += 1
+                    return False
+                # late frame that we had counted as lost
+                self._seen |= bit
+                self.reordered += 1
+                self.lost -= 1
+                self._bucket_lost[i] -= 1
+            else:
+                # too old to tell apart from a restart
+                self.resyncs += 1
+                self._resync(seq, timestamp)
+
+        self.received += 1
+        self._bucket_received[i] += 1
+        return True
+
+    def loss_pct(self, now=None):
+        """
+        Share of frames lost over the last `loss_window_s` seconds.
+        """
+        second = int(time.monotonic() if now is None else now)
+        oldest = second - self.loss_window_s
+        received = lost = 0
+        for i in range(self.loss_window_s):
+            if self._bucket_second[i] > oldest:
+                received += self._bucket_received[i]
+                lost += self._bucket_lost[i]
+        lost = max(lost, 0)
+        total = received + lost
+        return lost / total * 100.0 if total else 0.0
+
+    def snapshot(self):
+        return {
+            "received": self.received,
+            "lost": self.lost,
+            "duplicates": self.duplicates,
+            "reordered": self.reordered,
+            "resyncs": self.resyncs,
+            "loss_pct": self.loss_pct(),
+        }
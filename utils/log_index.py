@@ -0,0 +1,353 @@
+import io
+import logging
+import re
+import struct
+import time
+from datetime import date, datetime
+from pathlib import Path
+
+from utils.compression import find, is_compressed, read_bytes
+
+LOG_FILENAME = "motion_log.txt"
+INDEX_SUFFIX = ".idx"
+
+# one record per log line: time (epoch s), byte offset, length, level
+_RECORD = struct.Struct("<dQIB3x")
+
+LEVELS = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+}
+_LEVEL_NAMES = {value: name for name, value in LEVELS.items()}
+_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+# "2026-10-18 08:00:00 [WARNING] text"; older files have "...:00: text"
+_LINE = re.compile(rb"^(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d)(?: \[(\w+)\] |: )(.*)$")
+_GUESS = re.compile(r"\b(ERROR|FAIL|WARN|LOST)", re.IGNORECASE)
+_DAY = re.compile(r"^\d{4}-\d\d-\d\d$")
+
+
+# -----------------------------
+# Lines and levels
+# -----------------------------
+def guess_level(text):
+    """
+    Severity of a line that did not come with one (transmitter logs,
+    files written before levels were recorded).
+    """
+    match = _GUESS.search(text)
+    if not match:
+        return logging.INFO
+    word = match.group(1).upper()
+    return logging.ERROR if word in ("ERROR", "FAIL") else logging.WARNING
+
+
+def format_line(timestamp, level, message):
+    name = _LEVEL_NAMES.get(level, "INFO")
+    line = f"{timestamp.strftime(_TIME_FORMAT)} [{name}] {message}\n"
+    return line.encode("utf-8")
+
+
+def parse_line(raw):
+    """
+    (timestamp, level, message) of one line as bytes, or None.
+    """
+    match = _LINE.match(raw.rstrip(b"\r\n"))
+    if not match:
+        return None
+    stamp, level, message = match.groups()
+    message = message.decode("utf-8", "replace")
+    timestamp = time.mktime(time.strptime(stamp.decode(), _TIME_FORMAT))
+    if level is None:
+        return timestamp, guess_level(message), message
+    return timestamp, LEVELS.get(level.decode(), logging.INFO), message
+
+
+def index_path(log_path):
+    return Path(log_path).with_suffix(INDEX_SUFFIX)
+
+
+def pack_record(timestamp, offset, length, level):
+    return _RECORD.pack(timestamp, offset, length, level)
+
+
+def stored_records(log_path):
+    path = index_path(log_path)
+    return path.stat().st_size // _RECORD.size if path.exists() else 0
+
+
+def catch_up(log_path, persist=True, stored=None):
+    """
+    Index the lines of `log_path` past the end of its index (a file from
+    before indexing, or a crash between the log and index writes), taking
+    the index to hold `stored` records if given. Returns the packed
+    records added and the indexed size of the log.
+    """
+    idx_path = index_path(log_path)
+    if stored is None:
+        stored = stored_records(log_path)
+    covered = 0
+    whole = stored * _RECORD.size
+    if whole:
+        with open(idx_path, "rb") as f:
+            f.seek(whole - _RECORD.size)
+            _, offset, length, _ = _RECORD.unpack(f.read(_RECORD.size))
+        covered = offset + length
+    try:
+        with open(log_path, "rb") as f:
+            f.seek(covered)
+            added, offset = _index_lines(f, covered)
+    except FileNotFoundError:
+        return b"", 0
+    if persist and added:
+        with open(idx_path, "r+b" if idx_path.exists() else "wb") as f:
+            # drop a torn trailing record first
+            f.truncate(whole)
+            f.seek(whole)
+            f.write(added)
+    return added, offset
+
+
+def _index_lines(f, offset):
+    records = []
+    for raw in f:
+        if not raw.endswith(b"\n"):
+            break  # still being written
+        parsed = parse_line(raw)
+        if parsed:
+            timestamp, level, _ = parsed
+            records.append(pack_record(timestamp, offset, len(raw), level))
+        offset += len(raw)
+    return b"".join(records), offset
+
+
+# -----------------------------
+# Queries
+# -----------------------------
+class LogEntry:
+    __slots__ = ("timestamp", "level", "message", "day", "index")
+
+    def __init__(self, timestamp, level, message, day, index):
+        self.timestamp = timestamp
+        self.level = level
+        self.message = message
+        self.day = day
+        self.index = index
+
+    @property
+    def level_name(self):
+        return _LEVEL_NAMES.get(self.level, "INFO")
+
+    @property
+    def cursor(self):
+        """
+        Pass as `before` to get the page after this entry.
+        """
+        return self.day, self.index
+
+
+class _DayIndex:
+    """
+    Index records of one day, read with seeks into the .idx file.
+    """
+
+    def __init__(self, log_path, today, checked):
+        self.log_path = log_path
+        self.tail = b""
+        self.file = None
+        # days compressed by StorageMaintenance are small enough to be
+        # read into memory whole
+        self.data = None
+        source = find(log_path)
+        if source is not None and is_compressed(source):
+            self.data = read_bytes(source)
+            self.stored = 0
+            path = find(index_path(log_path))
+            if path is not None:
+                self.tail = read_bytes(path)
+            else:
+                self.tail, _ = _index_lines(io.BytesIO(self.data), 0)
+            self.count = len(self.tail) // _RECORD.size
+            return
+        # past days are indexed once for good; today's tail (the sink may
+        # be writing it) is indexed in memory only
+        if not checked and not today:
+            catch_up(log_path)
+        self.stored = stored_records(log_path)
+        if today:
+            self.tail, _ = catch_up(log_path, persist=False, stored=self.stored)
+        if self.stored:
+            self.file = open(index_path(log_path), "rb")
+        self.count = self.stored + len(self.tail) // _RECORD.size
+
+    def open_log(self):
+        if self.data is not None:
+            return io.BytesIO(self.data)
+        return open(self.log_path, "rb")
+
+    def record(self, i):
+        size = _RECORD.size
+        if i >= self.stored:
+            return _RECORD.unpack_from(self.tail, (i - self.stored) * size)
+        self.file.seek(i * size)
+        return _RECORD.unpack(self.file.read(size))
+
+    def records(self, lo, hi):
+        """
+        Records lo..hi-1 with one read.
+        """
+        size = _RECORD.size
+        out = []
+        if lo < self.stored:
+            end = min(hi, self.stored)
+            self.file.seek(lo * size)
+            out.extend(_RECORD.iter_unpack(self.file.read((end - lo) * size)))
+        if hi > self.stored:
+            start = max(lo, self.stored) - self.stored
+            view = self.tail[start * size : (hi - self.stored) * size]
+            out.extend(_RECORD.iter_unpack(view))
+        return out
+
+    def bisect(self, t):
+        # first record at or after t
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.record(mid)[0] < t:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def close(self):
+        if self.file:
+            self.file.close()
+
+
+class LogIndex:
+    """
+    Time-range, substring and severity queries over the daily log files
+    written by AsyncLogSink under `log_dir/YYYY-MM-DD/`.
+
+    Each day has a `.idx` file next to its log with one fixed-size record
+    per line (time, byte offset, length, level), appended by the sink as
+    it writes. A query bisects the index of each day in range, filters on
+    level from the index alone and only reads the log lines it needs,
+    newest first, until `limit` entries are found.
+    """
+
+    def __init__(self, log_dir, filename=LOG_FILENAME):
+        self.log_dir = Path(log_dir)
+        self.filename = filename
+        # past days whose index is known to cover the whole log
+        self._checked = set()
+
+    def _day_index(self, day, today):
+        path = self.log_dir / day / self.filename
+        index = _DayIndex(path, day == today, day in self._checked)
+        if day != today:
+            self._checked.add(day)
+        return index
+
+    def days(self):
+        if not self.log_dir.is_dir():
+            return []
+        return sorted(p.name for p in self.log_dir.iterdir() if _DAY.match(p.name))
+
+    def query(
+        self,
+        start=None,
+        end=None,
+        text=None,
+        level=None,
+        limit=100,
+        before=None,
+        cancelled=None,
+    ):
+        """
+        Entries with `start <= time < end` (epoch s), at least `level`
+        and containing `text` (case-insensitive), newest first. `before`
+        is the `cursor` of the last entry of the previous page.
+
+        `cancelled()`, if given, is checked before each day; once it
+        returns True the query stops with what it has found so far.
+        """
+        needle = text.lower() if text else None
+        today = date.today().isoformat()
+        first_day = _day_of(start) if start is not None else None
+        last_day = _day_of(end) if end is not None else None
+        results = []
+        for day in reversed(self.days()):
+            if cancelled is not None and cancelled():
+                break
+            if before is not None and day > before[0]:
+                continue
+            if last_day is not None and day > last_day:
+                continue
+            if first_day is not None and day < first_day:
+                break
+            if find(self.log_dir / day / self.filename) is None:
+                continue
+            try:
+                index = self._day_index(day, today)
+            except (OSError, EOFError):
+                # removed by retention, or a damaged archive
+                continue
+            try:
+                hi = index.count if end is None else index.bisect(end)
+                lo = 0 if start is None else index.bisect(start)
+                if before is not None and day == before[0]:
+                    hi = min(hi, before[1])
+                self._scan(index, day, lo, hi, needle, level, limit, results)
+            finally:
+                index.close()
+            if len(results) >= limit:
+                break
+        return results
+
+    def _scan(self, index, day, lo, hi, needle, level, limit, results):
+        if hi <= lo:
+            return
+        records = index.records(lo, hi)
+        with index.open_log() as log:
+            block = lowered = None
+            if needle is not None:
+                encoded = needle.encode()
+                # substring search reads the day's range in one go and,
+                # for plain ASCII needles, skips lines (or the whole day)
+                # without the needle before parsing them
+                base = records[0][1]
+                log.seek(base)
+                block = log.read(records[-1][1] + records[-1][2] - base)
+                if needle.isascii():
+                    lowered = block.lower()
+                    if encoded not in lowered:
+                        return
+            for i in range(len(records) - 1, -1, -1):
+                timestamp, offset, length, line_level = records[i]
+                if level is not None and line_level < level:
+                    continue
+                if block is not None:
+                    start = offset - base
+                    if lowered is not None and encoded not in lowered[
+                        start : start + length
+                    ]:
+                        continue
+                    raw = block[start : start + length]
+                else:
+                    log.seek(offset)
+                    raw = log.read(length)
+                parsed = parse_line(raw)
+                if parsed is None:
+                    continue
+                message = parsed[2]
+                if needle is not None and needle not in message.lower():
+                    continue
+                results.append(LogEntry(timestamp, line_level, message, day, lo + i))
+                if len(results) >= limit:
+                    return
+
+
+def _day_of(t):
+    return datetime.fromtimestamp(t).strftime("%Y-%m-%d")
@@ -0,0 +1,219 @@
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from utils.log_index import (
+    LOG_FILENAME,
+    catch_up,
+    format_line,
+    index_path,
+    pack_record,
+)
+from utils.logger import get_logger
+
+logger = get_logger("log_sink")
+
+# what to do when the queue is full
+DROP_NEWEST = "drop_newest"
+DROP_OLDEST = "drop_oldest"
+
+
+# -----------------------------
+# Asynchronous log file writer
+# -----------------------------
+class AsyncLogSink(threading.Thread):
+    """
+    Writes log lines to `log_dir/YYYY-MM-DD/motion_log.txt` from a
+    background thread, and for every line a record (time, offset, length,
+    level) to the day's `.idx` file that LogIndex queries.
+
+    Producers only enqueue (never touch the disk). The writer keeps the
+    file open, writes in batches, flushes every `flush_interval_s` and
+    fsyncs every `fsync_interval_s`, and rotates to a new day folder when
+    the date of an entry changes. When the bounded queue is full, entries
+    are dropped according to `overflow` and counted in `dropped`.
+    """
+
+    def __init__(
+        self,
+        log_dir,
+        filename=LOG_FILENAME,
+        max_queue=1024,
+        batch_size=64,
+        flush_interval_s=1.0,
+        fsync_interval_s=5.0,
+        overflow=DROP_OLDEST,
+    ):
+        super().__init__(daemon=True)
+        self.log_dir = Path(log_dir)
+        self.filename = filename
+        self.batch_size = batch_size
+        self.flush_interval_s = flush_interval_s
+        self.fsync_interval_s = fsync_interval_s
+        self.overflow = overflow
+        self.entries = queue.Queue(maxsize=max_queue)
+        self.running = False
+
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self.rotations = 0
+        self.write_errors = 0
+
+        self._file = None
+        self._index = None
+        self._offset = 0
+        self._day = None
+        self._last_flush = 0.0
+        self._last_fsync = 0.0
+        self._stopped = threading.Event()
+
+    def write(self, message, timestamp=None, level=logging.INFO):
+        """
+        Queue one line. Never blocks; returns False if something had to be
+        dropped. CR and LF in `message` (binary LOGS payloads may carry
+        them) are escaped, so one message stays one line and one index
+        record.
+        """
+        if "\n" in message or "\r" in message:
+            message = message.replace("\r", "\\r").replace("\n", "\\n")
+        entry = (timestamp or datetime.now(), message, level)
+        try:
+            self.entries.put_nowait(entry)
+            return True
+        except queue.Full:
+            pass
+
+        self.dropped += 1
+        if self.overflow == DROP_OLDEST:
+            try:
+                self.entries.get_nowait()
+                self.entries.put_nowait(entry)
+            except (queue.Empty, queue.Full):
+                pass
+        return False
+
+    def path_for(self, day):
+        return self.log_dir / day / self.filename
+
+    def _close_files(self):
+        self._sync(force=True)
+        self._file.close()
+        self._index.close()
+        self._file = self._index = None
+
+    def _open_for(self, day):
+        if self._file:
+            self._close_files()
+            self.rotations += 1
+        path = self.path_for(day)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # index whatever the log has that its index does not (older
+        # files, or a crash between the two writes) and cut a line torn
+        # by a crash before appending
+        _, indexed = catch_up(path)
+        self._file = open(path, "ab")
+        self._file.truncate(indexed)
+        self._offset = indexed
+        self._index = open(index_path(path), "ab")
+        self._day = day
+
+    def _sync(self, force=False):
+        if not self._file:
+            return
+        now = time.monotonic()
+        if force or now - self._last_flush >= self.flush_interval_s:
+            self._file.flush()
+            self._index.flush()
+            self._last_flush = now
+        if force or now - self._last_fsync >= self.fsync_interval_s:
+            os.fsync(self._file.fileno())
+            os.fsync(self._index.fileno())
+            self._last_fsync = now
+
+    def _write_batch(self, batch):
+        lines = []
+        records = []
+        for timestamp, message, level in batch:
+            day = timestamp.strftime("%Y-%m-%d")
+            if day != self._day:
+                if lines:
+                    self._write_lines(lines, records)
+                    lines, records = [], []
+                self._open_for(day)
+            line = format_line(timestamp, level, message)
+            records.append(
+                pack_record(timestamp.timestamp(), self._offset, len(line), level)
+            )
+            self._offset += len(line)
+            lines.append(line)
+        if lines:
+            self._write_lines(lines, records)
+        self.written += len(batch)
+        self.batches += 1
+
+    def _write_lines(self, lines, records):
+        # the log first: an index record never points past its end
+        self._file.write(b"".join(lines))
+        self._file.flush()
+        self._index.write(b"".join(records))
+
+    def run(self):
+        self.running = True
+        while self.running or not self.entries.empty():
+            try:
+                batch = [self.entries.get(timeout=self.flush_interval_s)]
+            except queue.Empty:
+                batch = []
+            while batch and len(batch) < self.batch_size:
+                try:
+                    batch.append(self.entries.get_nowait())
+                except queue.Empty:
+                    break
+            # None is only the wake-up from stop()
+            batch = [entry for entry in batch if entry is not None]
+
+            try:
+                if batch:
+                    self._write_batch(batch)
+                self._sync()
+            except OSError as e:
+                self.write_errors += 1
+                logger.error("Failed to write to log file: %s", e, key="log_sink")
+
+        try:
+            self._sync(force=True)
+        except OSError:
+            pass
+        if self._file:
+            try:
+                self._close_files()
+            except OSError:
+                pass
+        self._stopped.set()
+
+    def stop(self, timeout=5.0):
+        """
+        Write out everything queued so far, fsync and close the file.
+        """
+        self.running = False
+        try:
+            self.entries.put_nowait(None)
+        except queue.Full:
+            pass
+        if self.is_alive():
+            self._stopped.wait(timeout)
+
+    def stats(self):
+        return {
+            "written": self.written,
+            "dropped": self.dropped,
+            "queued": self.entries.qsize(),
+            "batches": self.batches,
+            "rotations": self.rotations,
+            "write_errors": self.write_errors,
+        }
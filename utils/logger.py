@@ -0,0 +1,97 @@
+import logging
+import time
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+_loggers = {}
+_defaults = {"sample_every": 100}
+
+
+# -----------------------------
+# Application logging
+# -----------------------------
+class HmiLogger:
+    """
+    Thin wrapper over `logging.Logger` for code on hot paths.
+
+    - `enabled(level)` is the cheap guard to call before building any
+      message on a per-line path.
+    - Messages logged with a `key` are rate limited: at most one per
+      `rate_limit_s` per key, with a count of what was suppressed.
+    - `sample(key, ...)` logs only one call in `sample_every` per key, for
+      debug tracing of every received line without flooding the console.
+    """
+
+    def __init__(self, name, rate_limit_s=10.0, sample_every=None):
+        self.logger = logging.getLogger(name)
+        self.rate_limit_s = rate_limit_s
+        if sample_every is None:
+            sample_every = _defaults["sample_every"]
+        self.sample_every = max(1, sample_every)
+        self._limits = {}
+        self._samples = {}
+
+    def enabled(self, level=logging.DEBUG):
+        return self.logger.isEnabledFor(level)
+
+    def log(self, level, msg, *args, key=None):
+        if not self.logger.isEnabledFor(level):
+            return False
+        if key is not None:
+            now = time.monotonic()
+            last, suppressed = self._limits.get(key, (None, 0))
+            if last is not None and now - last < self.rate_limit_s:
+                self._limits[key] = (last, suppressed + 1)
+                return False
+            self._limits[key] = (now, 0)
+            if suppressed:
+                msg += " (%d similar messages suppressed)"
+                args += (suppressed,)
+        self.logger.log(level, msg, *args)
+        return True
+
+    def sample(self, key, msg, *args, level=logging.DEBUG):
+        if not self.logger.isEnabledFor(level):
+            return False
+        count = self._samples.get(key, 0)
+        self._samples[key] = count + 1
+        if count % self.sample_every:
+            return False
+        if self.sample_every > 1:
+            msg += " [1 in %d]"
+            args += (self.sample_every,)
+        self.logger.log(level, msg, *args)
+        return True
+
+    def debug(self, msg, *args, key=None):
+        return self.log(logging.DEBUG, msg, *args, key=key)
+
+    def info(self, msg, *args, key=None):
+        return self.log(logging.INFO, msg, *args, key=key)
+
+    def warning(self, msg, *args, key=None):
+        return self.log(logging.WARNING, msg, *args, key=key)
+
+    def error(self, msg, *args, key=None):
+        return self.log(logging.ERROR, msg, *args, key=key)
+
+
+def get_logger(name, **kwargs):
+    logger = _loggers.get(name)
+    if logger is None:
+        logger = _loggers[name] = HmiLogger(name, **kwargs)
+    return logger
+
+
+def setup_logging(level="INFO", sample_every=None):
+    """
+    Configure the root logger once at program start. `sample_every`
+    applies to every HmiLogger, including ones created later.
+    """
+    logging.basicConfig(
+        level=getattr(logging, str(level).upper(), logging.INFO), format=LOG_FORMAT
+    )
+    if sample_every:
+        _defaults["sample_every"] = sample_every
+        for logger in _loggers.values():
+            logger.sample_every = max(1, sample_every)
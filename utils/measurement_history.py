@@ -0,0 +1,188 @@
+import math
+from datetime import datetime
+
+from utils.measurements import MEASUREMENT_FIELDS
+from utils.ring_buffer import RingBuffer
+
+# epoch seconds of the tick, then one column per measurement field
+HISTORY_COLUMNS = ("timestamp",) + MEASUREMENT_FIELDS
+
+
+# -----------------------------
+# Row view
+# -----------------------------
+class MeasurementRow:
+    """
+    One measurement tick. Times are epoch seconds; `motion_time` is None
+    until a motion sample has been received.
+
+    Supports `row["cpu"]` and `row.get("cpu", 0.0)` so pages written
+    against the old metrics dict keep working.
+    """
+
+    __slots__ = HISTORY_COLUMNS
+
+    def __init__(
+        self, timestamp, motion, motion_time, cpu, ram, disk, net_up, net_down
+    ):
+        self.timestamp = timestamp
+        self.motion = motion
+        self.motion_time = motion_time
+        self.cpu = cpu
+        self.ram = ram
+        self.disk = disk
+        self.net_up = net_up
+        self.net_down = net_down
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def __repr__(self):
+        fields = ", ".join(f"{k}={getattr(self, k)!r}" for k in HISTORY_COLUMNS)
+        return f"MeasurementRow({fields})"
+
+
+# -----------------------------
+# Columnar history
+# -----------------------------
+class MeasurementHistory:
+    """
+    The last `capacity` measurement rows, stored as one ring buffer of
+    doubles per column, so a row costs 8 bytes per field instead of a dict
+    with boxed floats and datetimes.
+
+    Columns share the write index; only the Tk thread writes and reads, so
+    they never disagree. `column`, `tail` and `between` return `array`
+    slices that can go straight to a plot (the Graphs page's per-tick
+    view) or an export (`export_rows`) without building row objects;
+    `row(i)` / `latest()` build a `MeasurementRow` on demand.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._columns = {name: RingBuffer(capacity) for name in HISTORY_COLUMNS}
+        self._timestamps = self._columns["timestamp"]
+
+    @property
+    def write_index(self):
+        return self._timestamps.write_index
+
+    def append(self, row):
+        motion_time = row.motion_time
+        for name, column in self._columns.items():
+            value = getattr(row, name)
+            if name == "motion_time" and motion_time is None:
+                value = math.nan
+            column.append(value)
+
+    def clear(self):
+        for column in self._columns.values():
+            column.clear()
+
+    def __len__(self):
+        return len(self._timestamps)
+
+    def __bool__(self):
+        return bool(self._timestamps)
+
+    def bytes_per_row(self):
+        return sum(c.itemsize for c in self._arrays())
+
+    def nbytes(self):
+        return sum(c.itemsize * len(c) for c in self._arrays())
+
+    def _arrays(self):
+        return [column._data for column in self._columns.values()]
+
+    # -----------------------------
+    # Rows
+    # -----------------------------
+    def row(self, index):
+        """
+        Row `index`, counted like a list (negative from the newest).
+        """
+        values = [self._columns[name][index] for name in HISTORY_COLUMNS]
+        motion_time = values[2]
+        if math.isnan(motion_time):
+            values[2] = None
+        return MeasurementRow(*values)
+
+    def latest(self):
+        return self.row(-1) if self else None
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.row(i)
+
+    # -----------------------------
+    # Column slices
+    # -----------------------------
+    def column(self, name):
+        """
+        Every retained value of column `name`, oldest first.
+        """
+        return self._columns[name].tail(self.capacity)
+
+    def tail(self, n, names=HISTORY_COLUMNS):
+        """
+        The newest `n` rows as {column: array}.
+        """
+        return {name: self._columns[name].tail(n) for name in names}
+
+    def between(self, start, end=None, names=HISTORY_COLUMNS):
+        """
+        Rows with `start <= timestamp < end` (epoch s) as {column: array}.
+        Timestamps only grow, so the bounds are found by bisection.
+        """
+        lo = self._bisect(start)
+        hi = len(self) if end is None else self._bisect(end)
+        first = self.write_index - len(self)
+        return {
+            name: self._columns[name]._copy(first + lo, first + max(lo, hi))
+            for name in names
+        }
+
+    def oldest_timestamp(self):
+        return self._timestamps[0] if self else None
+
+    def export_rows(self, start, end=None):
+        """
+        Rows for MEASUREMENT_HEADER with `start <= timestamp < end`. The
+        columns are sliced here, on the Tk thread; the rows are built
+        lazily, so the iterator can be handed to the export thread.
+        """
+        columns = self.between(start, end)
+        return _export_rows(columns)
+
+    def _bisect(self, t):
+        timestamps = self._timestamps
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if timestamps[mid] < t:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+
+def _export_rows(columns):
+    for timestamp, motion, motion_time, cpu, ram, disk, net_up, net_down in zip(
+        *(columns[name] for name in HISTORY_COLUMNS)
+    ):
+        yield [
+            datetime.fromtimestamp(timestamp),
+            None if math.isnan(motion_time) else datetime.fromtimestamp(motion_time),
+            motion,
+            cpu,
+            ram,
+            disk,
+            net_up,
+            net_down,
+        ]
@@ -0,0 +1,233 @@
+import queue
+import re
+import threading
+import time
+
+from utils.logger import get_logger
+from utils.measurements import encode_measurement, encode_samples
+from utils.segment_store import SegmentStore
+
+logger = get_logger("measurement_writer")
+
+
+def device_dir_name(key):
+    """
+    Directory name for the samples of transmitter `key` ("/dev/ttyUSB0#3"
+    -> "dev_ttyUSB0_3").
+    """
+    return re.sub(r"[^A-Za-z0-9]+", "_", key).strip("_") or "device"
+
+
+# -----------------------------
+# Background measurement writer
+# -----------------------------
+class MeasurementWriter(threading.Thread):
+    """
+    Persists measurements and motion samples off the Tk thread.
+
+    The UI tick only queues its measurement row (`add_measurement`); this
+    thread appends it to the measurement store, the recent-history ring
+    files, the rollups and the SQLite database. The receiver queues every
+    motion sample it stores (`add_samples`, its `sample_sink`), whichever
+    transmitter the UI shows; every `interval_s` they are written out:
+    each transmitter's samples go to its own SegmentStore (the default
+    transmitter's to `sample_store`, the others' to `sample_dir/<device>`),
+    and the default transmitter's also feed the rollups and the ring files.
+
+    Like AsyncLogSink both queues are bounded; rows and samples that do
+    not fit are counted in `dropped` and `dropped_samples`.
+    """
+
+    def __init__(
+        self,
+        measurement_store,
+        sample_store,
+        sample_dir,
+        recent=None,
+        rollups=None,
+        db=None,
+        store_options=None,
+        interval_s=1.0,
+        max_queue=3600,
+        max_sample_queue=65536,
+    ):
+        super().__init__(daemon=True)
+        self.measurement_store = measurement_store
+        self.sample_dir = sample_dir
+        self.recent = recent
+        self.rollups = rollups
+        self.db = db
+        self.store_options = dict(store_options or {})
+        self.interval_s = interval_s
+        self.rows = queue.Queue(maxsize=max_queue)
+        # (device, values, monotonic times) as the receiver stored them
+        self.samples = queue.Queue(maxsize=max_sample_queue)
+        self.running = False
+
+        self.written_rows = 0
+        self.written_samples = 0
+        self.dropped = 0
+        self.dropped_samples = 0
+        self.write_errors = 0
+        self.cpu_s = 0.0
+
+        self._default_store = sample_store
+        self._stores = {}
+        self._stores_lock = threading.Lock()
+        self._default_key = None
+        self._stopped = threading.Event()
+
+    def attach(self, default_key):
+        """
+        Samples of transmitter `default_key` go to `sample_store` and feed
+        the rollups and ring files from now on.
+        """
+        self._default_key = default_key
+
+    def add_measurement(self, row, device=None):
+        """
+        Queue one MeasurementRow. Never blocks; returns False if it had to
+        be dropped.
+        """
+        try:
+            self.rows.put_nowait((row, device))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def add_samples(self, device, values, times):
+        """
+        Queue motion samples of DeviceState `device` with their monotonic
+        receive times. Called from the receiver thread; never blocks.
+        """
+        try:
+            self.samples.put_nowait((device, values, times))
+        except queue.Full:
+            self.dropped_samples += len(values)
+            logger.warning(
+                "Writer queue full, %d motion samples dropped",
+                self.dropped_samples,
+                key="writer_dropped",
+            )
+
+    def sample_store(self, key=None):
+        """
+        The store holding the samples of transmitter `key`, opened on first
+        use; the default transmitter's for None.
+        """
+        if key is None or key == self._default_key:
+            return self._default_store
+        with self._stores_lock:
+            store = self._stores.get(key)
+            if store is None:
+                store = SegmentStore(
+                    self.sample_dir / device_dir_name(key), **self.store_options
+                )
+                self._stores[key] = store
+            return store
+
+    # -----------------------------
+    # Writer thread
+    # -----------------------------
+    def _write_row(self, row, device):
+        self.measurement_store.append(encode_measurement(row), row.timestamp)
+        if self.recent:
+            self.recent.add_measurement(row)
+        if self.rollups:
+            self.rollups.add_measurement(row)
+        if self.db:
+            self.db.add_metrics(device, row)
+        self.written_rows += 1
+
+    def _collect_samples(self):
+        pending = {}
+        while True:
+            try:
+                device, values, times = self.samples.get_nowait()
+            except queue.Empty:
+                break
+            entry = pending.get(device.key)
+            if entry is None:
+                entry = pending[device.key] = ([], [], device.motion_buffer)
+            entry[0].extend(values)
+            entry[1].extend(times)
+        for key, (values, times, buffer) in pending.items():
+            times = [t + buffer.wall_offset for t in times]
+            self._guarded(self._write_samples, key, values, times)
+
+    def _write_samples(self, key, values, times):
+        self.sample_store(key).append(encode_samples(values, times), times[-1])
+        if key == self._default_key:
+            if self.rollups:
+                self.rollups.add_samples(values, times)
+            if self.recent:
+                self.recent.add_samples(values, times)
+        if self.db:
+            self.db.add_samples(key, values, times)
+        self.written_samples += len(values)
+
+    def _guarded(self, write, *args):
+        # a bad row or sample batch must not stop the thread: everything
+        # queued after it would be dropped
+        try:
+            write(*args)
+        except Exception as e:
+            self.write_errors += 1
+            logger.error("Failed to store measurements: %r", e, key="writer")
+
+    def run(self):
+        self.running = True
+        next_collect = time.monotonic()
+        while self.running or not self.rows.empty():
+            try:
+                entries = [self.rows.get(timeout=self.interval_s)]
+            except queue.Empty:
+                entries = []
+            while True:
+                try:
+                    entries.append(self.rows.get_nowait())
+                except queue.Empty:
+                    break
+
+            start = time.thread_time()
+            # samples first: the rollups see them before the tick's row
+            if time.monotonic() >= next_collect or not self.running:
+                next_collect = time.monotonic() + self.interval_s
+                self._collect_samples()
+            for entry in entries:
+                # None is only the wake-up from stop()
+                if entry is not None:
+                    self._guarded(self._write_row, *entry)
+            self.cpu_s += time.thread_time() - start
+
+        self._collect_samples()
+        self._stopped.set()
+
+    def stop(self, timeout=5.0):
+        """
+        Write out everything queued so far and close the per-device
+        stores; the stores passed in are left to their owner.
+        """
+        self.running = False
+        try:
+            self.rows.put_nowait(None)
+        except queue.Full:
+            pass
+        if self.is_alive():
+            self._stopped.wait(timeout)
+        with self._stores_lock:
+            for store in self._stores.values():
+                store.close()
+            self._stores.clear()
+
+    def stats(self):
+        return {
+            "rows": self.written_rows,
+            "samples": self.written_samples,
+            "dropped": self.dropped,
+            "dropped_samples": self.dropped_samples,
+            "queued": self.rows.qsize(),
+            "write_errors": self.write_errors,
+            "cpu_s": self.cpu_s,
+        }
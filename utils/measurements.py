@@ -0,0 +1,107 @@
+import math
+import struct
+from array import array
+from datetime import datetime
+
+# per-tick measurement row as stored on disk; times are epoch seconds
+MEASUREMENT_FIELDS = (
+    "motion",
+    "motion_time",
+    "cpu",
+    "ram",
+    "disk",
+    "net_up",
+    "net_down",
+)
+_ROW = struct.Struct("<%dd" % len(MEASUREMENT_FIELDS))
+
+MEASUREMENT_HEADER = [
+    "Timestamp",
+    "Motion Sample Time",
+    "Motion Value",
+    "CPU Usage (%)",
+    "RAM Usage (%)",
+    "Disk Usage (%)",
+    "Net Up (kB/s)",
+    "Net Down (kB/s)",
+]
+SAMPLE_HEADER = ["Received", "Motion Value"]
+
+
+# -----------------------------
+# Record codecs
+# -----------------------------
+def encode_measurement(row):
+    """
+    Pack a MeasurementRow (or anything with the same attributes).
+    """
+    motion_time = row.motion_time
+    return _ROW.pack(
+        row.motion,
+        math.nan if motion_time is None else motion_time,
+        row.cpu,
+        row.ram,
+        row.disk,
+        row.net_up,
+        row.net_down,
+    )
+
+
+def decode_measurement(timestamp, payload):
+    row = dict(zip(MEASUREMENT_FIELDS, _ROW.unpack(payload)))
+    motion_time = row["motion_time"]
+    row["motion_time"] = (
+        None if math.isnan(motion_time) else datetime.fromtimestamp(motion_time)
+    )
+    row["timestamp"] = datetime.fromtimestamp(timestamp)
+    return row
+
+
+def encode_samples(values, times):
+    """
+    Motion samples received in one tick: all values, then all receive
+    times (epoch s), as doubles.
+    """
+    return array("d", values).tobytes() + array("d", times).tobytes()
+
+
+def decode_samples(payload):
+    data = array("d")
+    data.frombytes(payload)
+    n = len(data) // 2
+    return data[:n], data[n:]
+
+
+# -----------------------------
+# Export rows
+# -----------------------------
+def measurement_rows(store, since=None, until=None):
+    """
+    Rows for MEASUREMENT_HEADER from a store of encoded measurements.
+    """
+    for timestamp, payload in store.records(since=since):
+        if until is not None and timestamp > until:
+            return
+        motion, motion_time, cpu, ram, disk, net_up, net_down = _ROW.unpack(payload)
+        yield [
+            datetime.fromtimestamp(timestamp),
+            None if math.isnan(motion_time) else datetime.fromtimestamp(motion_time),
+            motion,
+            cpu,
+            ram,
+            disk,
+            net_up,
+            net_down,
+        ]
+
+
+def sample_rows(store, since=None, until=None):
+    """
+    Rows for SAMPLE_HEADER from a store of encoded sample batches.
+    """
+    for timestamp, payload in store.records(since=since):
+        if until is not None and timestamp > until:
+            return
+        values, times = decode_samples(payload)
+        for t, value in zip(times, values):
+            yield [datetime.fromtimestamp(t), value]
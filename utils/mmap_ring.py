@@ -0,0 +1,189 @@
+import mmap
+import os
+import struct
+import time
+import zlib
+from pathlib import Path
+
+from utils.logger import get_logger
+
+logger = get_logger("mmap_ring")
+
+RING_MAGIC = b"MSRNG"
+RING_VERSION = 1
+# magic, version, capacity, record size, generation, write index
+_HEADER = struct.Struct("<5sBIIQQ")
+_HEADER_CRC = struct.Struct("<I")
+HEADER_SIZE = 64
+# sequence number (= write index of the record), crc32 of seq + payload
+_SLOT = struct.Struct("<QI")
+
+
+# -----------------------------
+# Memory-mapped ring file
+# -----------------------------
+class MmapRing:
+    """
+    Fixed-size ring of `capacity` records of `record_size` bytes in a
+    memory-mapped file, so the newest records survive a crash or restart
+    and come back by mapping the file instead of parsing anything.
+
+    The header holds the write index, a generation that is bumped on
+    every open, and a CRC of both. Every slot carries the sequence number
+    it was written for and a CRC, so on open the newest contiguous run of
+    intact slots is recovered even if the header or the last slot was torn
+    mid-write: a slot written after the last header update is picked up,
+    a torn newest slot is dropped.
+
+    Writes land in the page cache (safe against the process dying); the
+    map is flushed to disk at most every `sync_interval_s` and on close.
+    """
+
+    def __init__(self, path, capacity, record_size, sync_interval_s=5.0):
+        self.path = Path(path)
+        self.capacity = capacity
+        self.record_size = record_size
+        self.slot_size = _SLOT.size + record_size
+        self.sync_interval_s = sync_interval_s
+        self.generation = 0
+        self.write_index = 0
+        self.start_index = 0
+        self.discarded = 0
+        self._last_sync = time.monotonic()
+
+        size = HEADER_SIZE + capacity * self.slot_size
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fresh = os.fstat(fd).st_size != size
+            if fresh:
+                os.ftruncate(fd, 0)
+                os.ftruncate(fd, size)
+            self._map = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+        self._open(fresh)
+
+    # -----------------------------
+    # Header
+    # -----------------------------
+    def _read_header(self):
+        """
+        (generation, write index), or None if the header is torn or
+        belongs to a ring of another shape.
+        """
+        raw = self._map[: _HEADER.size]
+        (crc,) = _HEADER_CRC.unpack_from(self._map, _HEADER.size)
+        if zlib.crc32(raw) != crc:
+            return None
+        magic, version, capacity, size, generation, index = _HEADER.unpack(raw)
+        shape = (RING_MAGIC, RING_VERSION, self.capacity, self.record_size)
+        if (magic, version, capacity, size) != shape:
+            return None
+        return generation, index
+
+    def _write_header(self):
+        raw = _HEADER.pack(
+            RING_MAGIC,
+            RING_VERSION,
+            self.capacity,
+            self.record_size,
+            self.generation,
+            self.write_index,
+        )
+        self._map[: _HEADER.size] = raw
+        _HEADER_CRC.pack_into(self._map, _HEADER.size, zlib.crc32(raw))
+
+    def _open(self, fresh):
+        header = None if fresh else self._read_header()
+        if header is None:
+            generation, hint = 0, None
+            if not fresh:
+                logger.warning("Ring header of %s is torn, scanning slots", self.path)
+        else:
+            generation, hint = header
+        self.generation = generation + 1
+        if not fresh:
+            self._recover(hint)
+        self._write_header()
+
+    # -----------------------------
+    # Slots
+    # -----------------------------
+    def _offset(self, seq):
+        return HEADER_SIZE + (seq % self.capacity) * self.slot_size
+
+    def _valid(self, seq):
+        offset = self._offset(seq)
+        stored, crc = _SLOT.unpack_from(self._map, offset)
+        if stored != seq:
+            return False
+        start = offset + _SLOT.size
+        payload = self._map[start : start + self.record_size]
+        return zlib.crc32(payload, zlib.crc32(stored.to_bytes(8, "little"))) == crc
+
+    def _recover(self, hint):
+        cap = self.capacity
+        if hint is None:
+            # no usable header: the newest intact slot tells where we were
+            end = 0
+            for slot in range(cap):
+                offset = HEADER_SIZE + slot * self.slot_size
+                seq, _ = _SLOT.unpack_from(self._map, offset)
+                if seq % cap == slot and seq + 1 > end and self._valid(seq):
+                    end = seq + 1
+        else:
+            end = hint
+            # a slot written after the last header update
+            while end - hint < cap and self._valid(end):
+                end += 1
+        # a torn newest slot (and anything the crash left half written)
+        floor = max(0, end - cap)
+        while end > floor and not self._valid(end - 1):
+            end -= 1
+            self.discarded += 1
+        start = end
+        while start > floor and self._valid(start - 1):
+            start -= 1
+        self.write_index = end
+        self.start_index = start
+        if self.discarded:
+            logger.warning(
+                "Recovered %s: dropped %d torn record(s)", self.path, self.discarded
+            )
+
+    def append(self, payload):
+        seq = self.write_index
+        offset = self._offset(seq)
+        start = offset + _SLOT.size
+        self._map[start : start + self.record_size] = payload
+        crc = zlib.crc32(payload, zlib.crc32(seq.to_bytes(8, "little")))
+        _SLOT.pack_into(self._map, offset, seq, crc)
+        self.write_index = seq + 1
+        self.start_index = max(self.start_index, self.write_index - self.capacity)
+        self._write_header()
+        if time.monotonic() - self._last_sync >= self.sync_interval_s:
+            self.sync()
+
+    def records(self):
+        """
+        Payloads of the retained records, oldest first.
+        """
+        out = []
+        size = self.record_size
+        for seq in range(self.start_index, self.write_index):
+            start = self._offset(seq) + _SLOT.size
+            out.append(self._map[start : start + size])
+        return out
+
+    def __len__(self):
+        return self.write_index - self.start_index
+
+    def sync(self):
+        self._map.flush()
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        if not self._map.closed:
+            self.sync()
+            self._map.close()
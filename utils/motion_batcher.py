@@ -0,0 +1,64 @@
+import time
+
+from utils import protocol
+
+
+# -----------------------------
+# Motion sample batching
+# -----------------------------
+class MotionBatcher:
+    """
+    Coalesces motion samples into run-length encoded batches on the sender.
+
+    Consecutive samples with the same state extend the current run; a batch
+    is flushed when the state changes (so edges still go out immediately),
+    when the oldest pending sample is `max_delay_s` old, or when the batch
+    reaches `max_runs` runs / a run reaches the 16 bit count limit.
+    """
+
+    def __init__(self, sample_period_ms, max_delay_s=5.0, max_runs=protocol.MAX_RUNS):
+        self.sample_period_ms = sample_period_ms
+        self.max_delay_s = max_delay_s
+        self.max_runs = min(max_runs, protocol.MAX_RUNS)
+        self.runs = []
+        self.first_sample_at = None
+        self.last_state = None
+
+    def add(self, state, timestamp_ms, now=None):
+        """
+        Add one sample. Returns a batch `(sample_period_ms, runs)` ready to
+        encode when a flush condition is met, otherwise None. The very first
+        sample counts as a state change so the receiver learns the state
+        right away.
+        """
+        if now is None:
+            now = time.monotonic()
+        state = 1 if state else 0
+
+        runs = self.runs
+        changed = self.last_state != state
+        self.last_state = state
+        if runs and not changed and runs[-1][1] < protocol.MAX_RUN_LENGTH:
+            last_state, count, start_ms = runs[-1]
+            runs[-1] = (last_state, count + 1, start_ms)
+        else:
+            runs.append((state, 1, timestamp_ms))
+        if self.first_sample_at is None:
+            self.first_sample_at = now
+
+        if (
+            changed
+            or len(runs) >= self.max_runs
+            or runs[-1][1] >= protocol.MAX_RUN_LENGTH
+            or now - self.first_sample_at >= self.max_delay_s
+        ):
+            return self.flush()
+        return None
+
+    def flush(self):
+        if not self.runs:
+            return None
+        batch = (self.sample_period_ms, self.runs)
+        self.runs = []
+        self.first_sample_at = None
+        return batch
@@ -1,123 +1,592 @@
+import random
+import re
+import selectors
+import sys
 import threading
+from itertools import repeat
 import serial.tools.list_ports
 import time
 import json
+import logging
 from datetime import datetime
 
 # import project metadata
 from utils.constants import CONSTANTS
+from utils import protocol
+from utils.serial_framer import SerialFramer
+from utils.ingest_stats import IngestStats
+from utils.device_registry import DeviceRegistry, DeviceState
+from utils.logger import get_logger
+from utils.log_index import guess_level
+from utils.log_sink import AsyncLogSink
+from utils.serial_capture import CaptureWriter, REPLAY_PREFIX, open_replay
+from utils.port_supervisor import Backoff, PortCache, PortSupervisor
 from pathlib import Path
 
+logger = get_logger("motion_receiver")
+
 LOG_DIR = Path(CONSTANTS.get("LOG_DIR", Path.cwd()))
-date = datetime.now().strftime("%Y-%m-%d")
-LOG_FILE = LOG_DIR / date / "motion_log.txt"
+
+# fast paths for the values the transmitter actually sends
+_MOTION_VALUES = {b"0": 0.0, b"1": 1.0, b"0.0": 0.0, b"1.0": 1.0}
+_NUMBER = re.compile(rb"-?\d+(\.\d*)?")
+_STATUS_FIELDS = ("cpu", "ram", "disk", "net_up", "net_down", "timestamp", "version")
+_NUMERIC_STATUS_FIELDS = ("cpu", "ram", "memory", "disk", "net_up", "net_down")
+
+
+def is_replay(port_name):
+    return bool(port_name) and port_name.startswith(REPLAY_PREFIX)
 
 
 # -----------------------------
 # Data acquisition
 # -----------------------------
+class PortChannel:
+    """
+    One serial port served by the receiver thread, with its own framer so
+    partial frames from different ports never mix.
+    """
+
+    def __init__(self, port_name, index=0):
+        self.port_name = port_name
+        self.index = index
+        self.serial = None
+        self.framer = SerialFramer()
+        self.supervisor = None
+        # device id -> DeviceState, filled as transmitters are heard
+        self.devices = {}
+
+
 class MotionReceiver(threading.Thread):
     """
-    Background thread that listens to the defined serial port and
-    pushes motion values to a shared deque.
+    Background thread that listens to the defined serial port(s) and
+    pushes motion values to per-transmitter buffers.
+
+    `port` may be a single port name or a list of them. All ports are
+    multiplexed by this one thread with `selectors`; every transmitter
+    (port, or device id on a shared coordinator) gets its own DeviceState
+    in `devices`. The buffers passed in belong to the transmitter on the
+    first port.
+
+    Log lines (receiver errors and transmitter LOGS messages) go to
+    `log_sink`; without one the receiver runs its own for its lifetime.
+    Transmitter log lines are also queued to the SQLiteStore `db`, if any.
+    Every motion sample stored in a buffer is also passed to
+    `sample_sink(device, values, times)`, if given, so it can be persisted
+    before the bounded buffer overwrites it.
+
+    Each port is kept open by a PortSupervisor: failed opens and ports
+    lost mid-run are retried with jittered exponential backoff and, for a
+    single configured port, other serial ports are probed for the
+    transmitter.
+
+    With `capture_path` every raw chunk read is recorded to that file. A
+    port named "replay:<capture file>" plays a capture back instead of
+    opening hardware, at `replay_speed` times real time (0 = max).
     """
 
     def __init__(
         self,
         port,
         baudrate,
-        motion_buffer,
-        log_buffer,
-        transmitter_status,
+        motion_buffer=None,
+        log_buffer=None,
+        transmitter_status=None,
         use_mock_if_fail=True,
+        devices=None,
+        log_sink=None,
+        capture_path=None,
+        db=None,
+        sample_sink=None,
     ):
         super().__init__(daemon=True)
-        self.port_name = port
+        ports = [port] if port is None or isinstance(port, str) else list(port)
+        self.port_name = ports[0]
         self.baudrate = baudrate
-        self.motion_buffer = motion_buffer
-        self.log_buffer = log_buffer
-        self.transmitter_status = transmitter_status
+        self.channels = [PortChannel(p, i) for i, p in enumerate(ports)]
+        self._build_supervisors(ports)
+        self.devices = devices if devices is not None else DeviceRegistry()
+        default_key = DeviceRegistry.device_key(self.port_name)
+        if motion_buffer is not None:
+            self.devices.add(
+                DeviceState(default_key, motion_buffer, log_buffer, transmitter_status)
+            )
+        self.default_device = self.devices.get(default_key)
+        self.channels[0].devices[0] = self.default_device
+        self.motion_buffer = self.default_device.motion_buffer
+        self.log_buffer = self.default_device.log_buffer
+        self.transmitter_status = self.default_device.transmitter_status
         self.use_mock_if_fail = use_mock_if_fail
+        self.owns_log_sink = log_sink is None
+        self.log_sink = log_sink or AsyncLogSink(
+            LOG_DIR,
+            max_queue=CONSTANTS.get("LOG_QUEUE_SIZE", 1024),
+            flush_interval_s=CONSTANTS.get("LOG_FLUSH_INTERVAL_S", 1.0),
+            fsync_interval_s=CONSTANTS.get("LOG_FSYNC_INTERVAL_S", 5.0),
+        )
+        self.db = db
+        self.sample_sink = sample_sink
+        self.capture_path = capture_path or None
+        self.capture = None
+        self.replay_speed = CONSTANTS.get("REPLAY_SPEED", 1.0)
         self.running = False
-        self.serial = None
+        self.stats = IngestStats()
+        self.parse_errors = 0
+        # handler exceptions, kept apart from port I/O errors
+        self.dispatch_errors = 0
+        # monotonic arrival time of the chunk being dispatched
+        self.received_at = None
+        self._build_handlers()
 
-    def open_port(self):
-        # Try the configured port
-        try:
-            self.serial = serial.Serial(self.port_name, self.baudrate, timeout=1)
-            print(f"Established connection with Transmitter at {self.port_name}")
-            return True
-        except Exception as e:
-            msg = f"Host port communication failed: {e}"
+    def _build_supervisors(self, ports):
+        # scanning only makes sense when there is one transmitter to find
+        discover = CONSTANTS.get("PORT_AUTO_DISCOVERY", True) and len(ports) == 1
+        cache = PortCache(CONSTANTS.get("PORT_CACHE_FILE")) if discover else None
+        for channel in self.channels:
+            replay = is_replay(channel.port_name)
+            channel.supervisor = PortSupervisor(
+                channel.port_name,
+                lambda name, channel=channel: self.open_serial(name, channel),
+                discover=discover and not replay,
+                cache=None if replay else cache,
+                backoff=Backoff(
+                    CONSTANTS.get("RECONNECT_INITIAL_S", 0.5),
+                    CONSTANTS.get("RECONNECT_MAX_S", 30.0),
+                ),
+                probe_timeout_s=CONSTANTS.get("PORT_PROBE_TIMEOUT_S", 1.0),
+                exclude=ports,
+            )
+
+    @property
+    def serial(self):
+        return self.channels[0].serial
+
+    @serial.setter
+    def serial(self, value):
+        self.channels[0].serial = value
+
+    @property
+    def framer(self):
+        return self.channels[0].framer
+
+    def open_serial(self, name, channel):
+        if is_replay(name):
+            return open_replay(name, self.replay_speed, channel.index)
+        return serial.Serial(name, self.baudrate, timeout=1)
+
+    def open_port(self, channel=None):
+        """
+        One connection attempt through the channel's supervisor.
+        """
+        channel = channel or self.channels[0]
+        supervisor = channel.supervisor
+        port = supervisor.connect()
+        if port is None:
+            msg = f"Host port communication failed: {supervisor.last_error}"
+            logger.error("%s", msg, key=f"open:{channel.port_name}")
+            if supervisor.attempts == 1:
+                # once per outage, not on every retry
+                self.update_logfile(msg, logging.ERROR)
+                self.log_buffer.append(msg)
+            return False
+
+        channel.serial = port
+        channel.framer.reset()
+        if supervisor.last_reconnect_s is not None:
+            msg = (
+                f"Reconnected to Transmitter at {supervisor.connected_port}"
+                f" after {supervisor.last_reconnect_s:.1f} s"
+            )
             self.update_logfile(msg)
-            print(msg)
             self.log_buffer.append(msg)
+        else:
+            msg = (
+                "Established connection with Transmitter at"
+                f" {supervisor.connected_port}"
+            )
+        logger.info("%s", msg)
+        return True
+
+    def open_ports(self):
+        opened = [self.open_port(channel) for channel in self.channels]
+        return any(opened)
+
+    def reconnect(self, channel):
+        """
+        Wait until the supervisor's next attempt is due, feeding mock data
+        meanwhile if enabled, then try once.
+        """
+        supervisor = channel.supervisor
+        while self.running and not supervisor.due():
+            if self.use_mock_if_fail:
+                self.store_motion(
+                    self.default_device, self.mock_motion_value(), time.monotonic()
+                )
+            time.sleep(min(0.1, supervisor.wait_s()))
+        return self.running and self.open_port(channel)
+
+    def port_lost(self, channel, error):
+        try:
+            channel.serial.close()
+        except Exception:
+            pass
+        channel.serial = None
+        channel.supervisor.lost()
+        msg = f"{channel.port_name} lost: {error}"
+        logger.warning("%s", msg)
+        self.update_logfile(msg, logging.WARNING)
+        self.log_buffer.append(msg)
+
+    def connection_status(self):
+        return self.channels[0].supervisor.status_text()
+
+    def device_for(self, channel, device_id=0):
+        device = channel.devices.get(device_id)
+        if device is None:
+            device = self.devices.get(
+                DeviceRegistry.device_key(channel.port_name, device_id)
+            )
+            channel.devices[device_id] = device
+        return device
 
-            self.serial = None
+    def update_logfile(self, log, level=logging.INFO):
+        # queued only; the sink's own thread does the disk I/O
+        self.log_sink.write(log, level=level)
+
+    # -----------------------------
+    # Message dispatch
+    # -----------------------------
+    def _build_handlers(self):
+        types = CONSTANTS.get("MESSAGE_TYPES", {})
+        # text lines are dispatched on their "TYPE:" prefix, binary frames
+        # on their type id
+        self.text_handlers = {
+            types.get("MOTION", "MOTION").encode(): self.handle_motion_text,
+            types.get("LOGS", "LOGS").encode(): self.handle_logs_text,
+            types.get(
+                "PERFORMANCE_STATUS", "PERFORMANCE_STATUS"
+            ).encode(): self.handle_performance_text,
+        }
+        self.frame_handlers = {
+            protocol.MSG_MOTION: self.handle_motion_frame,
+            protocol.MSG_MOTION_BATCH: self.expand_motion_batch,
+            protocol.MSG_LOGS: self.handle_logs_frame,
+            protocol.MSG_PERFORMANCE_STATUS: self.handle_performance_frame,
+        }
+
+    def dispatch(self, frame, channel=None):
+        """
+        Route one framed message from `channel` to its handler, together
+        with the DeviceState of the transmitter that sent it. Returns False
+        for messages that could not be understood.
+        """
+        channel = channel or self.channels[0]
+        if type(frame) is protocol.Frame:
+            handler = self.frame_handlers.get(frame.type)
+            if handler is None:
+                self.parse_errors += 1
+                return False
+            device = self.device_for(channel, frame.device)
+            if not device.link.observe(frame.seq, frame.timestamp):
+                # duplicate delivered by the radio; already handled
+                return True
+            return handler(device, frame.payload)
+
+        line = frame.strip()
+        if logger.enabled():
+            logger.sample("rx_line", "Received: %r", line)
+        prefix, sep, body = line.partition(b":")
+        device = self.device_for(channel)
+        if not sep:
+            # very old transmitters send the bare motion value
+            return self.handle_motion_text(device, line)
+        handler = self.text_handlers.get(prefix)
+        if handler is None:
+            self.parse_errors += 1
             return False
+        return handler(device, body)
 
-    def update_logfile(self, log):
-        LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
-        with open(LOG_FILE, "a") as f:
-            try:
-                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                f.write(f"{timestamp}: {log}\n")
-            except Exception as e:
-                print(f"Failed to write to log file: {e}")
+    def parse_motion_value(self, raw_value):
+        """
+        The transmitter sends lines like: 'MOTION:0' or 'MOTION:1'; this
+        parses the value part. Returns None if it is not a number.
+        """
+        value = _MOTION_VALUES.get(raw_value)
+        if value is None and _NUMBER.fullmatch(raw_value):
+            value = float(raw_value)
+        return value
+
+    def store_motion(self, device, value, t=None):
+        if t is None:
+            t = self.received_at or time.monotonic()
+        device.motion_buffer.append(value, t)
+        if self.sample_sink is not None:
+            self.sample_sink(device, (value,), (t,))
+
+    def handle_motion_text(self, device, body):
+        value = self.parse_motion_value(body.strip())
+        if value is None:
+            self.parse_errors += 1
+            return False
+        self.store_motion(device, value)
+        return True
+
+    def handle_motion_frame(self, device, payload):
+        value = protocol.decode_motion(payload)
+        if value is None:
+            self.parse_errors += 1
+            return False
+        self.store_motion(device, value)
+        return True
 
-    def parse_motion_value(self, raw_line):
+    def expand_motion_batch(self, device, payload):
         """
-        The transmitter sends lines like: 'MOTION:0' or 'MOTION:1'
+        Expand run-length encoded samples back into the motion buffer, one
+        entry per original sample. Runs longer than a bounded buffer are
+        clipped to its length since older samples would be evicted anyway;
+        the sample sink still gets every sample.
+
+        Sample times are placed back from the batch's arrival using the
+        sender's sample period, the last sample counting as just received.
         """
+        batch = protocol.decode_motion_batch(payload)
+        if batch is None:
+            self.parse_errors += 1
+            return False
+        period_ms, runs = batch
+        if not runs:
+            return True
+        received_at = self.received_at or time.monotonic()
+        _, last_count, last_start = runs[-1]
+        end_ms = last_start + (last_count - 1) * period_ms
+        maxlen = getattr(device.motion_buffer, "maxlen", None)
+        sink = self.sample_sink
+        for state, count, start_ms in runs:
+            skip = 0
+            if maxlen is not None and count > maxlen:
+                skip = count - maxlen
+            first_t = received_at - (end_ms - start_ms) / 1000.0
+            if sink is not None:
+                times = [first_t + k * period_ms / 1000.0 for k in range(count)]
+                sink(device, [float(state)] * count, times)
+                times = times[skip:]
+            else:
+                times = (
+                    first_t + k * period_ms / 1000.0 for k in range(skip, count)
+                )
+            device.motion_buffer.extend(repeat(float(state), count - skip), times)
+        return True
+
+    def handle_logs_text(self, device, body):
+        self.record_log(device, body.decode("utf-8", "replace"))
+        return True
+
+    def handle_logs_frame(self, device, payload):
+        self.record_log(device, protocol.decode_logs(payload))
+        return True
+
+    def record_log(self, device, text):
+        device.log_buffer.append(text)
+        self.log_sink.write(f"[{device.key}] {text}", level=guess_level(text))
+        if self.db:
+            self.db.add_log(device.key, text)
+
+    def handle_performance_text(self, device, body):
+        if not body.startswith(b"{"):
+            self.parse_errors += 1
+            return False
         try:
-            line = raw_line.strip().decode("utf-8")
-            print(f"Received: {line}")
-            if not line:
-                return None
-            if "MOTION:" in line:
-                _, val = line.split("MOTION:", 1)
-                print(f"ExtractedMotion value: {val}")
-                return float(val.strip())
-            return float(line)
-        except Exception:
-            return None
+            status = json.loads(body)
+        except ValueError:
+            self.parse_errors += 1
+            return False
+        # accept both the bare status and the {"type", "data"} envelope
+        if isinstance(status, dict):
+            status = status.get("data", status)
+        return self.update_transmitter_status(device, status)
+
+    def handle_performance_frame(self, device, payload):
+        return self.update_transmitter_status(
+            device, protocol.decode_performance_status(payload)
+        )
+
+    def update_transmitter_status(self, device, status):
+        """
+        Merge a decoded status into the device's. Anything but a dict with
+        numeric metrics is counted as a parse error and ignored.
+        """
+        if not isinstance(status, dict) or not all(
+            type(status[key]) in (int, float)
+            for key in _NUMERIC_STATUS_FIELDS
+            if key in status
+        ):
+            self.parse_errors += 1
+            return False
+        if "ram" not in status and "memory" in status:
+            status["ram"] = status["memory"]
+        for key in _STATUS_FIELDS:
+            if key in status:
+                device.transmitter_status[key] = status[key]
+        device.transmitter_status["received_at"] = datetime.now()
+        return True
+
+    def read_chunk(self, channel=None):
+        """
+        Drain everything waiting in the UART buffer in one call. Only when
+        nothing is waiting do we block (up to the port timeout) for the next
+        byte, so an idle link costs no CPU and a burst is read in bulk.
+        """
+        port = (channel or self.channels[0]).serial
+        waiting = port.in_waiting
+        if waiting:
+            return port.read(waiting)
+        return port.read(1)
+
+    def handle_chunk(self, chunk, channel=None):
+        channel = channel or self.channels[0]
+        received_at = self.received_at = time.monotonic()
+        if self.capture:
+            self.capture.write(chunk, channel.index, received_at)
+        self.stats.record_chunk(len(chunk))
+        channel.framer.feed(chunk)
+        for frame in channel.framer.frames():
+            try:
+                self.dispatch(frame, channel)
+            except Exception as e:
+                # a handler bug costs this message, not the port or thread
+                self.dispatch_errors += 1
+                logger.error("Dispatch failed for %r: %r", frame, e, key="dispatch")
+            self.stats.record_frame(received_at)
 
     def mock_motion_value(self):
         """
         Simple motion value mock generator for testing: alternates between 0 and 1.
         """
-        import random
-
         # toggling or random 0/1
         return float(random.randint(0, 1))
 
     def run(self):
         self.running = True
+        if self.owns_log_sink and not self.log_sink.is_alive():
+            self.log_sink.start()
+        if self.capture_path:
+            self.capture = CaptureWriter(self.capture_path)
+            logger.info("Capturing raw serial data to %s", self.capture_path)
 
-        if not self.open_port() and not self.use_mock_if_fail:
+        self.open_ports()
+        if len(self.channels) > 1:
+            selectable = sys.platform != "win32" and not any(
+                is_replay(c.port_name) for c in self.channels
+            )
+            if selectable:
+                self.run_multiplexed(self.channels)
+            else:
+                self.run_polled(self.channels)
             return
 
+        channel = self.channels[0]
         while self.running:
-            if self.serial:
+            if channel.serial is None and not self.reconnect(channel):
+                continue
+            try:
+                chunk = self.read_chunk(channel)
+            except Exception as e:
+                # not when stop() just closed the port
+                if self.running:
+                    self.port_lost(channel, e)
+                continue
+            if chunk:
+                self.handle_chunk(chunk, channel)
+
+    def reopen_due(self, channels):
+        """
+        Try the closed channels whose retry time has come; returns those
+        that are open again.
+        """
+        reopened = []
+        for channel in channels:
+            if channel.serial is None and channel.supervisor.due():
+                if self.open_port(channel):
+                    channel.serial.timeout = 0
+                    reopened.append(channel)
+        return reopened
+
+    def retry_wait_s(self, channels, limit):
+        waits = [c.supervisor.wait_s() for c in channels if c.serial is None]
+        return min([limit] + waits)
+
+    def run_multiplexed(self, channels):
+        """
+        Serve several ports from this one thread: wait on all of their file
+        descriptors and drain whichever became readable. Lost ports are
+        reopened when their backoff expires.
+        """
+        selector = selectors.DefaultSelector()
+        for channel in channels:
+            if channel.serial:
+                channel.serial.timeout = 0
+                selector.register(
+                    channel.serial.fileno(), selectors.EVENT_READ, channel
+                )
+
+        while self.running:
+            for channel in self.reopen_due(channels):
+                selector.register(
+                    channel.serial.fileno(), selectors.EVENT_READ, channel
+                )
+            timeout = self.retry_wait_s(channels, 1.0)
+            if not selector.get_map():
+                time.sleep(max(timeout, 0.01))
+                continue
+            for key, _ in selector.select(timeout=timeout):
+                channel = key.data
                 try:
-                    raw = self.serial.readline()
-                    value = self.parse_motion_value(raw)
-                    if value is not None:
-                        self.motion_buffer.append(value)
-                except Exception:
-                    # fall back to mock data if serial fails mid‑run
-                    if self.use_mock_if_fail:
-                        self.motion_buffer.append(self.mock_motion_value())
-            else:
-                # mock mode
-                self.motion_buffer.append(self.mock_motion_value())
+                    chunk = channel.serial.read(channel.serial.in_waiting or 1)
+                except Exception as e:
+                    selector.unregister(key.fd)
+                    if self.running:
+                        self.port_lost(channel, e)
+                    continue
+                if chunk:
+                    self.handle_chunk(chunk, channel)
+        selector.close()
 
-            time.sleep(0.1)  # Faster acquisition period for responsiveness
+    def run_polled(self, channels):
+        """
+        Fallback for platforms whose serial ports cannot be selected on
+        (Windows): non-blocking round robin with a short idle sleep.
+        """
+        for channel in channels:
+            if channel.serial:
+                channel.serial.timeout = 0
+        while self.running:
+            self.reopen_due(channels)
+            idle = True
+            for channel in channels:
+                if channel.serial is None:
+                    continue
+                try:
+                    waiting = channel.serial.in_waiting
+                    chunk = channel.serial.read(waiting) if waiting else b""
+                except Exception as e:
+                    if self.running:
+                        self.port_lost(channel, e)
+                    continue
+                if chunk:
+                    self.handle_chunk(chunk, channel)
+                    idle = False
+            if idle:
+                time.sleep(0.01)
 
     def stop(self):
         self.running = False
-        try:
-            if self.serial and self.serial.is_open:
-                self.serial.close()
-        except Exception:
-            pass
+        for channel in self.channels:
+            try:
+                if channel.serial and channel.serial.is_open:
+                    channel.serial.close()
+            except Exception:
+                pass
+        if self.capture:
+            self.capture.close()
+        if self.owns_log_sink:
+            self.log_sink.stop()
@@ -0,0 +1,71 @@
+import threading
+
+
+# -----------------------------
+# GPIO pin drivers
+# -----------------------------
+class RPiPinDriver:
+    """
+    Input pin backed by RPi.GPIO. Edge callbacks run on RPi.GPIO's own
+    event thread and receive the pin level read right after the edge.
+    """
+
+    def __init__(self, pin, bouncetime_ms=0):
+        import RPi.GPIO as GPIO
+
+        self.GPIO = GPIO
+        self.pin = pin
+        self.bouncetime_ms = bouncetime_ms
+
+    def setup(self):
+        self.GPIO.setmode(self.GPIO.BCM)
+        self.GPIO.setup(self.pin, self.GPIO.IN, pull_up_down=self.GPIO.PUD_DOWN)
+
+    def read(self):
+        return self.GPIO.input(self.pin)
+
+    def add_edge_callback(self, callback):
+        kwargs = {"bouncetime": self.bouncetime_ms} if self.bouncetime_ms else {}
+        self.GPIO.add_event_detect(
+            self.pin,
+            self.GPIO.BOTH,
+            callback=lambda channel: callback(self.GPIO.input(channel)),
+            **kwargs,
+        )
+
+    def cleanup(self):
+        self.GPIO.cleanup(self.pin)
+
+
+class FakePinDriver:
+    """
+    In-memory pin for running the transmitter on a plain Linux box.
+    `set_level` drives the pin and fires edge callbacks synchronously, the
+    way RPi.GPIO fires them from its event thread.
+    """
+
+    def __init__(self, pin=None, level=0):
+        self.pin = pin
+        self.level = level
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    def setup(self):
+        pass
+
+    def read(self):
+        return self.level
+
+    def add_edge_callback(self, callback):
+        self._callbacks.append(callback)
+
+    def set_level(self, level):
+        with self._lock:
+            if level == self.level:
+                return
+            self.level = level
+            for callback in self._callbacks:
+                callback(level)
+
+    def cleanup(self):
+        self._callbacks.clear()
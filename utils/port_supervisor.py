@@ -0,0 +1,252 @@
+import json
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+import serial.tools.list_ports
+
+from utils import protocol
+from utils.logger import get_logger
+from utils.serial_framer import SerialFramer
+
+logger = get_logger("port_supervisor")
+
+# text prefixes a transmitter may answer a probe with
+_KNOWN_PREFIXES = tuple(name.encode() for name in protocol.MESSAGE_TYPE_IDS)
+
+
+# -----------------------------
+# Retry timing
+# -----------------------------
+class Backoff:
+    """
+    Exponential backoff with jitter: each delay is the current step scaled
+    by a random factor in [1 - jitter, 1], so stations restarted together
+    do not retry in lockstep.
+    """
+
+    def __init__(self, initial_s=0.5, max_s=30.0, factor=2.0, jitter=0.5):
+        self.initial_s = initial_s
+        self.max_s = max_s
+        self.factor = factor
+        self.jitter = jitter
+        self.step_s = initial_s
+
+    def next_delay(self):
+        delay = self.step_s * (1.0 - random.random() * self.jitter)
+        self.step_s = min(self.step_s * self.factor, self.max_s)
+        return delay
+
+    def reset(self):
+        self.step_s = self.initial_s
+
+
+class PortCache:
+    """
+    Remembers the last port a transmitter answered on, so the next start
+    tries it before scanning.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        if not self.path:
+            return None
+        try:
+            with open(self.path) as f:
+                return json.load(f).get("port")
+        except (OSError, ValueError):
+            return None
+
+    def save(self, port):
+        if not self.path:
+            return
+        try:
+            with open(self.path, "w") as f:
+                json.dump(
+                    {"port": port, "saved_at": datetime.now().isoformat()}, f
+                )
+        except OSError as e:
+            logger.warning("Could not cache port %s: %s", port, e, key="port_cache")
+
+
+# -----------------------------
+# Connection supervisor
+# -----------------------------
+class PortSupervisor:
+    """
+    Keeps one serial link connected.
+
+    `connect()` tries the configured port, then (with `discover`) the
+    cached port the transmitter was last found on, then every other port
+    from `serial.tools.list_ports` in parallel. Ports other than the
+    configured one must answer a probe: after a `protocol.PROBE_LINE` is
+    written to them, a valid message has to arrive within
+    `probe_timeout_s`. Transmitters that predate the probe are still found
+    if they send anything in that window. After a failure the next attempt
+    is due after a jittered exponential backoff. The time from
+    losing the link to having it back is kept in `last_reconnect_s`.
+
+    `opener(port_name)` returns an open serial port or raises.
+    """
+
+    def __init__(
+        self,
+        port_name,
+        opener,
+        discover=True,
+        cache=None,
+        backoff=None,
+        probe_timeout_s=1.0,
+        exclude=(),
+    ):
+        self.port_name = port_name
+        self.opener = opener
+        self.discover = discover
+        self.cache = cache
+        self.backoff = backoff or Backoff()
+        self.probe_timeout_s = probe_timeout_s
+        self.exclude = set(exclude)
+
+        self.connected_port = None
+        self.last_error = None
+        self.attempts = 0
+        self.reconnects = 0
+        self.ever_connected = False
+        self.next_attempt_at = 0.0
+        self.disconnected_at = None
+        self.last_reconnect_s = None
+
+    def due(self, now=None):
+        return (time.monotonic() if now is None else now) >= self.next_attempt_at
+
+    def wait_s(self, now=None):
+        now = time.monotonic() if now is None else now
+        return max(0.0, self.next_attempt_at - now)
+
+    def lost(self):
+        self.connected_port = None
+        if self.disconnected_at is None:
+            self.disconnected_at = time.monotonic()
+        self.next_attempt_at = time.monotonic() + self.backoff.next_delay()
+
+    def connect(self):
+        """
+        One connection attempt. Returns an open serial port, or None and
+        schedules the next attempt.
+        """
+        self.attempts += 1
+        if self.disconnected_at is None:
+            self.disconnected_at = time.monotonic()
+
+        port = self._open_configured()
+        if port is None and self.discover:
+            port = self._open_cached() or self._discover()
+
+        if port is None:
+            self.next_attempt_at = time.monotonic() + self.backoff.next_delay()
+            return None
+
+        if self.ever_connected or self.attempts > 1:
+            self.last_reconnect_s = time.monotonic() - self.disconnected_at
+        if self.ever_connected:
+            self.reconnects += 1
+        self.ever_connected = True
+        self.disconnected_at = None
+        self.attempts = 0
+        self.backoff.reset()
+        if self.cache and self.connected_port != self.port_name:
+            self.cache.save(self.connected_port)
+        return port
+
+    def _open_configured(self):
+        try:
+            port = self.opener(self.port_name)
+        except Exception as e:
+            self.last_error = e
+            return None
+        self.connected_port = self.port_name
+        return port
+
+    def _open_cached(self):
+        cached = self.cache.load() if self.cache else None
+        if not cached or cached == self.port_name or cached in self.exclude:
+            return None
+        port = self.probe(cached)
+        if port is not None:
+            self.connected_port = cached
+            logger.info("Transmitter found on cached port %s", cached)
+        return port
+
+    def candidates(self):
+        tried = {self.port_name, self.cache.load() if self.cache else None}
+        return [
+            p.device
+            for p in serial.tools.list_ports.comports()
+            if p.device not in tried and p.device not in self.exclude
+        ]
+
+    def _discover(self):
+        names = self.candidates()
+        if not names:
+            return None
+        found = None
+        with ThreadPoolExecutor(max_workers=len(names)) as pool:
+            futures = {pool.submit(self.probe, name): name for name in names}
+            for future in as_completed(futures):
+                port = future.result()
+                if port is None:
+                    continue
+                if found is None:
+                    found = port
+                    self.connected_port = futures[future]
+                    logger.info("Transmitter found on %s", self.connected_port)
+                else:
+                    port.close()
+        return found
+
+    def probe(self, name):
+        """
+        Open `name`, send a probe and wait for one valid message. Returns
+        the open port if a transmitter answered, else None.
+        """
+        try:
+            port = self.opener(name)
+        except Exception:
+            return None
+        framer = SerialFramer()
+        deadline = time.monotonic() + self.probe_timeout_s
+        try:
+            port.write(protocol.PROBE_LINE)
+            port.timeout = min(0.1, self.probe_timeout_s)
+            while time.monotonic() < deadline:
+                chunk = port.read(port.in_waiting or 1)
+                if not chunk:
+                    continue
+                framer.feed(chunk)
+                for frame in framer.frames():
+                    if type(frame) is protocol.Frame or is_motion_line(frame):
+                        port.timeout = 1
+                        return port
+        except Exception:
+            pass
+        port.close()
+        return None
+
+    def status_text(self):
+        if self.connected_port:
+            text = f"connected on {self.connected_port}"
+            if self.last_reconnect_s is not None:
+                text += f", last reconnect {self.last_reconnect_s:.1f} s"
+            return text
+        if self.disconnected_at is None:
+            return "not connected"
+        down = time.monotonic() - self.disconnected_at
+        return f"reconnecting ({down:.0f} s, retry in {self.wait_s():.0f} s)"
+
+
+def is_motion_line(line):
+    line = line.strip()
+    return line.startswith(_KNOWN_PREFIXES) or line in (b"0", b"1")
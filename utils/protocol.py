@@ -0,0 +1,255 @@
+import binascii
+import struct
+import time
+from collections import namedtuple
+
+# -----------------------------
+# Binary wire protocol
+# -----------------------------
+# Frame layout (little endian):
+#
+#   v1: SYNC  VER|TYPE          SEQ  TIMESTAMP  LEN  PAYLOAD  CRC16
+#   v2: SYNC  VER|TYPE  DEVICE  SEQ  TIMESTAMP  LEN  PAYLOAD  CRC16
+#       u8    u8        u8      u16  u32        u8   LEN      u16
+#
+# SYNC is 0xA5, a byte that never occurs in ASCII text, so a receiver can
+# tell binary frames and text lines apart on the same link. It does occur
+# in UTF-8 text ("¥" is C2 A5) and in line noise, so a SYNC is only taken
+# as a frame start when the header after it is plausible (see
+# frame_length).
+# The version lives in the high nibble of the second byte and the message
+# type in the low nibble. TIMESTAMP is the sender's monotonic clock in
+# milliseconds (wrapping), SEQ a wrapping 16 bit counter. The CRC is
+# CRC-16/CCITT-FALSE over everything between SYNC and CRC.
+#
+# v2 adds a DEVICE id so several transmitters can share one coordinator.
+# Device 0 is always sent as v1, which keeps single-transmitter links
+# compatible with control stations that only speak v1.
+
+SYNC = 0xA5
+SYNC_BYTE = bytes([SYNC])
+PROTOCOL_VERSION = 2
+
+MSG_MOTION = 1
+MSG_LOGS = 2
+MSG_PERFORMANCE_STATUS = 3
+MSG_MOTION_BATCH = 4
+
+# message type ids <-> names used in CONSTANTS["MESSAGE_TYPES"]
+MESSAGE_TYPE_IDS = {
+    "MOTION": MSG_MOTION,
+    "LOGS": MSG_LOGS,
+    "PERFORMANCE_STATUS": MSG_PERFORMANCE_STATUS,
+    "MOTION_BATCH": MSG_MOTION_BATCH,
+}
+MESSAGE_TYPE_NAMES = {v: k for k, v in MESSAGE_TYPE_IDS.items()}
+
+# control station -> transmitter: "are you there?"; a transmitter answers
+# with a PERFORMANCE_STATUS right away, batched motion or not
+PROBE = "PROBE"
+PROBE_LINE = PROBE.encode() + b"\n"
+
+_HEADER_V1 = struct.Struct("<BBHIB")
+_HEADER_V2 = struct.Struct("<BBBHIB")
+_HEADERS = {1: _HEADER_V1, 2: _HEADER_V2}
+_CRC = struct.Struct("<H")
+_PERF = struct.Struct("<5f")
+_BATCH_HEADER = struct.Struct("<H")
+_RUN = struct.Struct("<BHI")
+
+CRC_SIZE = _CRC.size
+# returned by frame_length when the bytes at `start` cannot begin a frame
+NOT_A_FRAME = -1
+MAX_PAYLOAD = 255
+MAX_RUNS = (MAX_PAYLOAD - _BATCH_HEADER.size) // _RUN.size
+MAX_RUN_LENGTH = 0xFFFF
+
+# shortest payload each message type is ever encoded with
+_MIN_PAYLOAD = {
+    MSG_MOTION: 1,
+    MSG_LOGS: 0,
+    MSG_PERFORMANCE_STATUS: _PERF.size,
+    MSG_MOTION_BATCH: _BATCH_HEADER.size,
+}
+
+Frame = namedtuple(
+    "Frame", ["version", "type", "seq", "timestamp", "payload", "device"]
+)
+
+
+def crc16(data):
+    return binascii.crc_hqx(data, 0xFFFF)
+
+
+def encode_frame(msg_type, seq, timestamp_ms, payload, device=0):
+    if len(payload) > MAX_PAYLOAD:
+        raise ValueError(f"payload too large: {len(payload)} bytes")
+    if device:
+        body = _HEADER_V2.pack(
+            SYNC,
+            (2 << 4) | msg_type,
+            device & 0xFF,
+            seq & 0xFFFF,
+            timestamp_ms & 0xFFFFFFFF,
+            len(payload),
+        )
+    else:
+        body = _HEADER_V1.pack(
+            SYNC,
+            (1 << 4) | msg_type,
+            seq & 0xFFFF,
+            timestamp_ms & 0xFFFFFFFF,
+            len(payload),
+        )
+    body += payload
+    return body + _CRC.pack(crc16(body[1:]))
+
+
+def frame_length(buf, start=0):
+    """
+    Total size of the binary frame starting at `start`, None if the header
+    has not fully arrived yet, or NOT_A_FRAME if the header has an unknown
+    version or type, or a payload length that type never has.
+    """
+    if len(buf) - start < 2:
+        return None
+    header = _HEADERS.get(buf[start + 1] >> 4)
+    min_payload = _MIN_PAYLOAD.get(buf[start + 1] & 0x0F)
+    if header is None or min_payload is None:
+        return NOT_A_FRAME
+    if len(buf) - start < header.size:
+        return None
+    length = buf[start + header.size - 1]
+    if length < min_payload:
+        return NOT_A_FRAME
+    return header.size + CRC_SIZE + length
+
+
+def decode_frame(data):
+    """
+    Decode one complete binary frame. Returns None when the CRC does not
+    match or the version is unknown.
+    """
+    end = len(data) - CRC_SIZE
+    (crc,) = _CRC.unpack_from(data, end)
+    if crc16(data[1:end]) != crc:
+        return None
+    version = data[1] >> 4
+    if version == 1:
+        _, ver_type, seq, timestamp, _ = _HEADER_V1.unpack_from(data)
+        device = 0
+        header_size = _HEADER_V1.size
+    elif version == 2:
+        _, ver_type, device, seq, timestamp, _ = _HEADER_V2.unpack_from(data)
+        header_size = _HEADER_V2.size
+    else:
+        return None
+    return Frame(
+        version, ver_type & 0x0F, seq, timestamp, bytes(data[header_size:end]), device
+    )
+
+
+# -----------------------------
+# Payload codecs
+# -----------------------------
+def encode_motion(value):
+    return bytes([1 if value else 0])
+
+
+def decode_motion(payload):
+    return float(payload[0]) if payload else None
+
+
+def encode_logs(text):
+    return text.encode("utf-8")[:MAX_PAYLOAD]
+
+
+def decode_logs(payload):
+    return payload.decode("utf-8", "replace")
+
+
+def encode_performance_status(status):
+    fixed = _PERF.pack(
+        status.get("cpu", 0.0),
+        status.get("ram", status.get("memory", 0.0)),
+        status.get("disk", 0.0),
+        status.get("net_up", 0.0),
+        status.get("net_down", 0.0),
+    )
+    version = status.get("version", "").encode("utf-8")
+    return fixed + version[: MAX_PAYLOAD - _PERF.size]
+
+
+def decode_performance_status(payload):
+    if len(payload) < _PERF.size:
+        return None
+    cpu, ram, disk, net_up, net_down = _PERF.unpack_from(payload)
+    return {
+        "cpu": cpu,
+        "ram": ram,
+        "disk": disk,
+        "net_up": net_up,
+        "net_down": net_down,
+        "version": payload[_PERF.size :].decode("utf-8", "replace"),
+    }
+
+
+def encode_motion_batch(batch):
+    """
+    `batch` is (sample_period_ms, runs) where each run is
+    (state, count, start_timestamp_ms): "state X for N samples since T".
+    """
+    sample_period_ms, runs = batch
+    payload = bytearray(_BATCH_HEADER.pack(sample_period_ms & 0xFFFF))
+    for state, count, start_ms in runs:
+        payload += _RUN.pack(1 if state else 0, count, start_ms & 0xFFFFFFFF)
+    return bytes(payload)
+
+
+def decode_motion_batch(payload):
+    """
+    Returns (sample_period_ms, runs), or None if the payload is not a
+    header followed by whole runs.
+    """
+    if len(payload) < _BATCH_HEADER.size or (
+        (len(payload) - _BATCH_HEADER.size) % _RUN.size
+    ):
+        return None
+    (sample_period_ms,) = _BATCH_HEADER.unpack_from(payload)
+    runs = [
+        _RUN.unpack_from(payload, offset)
+        for offset in range(_BATCH_HEADER.size, len(payload) - _RUN.size + 1, _RUN.size)
+    ]
+    return sample_period_ms, runs
+
+
+PAYLOAD_ENCODERS = {
+    MSG_MOTION: encode_motion,
+    MSG_LOGS: encode_logs,
+    MSG_PERFORMANCE_STATUS: encode_performance_status,
+    MSG_MOTION_BATCH: encode_motion_batch,
+}
+
+
+class FrameEncoder:
+    """
+    Sender side helper that stamps frames with a wrapping sequence number
+    and the sender's monotonic clock.
+    """
+
+    def __init__(self, device=0):
+        self.device = device
+        self.seq = 0
+        self._t0 = time.monotonic()
+
+    def timestamp_ms(self):
+        return int((time.monotonic() - self._t0) * 1000)
+
+    def encode(self, type_name, msg):
+        msg_type = MESSAGE_TYPE_IDS[type_name]
+        payload = PAYLOAD_ENCODERS[msg_type](msg)
+        frame = encode_frame(
+            msg_type, self.seq, self.timestamp_ms(), payload, self.device
+        )
+        self.seq = (self.seq + 1) & 0xFFFF
+        return frame
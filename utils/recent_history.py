@@ -0,0 +1,69 @@
+import struct
+from pathlib import Path
+
+from utils.measurement_history import HISTORY_COLUMNS, MeasurementRow
+from utils.mmap_ring import MmapRing
+
+_SAMPLE = struct.Struct("<dd")  # value, receive time (epoch s)
+_ROW = struct.Struct("<%dd" % len(HISTORY_COLUMNS))
+_NO_TIME = -1.0
+
+
+# -----------------------------
+# Warm-restart history
+# -----------------------------
+class RecentHistory:
+    """
+    The recent motion samples and measurement rows, mirrored into two
+    MmapRing files under `directory` so that after a restart (or a crash)
+    the graphs and the in-memory history are refilled straight from the
+    mapped files.
+    """
+
+    def __init__(self, directory, motion_capacity, metrics_capacity):
+        directory = Path(directory)
+        self.motion = MmapRing(
+            directory / "motion.ring", motion_capacity, _SAMPLE.size
+        )
+        self.metrics = MmapRing(
+            directory / "metrics.ring", metrics_capacity, _ROW.size
+        )
+
+    def add_samples(self, values, times):
+        for value, t in zip(values, times):
+            self.motion.append(_SAMPLE.pack(value, t))
+
+    def add_measurement(self, row):
+        motion_time = row.motion_time
+        self.metrics.append(
+            _ROW.pack(
+                row.timestamp,
+                row.motion,
+                _NO_TIME if motion_time is None else motion_time,
+                row.cpu,
+                row.ram,
+                row.disk,
+                row.net_up,
+                row.net_down,
+            )
+        )
+
+    def samples(self):
+        """
+        (values, times) of the retained motion samples, oldest first.
+        """
+        pairs = [_SAMPLE.unpack(raw) for raw in self.motion.records()]
+        return [v for v, _ in pairs], [t for _, t in pairs]
+
+    def measurements(self):
+        rows = []
+        for raw in self.metrics.records():
+            values = list(_ROW.unpack(raw))
+            if values[2] == _NO_TIME:
+                values[2] = None
+            rows.append(MeasurementRow(*values))
+        return rows
+
+    def close(self):
+        self.motion.close()
+        self.metrics.close()
@@ -0,0 +1,189 @@
+import time
+from array import array
+from itertools import islice
+
+
+# -----------------------------
+# Ring buffer
+# -----------------------------
+class RingBuffer:
+    """
+    Fixed-capacity ring buffer with a monotonically increasing write index.
+
+    Values live in a preallocated `array` of `typecode` (or a plain list
+    when `typecode` is None, for strings). Readers never copy the whole
+    window: they keep the `write_index` they last saw as a cursor and ask
+    for the items written `since(cursor)`.
+
+    Safe for one producer thread and one or more reader threads without a
+    lock: the producer claims the next index before storing the value and
+    publishes the new write index after it, and readers re-check the
+    claimed index after copying to drop any slot the producer overwrote in
+    the meantime, published or not.
+    """
+
+    def __init__(self, capacity, typecode="d", fill=None):
+        self.capacity = capacity
+        self.typecode = typecode
+        if typecode is None:
+            self._data = [None] * capacity
+        else:
+            self._data = array(typecode, [0]) * capacity
+        self.write_index = 0
+        # index of the item being stored; ahead of write_index while a
+        # value is stored but not yet published
+        self._claimed = 0
+        if fill is not None:
+            self.extend([fill] * capacity)
+
+    @property
+    def maxlen(self):
+        return self.capacity
+
+    def append(self, value):
+        i = self.write_index
+        self._claimed = i + 1
+        self._data[i % self.capacity] = value
+        self.write_index = i + 1
+
+    def extend(self, values):
+        for value in values:
+            self.append(value)
+
+    def clear(self):
+        """
+        Forget all items. Only the producer (or the owner while no producer
+        runs) may call this.
+        """
+        self.write_index = 0
+        self._claimed = 0
+
+    def __len__(self):
+        return min(self.write_index, self.capacity)
+
+    def __bool__(self):
+        return self.write_index > 0
+
+    def __getitem__(self, index):
+        """
+        Negative indexes count back from the newest item, like a deque.
+        """
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("ring buffer index out of range")
+        return self._data[(self.write_index - n + index) % self.capacity]
+
+    def __iter__(self):
+        end = self.write_index
+        for i in range(max(0, end - self.capacity), end):
+            yield self._data[i % self.capacity]
+
+    def latest(self, default=None):
+        i = self.write_index
+        return self._data[(i - 1) % self.capacity] if i else default
+
+    def _copy(self, start, end, data=None):
+        data = self._data if data is None else data
+        cap = self.capacity
+        lo, hi = start % cap, end % cap
+        if end - start == 0:
+            return data[0:0]
+        if lo < hi:
+            return data[lo:hi]
+        # wrapped: build the result once instead of concatenating slices
+        if type(data) is list:
+            out = data[lo:]
+            out.extend(islice(data, hi))
+            return out
+        view = memoryview(data).cast("B")
+        size = data.itemsize
+        out = array(data.typecode)
+        out.frombytes(view[lo * size :])
+        out.frombytes(view[: hi * size])
+        return out
+
+    def since(self, cursor):
+        """
+        Items written after `cursor` (oldest first) and the cursor to pass
+        next time. If the reader fell more than `capacity` items behind,
+        only the newest `capacity` items are returned.
+        """
+        end = self.write_index
+        start = max(cursor, end - self.capacity, 0)
+        items = self._copy(start, end)
+        # the producer may have lapped us while copying
+        lapped = self._claimed - self.capacity
+        if lapped > start:
+            items = items[lapped - start :]
+        return items, end
+
+    def tail(self, n):
+        """
+        The newest `n` items (oldest first).
+        """
+        items, _ = self.since(self.write_index - min(n, self.capacity))
+        return items
+
+
+class TimedRingBuffer(RingBuffer):
+    """
+    RingBuffer that also keeps the receive time of every item.
+
+    Times are `time.monotonic()` seconds in a parallel array of doubles
+    sharing the write index, so a sample costs 8 bytes more rather than a
+    tuple per sample. `to_wall(t)` converts one to epoch seconds.
+    """
+
+    def __init__(self, capacity, typecode="d"):
+        super().__init__(capacity, typecode)
+        self._times = array("d", [0.0]) * capacity
+        self.wall_offset = time.time() - time.monotonic()
+
+    def append(self, value, t=None):
+        i = self.write_index
+        slot = i % self.capacity
+        self._claimed = i + 1
+        self._data[slot] = value
+        self._times[slot] = time.monotonic() if t is None else t
+        self.write_index = i + 1
+
+    def extend(self, values, times=None):
+        if times is None:
+            now = time.monotonic()
+            for value in values:
+                self.append(value, now)
+        else:
+            for value, t in zip(values, times):
+                self.append(value, t)
+
+    def latest_time(self, default=None):
+        i = self.write_index
+        return self._times[(i - 1) % self.capacity] if i else default
+
+    def to_wall(self, t):
+        return t + self.wall_offset
+
+    def since_with_times(self, cursor):
+        """
+        Like `since`, but returns (items, times, next cursor).
+        """
+        end = self.write_index
+        start = max(cursor, end - self.capacity, 0)
+        items = self._copy(start, end)
+        times = self._copy(start, end, self._times)
+        lapped = self._claimed - self.capacity
+        if lapped > start:
+            items = items[lapped - start :]
+            times = times[lapped - start :]
+        return items, times, end
+
+    def tail_with_times(self, n):
+        """
+        The newest `n` items and their receive times (oldest first).
+        """
+        items, times, _ = self.since_with_times(
+            self.write_index - min(n, self.capacity)
+        )
+        return items, times
@@ -0,0 +1,303 @@
+import math
+import struct
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+
+from utils.segment_store import SegmentStore
+
+# motion comes from the received samples, the rest from the per-tick rows
+ROLLUP_FIELDS = ("motion", "cpu", "ram", "disk", "net_up", "net_down")
+MOTION = 0
+# tier name, bucket length (s), closed buckets kept in RAM for graphs
+ROLLUP_TIERS = (("minute", 60, 1440), ("hour", 3600, 744), ("day", 86400, 366))
+# a silent transmitter does not count as active for longer than this
+MAX_ACTIVE_GAP_S = 5.0
+# open buckets are saved this often (s), so a crash loses at most this
+# much of the hour and day tiers instead of the whole open period
+CHECKPOINT_INTERVAL_S = 300
+
+ROLLUP_HEADER = [
+    "Period Start",
+    "Motion Samples",
+    "Motion Active (s)",
+    "CPU Avg (%)",
+    "CPU Max (%)",
+    "RAM Avg (%)",
+    "RAM Max (%)",
+    "Disk Avg (%)",
+    "Net Up Avg (kB/s)",
+    "Net Down Avg (kB/s)",
+]
+
+# start, active seconds, then count/sum/min/max for every field
+_BUCKET = struct.Struct("<dd" + "Iddd" * len(ROLLUP_FIELDS))
+
+
+# -----------------------------
+# Rollup bucket
+# -----------------------------
+class RollupBucket:
+    """
+    Count, sum, min and max of every field over one period starting at
+    `start` (epoch s), plus how many seconds motion was active.
+    """
+
+    __slots__ = ("start", "active_s", "count", "total", "low", "high")
+
+    def __init__(self, start):
+        n = len(ROLLUP_FIELDS)
+        self.start = start
+        self.active_s = 0.0
+        self.count = [0] * n
+        self.total = [0.0] * n
+        self.low = [math.inf] * n
+        self.high = [-math.inf] * n
+
+    def add(self, field, value):
+        self.count[field] += 1
+        self.total[field] += value
+        if value < self.low[field]:
+            self.low[field] = value
+        if value > self.high[field]:
+            self.high[field] = value
+
+    def mean(self, field):
+        count = self.count[field]
+        return self.total[field] / count if count else None
+
+    def encode(self):
+        values = [self.start, self.active_s]
+        for i in range(len(ROLLUP_FIELDS)):
+            values += (self.count[i], self.total[i], self.low[i], self.high[i])
+        return _BUCKET.pack(*values)
+
+    @classmethod
+    def decode(cls, payload):
+        values = _BUCKET.unpack(payload)
+        bucket = cls(values[0])
+        bucket.active_s = values[1]
+        for i in range(len(ROLLUP_FIELDS)):
+            count, total, low, high = values[2 + i * 4 : 6 + i * 4]
+            bucket.count[i] = count
+            bucket.total[i] = total
+            bucket.low[i] = low
+            bucket.high[i] = high
+        return bucket
+
+
+# -----------------------------
+# One resolution
+# -----------------------------
+class RollupTier:
+    """
+    Buckets of `seconds` aligned to local time (minutes, hours, days).
+    Closed buckets are appended to `store` and the newest `keep` stay in
+    memory; the open bucket is `current`. The UTC offset is looked up per
+    bucket, so day buckets follow local midnight across DST changes (and
+    are 23 or 25 hours long on those days).
+    """
+
+    def __init__(self, name, seconds, keep, store):
+        self.name = name
+        self.seconds = seconds
+        self.store = store
+        self.recent = deque(maxlen=keep)
+        self.current = None
+        self._end = -math.inf
+        self._load(keep)
+
+    def _load(self, keep):
+        # a bucket saved open (at a checkpoint or at shutdown) is saved
+        # again once it closes; the later record wins
+        since = time.time() - keep * self.seconds
+        buckets = {}
+        for _, payload in self.store.records(since=since):
+            bucket = RollupBucket.decode(payload)
+            buckets[bucket.start] = bucket
+        for start in sorted(buckets):
+            self.recent.append(buckets[start])
+        if self.recent and self.recent[-1].start == self.bucket_start(time.time()):
+            self._open(self.recent.pop())
+
+    def bucket_start(self, t):
+        start = t - (t + time.localtime(t).tm_gmtoff) % self.seconds
+        # the offset in force at the start differs when a DST change lies
+        # between it and `t`
+        return t - (t + time.localtime(start).tm_gmtoff) % self.seconds
+
+    def _open(self, bucket):
+        self.current = bucket
+        # half a period into the next bucket is past any DST shift
+        self._end = self.bucket_start(bucket.start + self.seconds * 1.5)
+
+    def _close(self):
+        self.store.append(self.current.encode(), self.current.start)
+        self.recent.append(self.current)
+        self.current = None
+
+    def bucket_for(self, t):
+        """
+        The open bucket for time `t`, closing the previous one when `t`
+        is past its end. Late values go to the open bucket.
+        """
+        if t >= self._end:
+            if self.current is not None:
+                self._close()
+            self._open(RollupBucket(self.bucket_start(t)))
+        return self.current
+
+    def buckets(self, since=None):
+        """
+        Closed buckets starting at `since` or later, then the open one.
+        """
+        out = [b for b in self.recent if since is None or b.start >= since]
+        if self.current is not None:
+            out.append(self.current)
+        return out
+
+    def checkpoint(self):
+        # save the partial bucket; it is picked up again on the next start
+        if self.current is not None:
+            self.store.append(self.current.encode(), self.current.start)
+
+    def close(self):
+        self.checkpoint()
+        self.store.close()
+
+
+# -----------------------------
+# All tiers
+# -----------------------------
+class Rollups:
+    """
+    Minute, hour and day rollups of motion and the resource metrics,
+    updated incrementally: each motion sample and each measurement row
+    touches one bucket per tier, so long spans are graphed and reported
+    from a few hundred buckets without reading raw samples back.
+
+    Each tier is persisted next to the measurements as a SegmentStore
+    under `directory/<tier>`, one segment per 1440 buckets. The open
+    buckets of tiers coarser than `checkpoint_interval_s` are saved every
+    `checkpoint_interval_s` of data.
+
+    Data is added from the MeasurementWriter thread and read by the Graphs
+    page on the Tk thread; `_lock` keeps the bucket lists consistent.
+    """
+
+    def __init__(
+        self,
+        directory,
+        tiers=ROLLUP_TIERS,
+        max_segment_bytes=1 << 20,
+        checkpoint_interval_s=CHECKPOINT_INTERVAL_S,
+    ):
+        self.directory = Path(directory)
+        self.checkpoint_interval_s = checkpoint_interval_s
+        self.tiers = {}
+        for name, seconds, keep in tiers:
+            store = SegmentStore(
+                self.directory / name,
+                max_segment_bytes=max_segment_bytes,
+                max_segment_age_s=seconds * 1440,
+            )
+            self.tiers[name] = RollupTier(name, seconds, keep, store)
+        self._tiers = list(self.tiers.values())
+        # shorter tiers close (and save) their buckets more often anyway
+        self._checkpointed = [
+            t for t in self._tiers if t.seconds > checkpoint_interval_s
+        ]
+        self._next_checkpoint = time.time() + checkpoint_interval_s
+        self._last_time = None
+        self._last_motion = 0.0
+        self._lock = threading.Lock()
+
+    def add_samples(self, values, times):
+        """
+        Motion samples with their times (epoch s), oldest first. The time
+        up to a sample counts as active if the previous sample was non-zero.
+        """
+        with self._lock:
+            self._add_samples(values, times)
+
+    def _add_samples(self, values, times):
+        tiers = self._tiers
+        last_time, last_motion = self._last_time, self._last_motion
+        for value, t in zip(values, times):
+            active = 0.0
+            if last_motion and last_time is not None:
+                active = min(max(t - last_time, 0.0), MAX_ACTIVE_GAP_S)
+            for tier in tiers:
+                bucket = tier.bucket_for(t)
+                bucket.add(MOTION, value)
+                bucket.active_s += active
+            last_time, last_motion = t, value
+        self._last_time, self._last_motion = last_time, last_motion
+
+    def add_measurement(self, row):
+        """
+        One MeasurementRow; its motion value is ignored in favour of the
+        samples themselves.
+        """
+        values = (row.cpu, row.ram, row.disk, row.net_up, row.net_down)
+        with self._lock:
+            for tier in self._tiers:
+                bucket = tier.bucket_for(row.timestamp)
+                for field, value in enumerate(values, 1):
+                    bucket.add(field, value)
+            if row.timestamp >= self._next_checkpoint:
+                self._checkpoint()
+
+    def checkpoint(self):
+        """
+        Save the open buckets of the coarse tiers.
+        """
+        with self._lock:
+            self._checkpoint()
+
+    def _checkpoint(self):
+        for tier in self._checkpointed:
+            tier.checkpoint()
+        self._next_checkpoint = time.time() + self.checkpoint_interval_s
+
+    def series(self, name, since=None):
+        with self._lock:
+            return self.tiers[name].buckets(since)
+
+    def summary_rows(self, name, since=None, until=None):
+        """
+        Rows for ROLLUP_HEADER read from the persisted tier, so exports
+        can run on another thread. Only closed periods are included.
+        """
+        tier = self.tiers[name]
+        if since is not None:
+            # the period `since` falls in
+            since = tier.bucket_start(since)
+        buckets = {}
+        for timestamp, payload in tier.store.records(since=since):
+            if until is not None and timestamp > until:
+                break
+            bucket = RollupBucket.decode(payload)
+            buckets[bucket.start] = bucket
+        cpu, ram, disk, net_up, net_down = range(1, len(ROLLUP_FIELDS))
+        for start in sorted(buckets):
+            b = buckets[start]
+            yield [
+                datetime.fromtimestamp(start),
+                b.count[MOTION],
+                b.active_s,
+                b.mean(cpu),
+                b.high[cpu] if b.count[cpu] else None,
+                b.mean(ram),
+                b.high[ram] if b.count[ram] else None,
+                b.mean(disk),
+                b.mean(net_up),
+                b.mean(net_down),
+            ]
+
+    def close(self):
+        with self._lock:
+            for tier in self._tiers:
+                tier.close()
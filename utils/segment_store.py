@@ -0,0 +1,225 @@
+import os
+import struct
+import time
+import zlib
+from pathlib import Path
+
+from utils.compression import is_compressed, open_read, plain_name
+from utils.logger import get_logger
+
+logger = get_logger("segment_store")
+
+SEGMENT_MAGIC = b"MSSEG"
+SEGMENT_VERSION = 1
+SEGMENT_SUFFIX = ".seg"
+_HEADER = struct.Struct("<5sBd")  # magic, version, created (epoch s)
+_RECORD = struct.Struct("<IId")  # payload length, crc32, timestamp (epoch s)
+_CHECKED = struct.Struct("<Id")  # header fields covered by the crc
+
+
+# -----------------------------
+# Append-only segment store
+# -----------------------------
+class SegmentStore:
+    """
+    Append-only record log split into segment files under `directory`.
+
+    Every record is framed with its length, a timestamp and a CRC32 over
+    both and the payload, so on open a record torn by a crash or power
+    loss at the end of the newest segment is detected and cut off;
+    everything before it is kept. A new segment is started once the current one exceeds
+    `max_segment_bytes` or is older than `max_segment_age_s`.
+
+    Appends are flushed to the OS right away and fsynced at most every
+    `fsync_interval_s`, and always when a segment is closed.
+    """
+
+    def __init__(
+        self,
+        directory,
+        max_segment_bytes=1 << 20,
+        max_segment_age_s=3600,
+        fsync_interval_s=10.0,
+    ):
+        self.directory = Path(directory)
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segment_age_s = max_segment_age_s
+        self.fsync_interval_s = fsync_interval_s
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self.recovered_records = 0
+        self.truncated_bytes = 0
+        self._file = None
+        self._created = 0.0
+        self._size = 0
+        self._last_fsync = time.monotonic()
+        self._recover()
+
+    # -----------------------------
+    # Segment files
+    # -----------------------------
+    def segment_paths(self):
+        return segment_paths(self.directory)
+
+    @staticmethod
+    def segment_created(path):
+        return segment_created(path)
+
+    def _recover(self):
+        """
+        Check the newest segment and cut it at the first incomplete or
+        corrupt record.
+        """
+        paths = self.segment_paths()
+        if not paths:
+            return
+        path = paths[-1]
+        if is_compressed(path):
+            # compressed segments were closed cleanly
+            return
+        good_end = 0
+        count = 0
+        try:
+            with open(path, "rb") as f:
+                for _, _, end in _scan(f):
+                    good_end = end
+                    count += 1
+        except ValueError:
+            # header never made it to disk
+            good_end = 0
+
+        size = path.stat().st_size
+        if good_end == 0:
+            path.unlink()
+            self.truncated_bytes += size
+            logger.warning("Removed empty segment %s", path.name)
+            return
+        if good_end < size:
+            with open(path, "r+b") as f:
+                f.truncate(good_end)
+            self.truncated_bytes += size - good_end
+            logger.warning(
+                "Recovered %s: cut %d bytes of a torn record",
+                path.name,
+                size - good_end,
+            )
+        self.recovered_records = count
+
+    def _open_segment(self, now):
+        paths = self.segment_paths()
+        if paths:
+            index = int(paths[-1].stem.split("-")[0]) + 1
+        else:
+            index = 1
+        path = self.directory / f"{index:08d}-{int(now)}{SEGMENT_SUFFIX}"
+        self._file = open(path, "ab")
+        self._file.write(_HEADER.pack(SEGMENT_MAGIC, SEGMENT_VERSION, now))
+        self._file.flush()
+        self._created = now
+        self._size = _HEADER.size
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._last_fsync = time.monotonic()
+
+    def roll(self):
+        """
+        Close the current segment; the next append starts a new one.
+        """
+        if self._file:
+            self._sync()
+            self._file.close()
+            self._file = None
+
+    # -----------------------------
+    # Writing and reading
+    # -----------------------------
+    def append(self, payload, timestamp=None):
+        now = time.time() if timestamp is None else timestamp
+        if self._file and (
+            self._size >= self.max_segment_bytes
+            or now - self._created >= self.max_segment_age_s
+        ):
+            self.roll()
+        if self._file is None:
+            self._open_segment(now)
+
+        header = _RECORD.pack(len(payload), _crc(len(payload), now, payload), now)
+        self._file.write(header + payload)
+        self._file.flush()
+        self._size += len(header) + len(payload)
+        if time.monotonic() - self._last_fsync >= self.fsync_interval_s:
+            self._sync()
+
+    def records(self, since=None):
+        """
+        Yield (timestamp, payload) for every record, oldest first, starting
+        at `since` (epoch s) if given.
+        """
+        paths = self.segment_paths()
+        for i, path in enumerate(paths):
+            # a later segment starting before `since` means this one is older
+            if since is not None and i + 1 < len(paths):
+                if self.segment_created(paths[i + 1]) <= since:
+                    continue
+            try:
+                with open_read(path) as f:
+                    for timestamp, payload, _ in _scan(f):
+                        if since is None or timestamp >= since:
+                            yield timestamp, payload
+            except (OSError, ValueError, EOFError):
+                continue
+
+    def size_bytes(self):
+        return sum(p.stat().st_size for p in self.segment_paths())
+
+    def close(self):
+        self.roll()
+
+
+def segment_paths(directory):
+    """
+    Segment files under `directory`, oldest first; closed segments may
+    have been compressed by StorageMaintenance.
+    """
+    paths = {}
+    for path in Path(directory).iterdir():
+        name = plain_name(path.name)
+        if name.endswith(SEGMENT_SUFFIX) and (name not in paths or name == path.name):
+            paths[name] = path
+    return [paths[name] for name in sorted(paths)]
+
+
+def segment_created(path):
+    # file names are "<index>-<created epoch s>.seg[.gz]"
+    return int(path.name.split(".")[0].split("-")[1])
+
+
+def _scan(f):
+    """
+    Yield (timestamp, payload, end offset) for each intact record of an
+    open segment file, stopping at the first torn or corrupt one.
+    """
+    header = f.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        raise ValueError("truncated segment header")
+    magic, version, _ = _HEADER.unpack(header)
+    if magic != SEGMENT_MAGIC or version != SEGMENT_VERSION:
+        raise ValueError("not a segment file")
+    offset = _HEADER.size
+    while True:
+        head = f.read(_RECORD.size)
+        if len(head) < _RECORD.size:
+            return
+        length, crc, timestamp = _RECORD.unpack(head)
+        payload = f.read(length)
+        if len(payload) < length or _crc(length, timestamp, payload) != crc:
+            return
+        offset += _RECORD.size + length
+        yield timestamp, payload, offset
+
+
+def _crc(length, timestamp, payload):
+    # covering the header too means zero-filled blocks never pass as records
+    return zlib.crc32(payload, zlib.crc32(_CHECKED.pack(length, timestamp)))
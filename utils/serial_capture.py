@@ -0,0 +1,172 @@
+"""
+Raw serial capture and replay.
+
+A capture file is a short header followed by one record per chunk read from
+the port:
+
+    | DELTA_US | CHANNEL | LEN | DATA |
+    | u32      | u8      | u16 | LEN  |
+
+DELTA_US is the monotonic time since the previous record, so a capture can
+be played back with its original pacing. CHANNEL is the index of the port
+in the receiver's port list.
+
+See benchmarks/capture_replay.py for recording a port without the HMI and
+playing captures through the receiver.
+"""
+
+import struct
+import time
+
+MAGIC = b"MSCAP"
+CAPTURE_VERSION = 1
+_HEADER = struct.Struct("<5sB")
+_RECORD = struct.Struct("<IBH")
+_MAX_DELTA_US = 0xFFFFFFFF
+_MAX_CHUNK = 0xFFFF
+
+# port names starting with this are served from a capture file
+REPLAY_PREFIX = "replay:"
+
+
+# -----------------------------
+# Capture
+# -----------------------------
+class CaptureWriter:
+    """
+    Appends raw chunks with their monotonic arrival time to a capture file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "wb")
+        self.file.write(_HEADER.pack(MAGIC, CAPTURE_VERSION))
+        self.last_t = None
+        self.chunks = 0
+        self.bytes = 0
+
+    def write(self, chunk, channel=0, t=None):
+        t = time.monotonic() if t is None else t
+        delta_us = 0 if self.last_t is None else int((t - self.last_t) * 1e6)
+        self.last_t = t
+        delta_us = min(max(delta_us, 0), _MAX_DELTA_US)
+        for start in range(0, len(chunk), _MAX_CHUNK):
+            part = chunk[start : start + _MAX_CHUNK]
+            self.file.write(_RECORD.pack(delta_us, channel, len(part)))
+            self.file.write(part)
+            delta_us = 0
+        self.chunks += 1
+        self.bytes += len(chunk)
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_capture(path):
+    """
+    Yield (seconds since capture start, channel, chunk) for every record.
+    """
+    with open(path, "rb") as f:
+        magic, version = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != MAGIC or version != CAPTURE_VERSION:
+            raise ValueError(f"{path} is not a serial capture file")
+        t = 0.0
+        while True:
+            head = f.read(_RECORD.size)
+            if len(head) < _RECORD.size:
+                return
+            delta_us, channel, length = _RECORD.unpack(head)
+            data = f.read(length)
+            if len(data) < length:
+                # capture cut short (power loss); keep what is complete
+                return
+            t += delta_us / 1e6
+            yield t, channel, data
+
+
+# -----------------------------
+# Replay
+# -----------------------------
+class ReplaySerial:
+    """
+    Stand-in for `serial.Serial` that plays one channel of a capture file.
+
+    `speed` 1.0 keeps the original pacing, N plays N times faster and
+    0 (or None) delivers everything as fast as the reader can take it.
+    """
+
+    def __init__(self, path, speed=1.0, channel=0, timeout=1.0):
+        self.path = path
+        self.speed = speed
+        self.timeout = timeout
+        self.records = (
+            (t, data) for t, ch, data in read_capture(path) if ch == channel
+        )
+        self.pending = bytearray()
+        self.next_record = None
+        self.finished = False
+        self.is_open = True
+        self.t0 = time.monotonic()
+
+    def _due(self, t):
+        if not self.speed:
+            return self.t0
+        return self.t0 + t / self.speed
+
+    def _pull(self):
+        """
+        Move every record whose time has come into the pending buffer and
+        return when the next one is due (None when the capture is over).
+        """
+        now = time.monotonic()
+        while True:
+            if self.next_record is None:
+                self.next_record = next(self.records, None)
+                if self.next_record is None:
+                    self.finished = True
+                    return None
+            t, data = self.next_record
+            due = self._due(t)
+            if due > now:
+                return due
+            self.pending += data
+            self.next_record = None
+
+    @property
+    def in_waiting(self):
+        if not self.is_open:
+            raise OSError("replay port closed")
+        self._pull()
+        return len(self.pending)
+
+    def read(self, size=1):
+        if not self.is_open:
+            raise OSError("replay port closed")
+        deadline = time.monotonic() + (self.timeout or 0)
+        due = self._pull()
+        while len(self.pending) < size and due is not None:
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            time.sleep(min(due, deadline) - now)
+            due = self._pull()
+        if not self.pending and due is None and self.timeout:
+            # end of capture: behave like an idle line
+            time.sleep(min(self.timeout, 0.1))
+        data = bytes(self.pending[:size])
+        del self.pending[:size]
+        return data
+
+    def close(self):
+        self.is_open = False
+
+
+def open_replay(port_name, speed=1.0, channel=0, timeout=1.0):
+    return ReplaySerial(port_name[len(REPLAY_PREFIX) :], speed, channel, timeout)
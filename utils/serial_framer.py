@@ -0,0 +1,102 @@
+from utils import protocol
+
+
+# -----------------------------
+# Serial stream framing
+# -----------------------------
+class SerialFramer:
+    """
+    Splits a raw serial byte stream into frames.
+
+    Incoming chunks are appended to a single reusable bytearray and complete
+    frames are cut from it in one pass, so a burst of many lines read in one
+    `read(in_waiting)` call costs one buffer compaction instead of one
+    `readline()` round trip per line.
+
+    Binary protocol frames (starting with `protocol.SYNC`) are yielded as
+    decoded `protocol.Frame` tuples; anything else is treated as a legacy
+    newline terminated text line and yielded as bytes.
+    """
+
+    def __init__(self, delimiter=b"\n", max_frame_size=1024):
+        self.delimiter = delimiter
+        self.max_frame_size = max_frame_size
+        self.buffer = bytearray()
+        self.dropped_bytes = 0
+        self.crc_errors = 0
+
+    def feed(self, data):
+        self.buffer += data
+
+    def frames(self):
+        """
+        Yield every complete frame currently in the buffer (text lines
+        without the delimiter). Partial frames stay buffered until the rest
+        arrives.
+        """
+        buf = self.buffer
+        delimiter = self.delimiter
+        sync = protocol.SYNC
+        start = 0
+        while start < len(buf):
+            scan = start
+            if buf[start] == sync:
+                size = protocol.frame_length(buf, start)
+                if size is None or start + size > len(buf):
+                    break
+                if size != protocol.NOT_A_FRAME:
+                    frame = protocol.decode_frame(bytes(buf[start : start + size]))
+                    if frame is None:
+                        # corrupted or misaligned: resync on the next byte
+                        self.crc_errors += 1
+                        start += 1
+                        continue
+                    yield frame
+                    start += size
+                    continue
+                # not a frame start but part of a text line ("¥" is C2 A5)
+                scan = start + 1
+
+            end = buf.find(delimiter, scan)
+            sync_at = self._frame_start(buf, scan, end if end >= 0 else len(buf))
+            if sync_at is None:
+                # the header of a possible frame has not fully arrived
+                break
+            if sync_at >= 0:
+                # a binary frame interrupts this text fragment
+                self.dropped_bytes += sync_at - start
+                start = sync_at
+                continue
+            if end < 0:
+                break
+            if end > start:
+                yield bytes(buf[start:end])
+            start = end + 1
+
+        if start:
+            del buf[:start]
+
+        # a frame that never terminates is line noise, not data
+        if len(buf) > self.max_frame_size:
+            self.dropped_bytes += len(buf)
+            buf.clear()
+
+    def _frame_start(self, buf, start, end):
+        """
+        Offset of the first SYNC in buf[start:end] followed by a plausible
+        frame header, -1 if there is none, or None if one still lacks
+        header bytes.
+        """
+        while True:
+            sync_at = buf.find(protocol.SYNC_BYTE, start, end)
+            if sync_at < 0:
+                return -1
+            size = protocol.frame_length(buf, sync_at)
+            if size is None:
+                return None
+            if size != protocol.NOT_A_FRAME:
+                return sync_at
+            start = sync_at + 1
+
+    def reset(self):
+        self.buffer.clear()
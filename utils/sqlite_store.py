@@ -0,0 +1,294 @@
+import math
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from utils.logger import get_logger
+
+logger = get_logger("sqlite_store")
+
+# motion event kinds: the motion value went from 0 to non-zero and back
+MOTION_START = "start"
+MOTION_END = "end"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS devices (device TEXT PRIMARY KEY);
+CREATE TABLE IF NOT EXISTS samples (
+    device TEXT NOT NULL, ts REAL NOT NULL, value REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS events (
+    device TEXT NOT NULL, ts REAL NOT NULL, kind TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    device TEXT NOT NULL, ts REAL NOT NULL, motion REAL, motion_time REAL,
+    cpu REAL, ram REAL, disk REAL, net_up REAL, net_down REAL
+);
+CREATE TABLE IF NOT EXISTS logs (
+    device TEXT NOT NULL, ts REAL NOT NULL, text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS samples_device_ts ON samples (device, ts);
+CREATE INDEX IF NOT EXISTS events_device_ts ON events (device, ts);
+CREATE INDEX IF NOT EXISTS metrics_device_ts ON metrics (device, ts);
+CREATE INDEX IF NOT EXISTS logs_device_ts ON logs (device, ts);
+"""
+
+_INSERT = {
+    "samples": "INSERT INTO samples VALUES (?, ?, ?)",
+    "events": "INSERT INTO events VALUES (?, ?, ?)",
+    "metrics": "INSERT INTO metrics VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+    "logs": "INSERT INTO logs VALUES (?, ?, ?)",
+}
+
+
+# -----------------------------
+# SQLite time-series store
+# -----------------------------
+class SQLiteStore(threading.Thread):
+    """
+    Motion samples, motion events, system metrics and transmitter logs in
+    one SQLite database, indexed on (device, ts) with ts in epoch seconds.
+
+    Writes are queued (the `add_*` methods never touch the database) and a
+    background thread inserts them in one transaction per
+    `flush_interval_s` or `batch_rows` rows, in WAL mode so queries from
+    other threads are never blocked by the writer. Motion events are
+    derived from the samples as they are written.
+
+    Queries may be called from any thread; each thread gets its own
+    read connection.
+    """
+
+    def __init__(
+        self, path, batch_rows=5000, flush_interval_s=1.0, max_queue=4096
+    ):
+        super().__init__(daemon=True)
+        self.path = Path(path)
+        self.batch_rows = batch_rows
+        self.flush_interval_s = flush_interval_s
+        self.entries = queue.Queue(maxsize=max_queue)
+        self.running = False
+
+        self.written = 0
+        self.dropped = 0
+        self.transactions = 0
+        self.write_errors = 0
+
+        self._last_motion = {}
+        self._known_devices = set()
+        self._local = threading.local()
+        self._stopped = threading.Event()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+        finally:
+            conn.close()
+
+    # -----------------------------
+    # Producers
+    # -----------------------------
+    def _put(self, entry):
+        try:
+            self.entries.put_nowait(entry)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def add_samples(self, device, values, times):
+        """
+        Queue motion samples of `device` with their times (epoch s).
+        """
+        return self._put(("samples", device, list(zip(times, values))))
+
+    def add_metrics(self, device, row):
+        """
+        Queue one MeasurementRow, recorded against the selected `device`.
+        """
+        values = (
+            row.timestamp,
+            row.motion,
+            row.motion_time,
+            row.cpu,
+            row.ram,
+            row.disk,
+            row.net_up,
+            row.net_down,
+        )
+        return self._put(("metrics", device, [values]))
+
+    def add_log(self, device, text, timestamp=None):
+        ts = time.time() if timestamp is None else timestamp
+        return self._put(("logs", device, [(ts, text)]))
+
+    # -----------------------------
+    # Writer thread
+    # -----------------------------
+    def _events(self, device, samples):
+        last = self._last_motion.get(device, 0.0)
+        events = []
+        for ts, value in samples:
+            if value and not last:
+                events.append((ts, MOTION_START))
+            elif last and not value:
+                events.append((ts, MOTION_END))
+            last = value
+        self._last_motion[device] = last
+        return events
+
+    def _write_batch(self, conn, batch):
+        rows = {table: [] for table in _INSERT}
+        new_devices = []
+        for table, device, items in batch:
+            if device not in self._known_devices:
+                self._known_devices.add(device)
+                new_devices.append((device,))
+            rows[table].extend((device, *item) for item in items)
+            if table == "samples":
+                rows["events"].extend(
+                    (device, *event) for event in self._events(device, items)
+                )
+        with conn:
+            conn.executemany("INSERT OR IGNORE INTO devices VALUES (?)", new_devices)
+            for table, table_rows in rows.items():
+                if table_rows:
+                    conn.executemany(_INSERT[table], table_rows)
+        self.written += sum(len(items) for _, _, items in batch)
+        self.transactions += 1
+
+    def run(self):
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        self.running = True
+        while self.running or not self.entries.empty():
+            deadline = time.monotonic() + self.flush_interval_s
+            batch = []
+            count = 0
+            while count < self.batch_rows:
+                try:
+                    entry = self.entries.get(
+                        timeout=max(0.0, deadline - time.monotonic())
+                    )
+                except queue.Empty:
+                    break
+                # None is only the wake-up from stop()
+                if entry is None:
+                    break
+                batch.append(entry)
+                count += len(entry[2])
+            if not batch:
+                continue
+            try:
+                self._write_batch(conn, batch)
+            except sqlite3.Error as e:
+                self.write_errors += 1
+                logger.error("Failed to write to %s: %s", self.path, e)
+        conn.close()
+        self._stopped.set()
+
+    def stop(self, timeout=5.0):
+        """
+        Write out everything queued so far and close the database.
+        """
+        self.running = False
+        try:
+            self.entries.put_nowait(None)
+        except queue.Full:
+            pass
+        if self.is_alive():
+            self._stopped.wait(timeout)
+
+    def stats(self):
+        return {
+            "written": self.written,
+            "dropped": self.dropped,
+            "queued": self.entries.qsize(),
+            "transactions": self.transactions,
+            "write_errors": self.write_errors,
+        }
+
+    # -----------------------------
+    # Queries
+    # -----------------------------
+    def _reader(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path)
+            self._local.conn = conn
+        return conn
+
+    def _select(self, columns, table, start, end, device, where="", params=()):
+        """
+        Rows of `table` with `start <= ts < end`, oldest first. Without a
+        device every known device is searched, which still seeks the
+        (device, ts) index once per device.
+        """
+        devices = [device] if device is not None else self.devices()
+        if not devices:
+            return []
+        marks = ", ".join("?" * len(devices))
+        sql = (
+            f"SELECT {columns} FROM {table}"
+            f" WHERE device IN ({marks}) AND ts >= ? AND ts < ?{where}"
+            " ORDER BY ts"
+        )
+        return self._reader().execute(sql, (*devices, start, end, *params))
+
+    def devices(self):
+        return [d for (d,) in self._reader().execute("SELECT device FROM devices")]
+
+    def count_events(self, start, end, device=None, kind=MOTION_START):
+        """
+        Number of motion events of `kind` between `start` and `end`
+        (epoch s), e.g. how often motion started on a given morning.
+        """
+        rows = self._select(
+            "COUNT(*)", "events", start, end, device, " AND kind = ?", (kind,)
+        )
+        return sum(count for (count,) in rows)
+
+    def events(self, start, end, device=None):
+        return list(self._select("device, ts, kind", "events", start, end, device))
+
+    def samples(self, start, end, device=None):
+        return list(self._select("device, ts, value", "samples", start, end, device))
+
+    def metrics(self, start, end, device=None):
+        return list(self._select("*", "metrics", start, end, device))
+
+    def logs(self, start, end, device=None, limit=None):
+        rows = self._select("device, ts, text", "logs", start, end, device)
+        return rows.fetchmany(limit) if limit and rows else list(rows)
+
+    # -----------------------------
+    # Export rows
+    # -----------------------------
+    def measurement_rows(self, since=None, until=None, device=None):
+        """
+        Rows for MEASUREMENT_HEADER, like `measurements.measurement_rows`.
+        """
+        columns = "ts, motion_time, motion, cpu, ram, disk, net_up, net_down"
+        rows = self._select(
+            columns, "metrics", since or 0.0, until or math.inf, device
+        )
+        for ts, motion_time, *values in rows:
+            yield [
+                datetime.fromtimestamp(ts),
+                None if motion_time is None else datetime.fromtimestamp(motion_time),
+                *values,
+            ]
+
+    def sample_rows(self, since=None, until=None, device=None):
+        """
+        Rows for SAMPLE_HEADER, like `measurements.sample_rows`.
+        """
+        rows = self._select(
+            "ts, value", "samples", since or 0.0, until or math.inf, device
+        )
+        for ts, value in rows:
+            yield [datetime.fromtimestamp(ts), value]
@@ -0,0 +1,300 @@
+import shutil
+import sys
+import threading
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import psutil
+
+from utils.compression import (
+    CODECS,
+    TMP_SUFFIX,
+    compress_file,
+    is_compressed,
+    plain_name,
+)
+from utils.log_index import LOG_FILENAME, catch_up, index_path
+from utils.logger import get_logger
+from utils.segment_store import segment_created, segment_paths
+
+logger = get_logger("storage_maintenance")
+
+EXPORT_PATTERN = "measurements_*.xlsx"
+# a closed file untouched for this long is not written to any more
+SETTLE_S = 3600
+
+
+# -----------------------------
+# Storage maintenance
+# -----------------------------
+class StorageMaintenance(threading.Thread):
+    """
+    Background upkeep of the files that otherwise grow forever on the SD
+    card: the daily logs under `log_dir`, the segment stores in
+    `store_dirs` (raw measurements) and `summary_dirs` (rollups), and the
+    Excel exports in `export_dir`.
+
+    Every `interval_s` the thread compresses log days at least
+    `compress_after_days` old and every closed segment with `codec`
+    ("gzip", or "zstd" if the zstandard package is installed; "" = off),
+    then removes log days, raw segments and exports older than
+    `retention_days`, and the oldest files of all kinds while the total is
+    above `quota_bytes` (0 = no limit for either). Readers (SegmentStore,
+    LogIndex) read compressed files transparently.
+
+    On Linux the thread runs at nice 19 and idle I/O priority, so it only
+    gets the CPU and disk time acquisition and the UI leave over.
+    """
+
+    def __init__(
+        self,
+        log_dir,
+        store_dirs=(),
+        summary_dirs=(),
+        export_dir=None,
+        codec="gzip",
+        level=None,
+        compress_after_days=1,
+        retention_days=0,
+        quota_bytes=0,
+        interval_s=3600.0,
+        first_run_s=60.0,
+        log_filename=LOG_FILENAME,
+    ):
+        super().__init__(daemon=True)
+        if codec and codec not in CODECS:
+            raise ValueError(f"unknown codec {codec!r}")
+        self.log_dir = Path(log_dir)
+        self.store_dirs = [Path(d) for d in store_dirs]
+        self.summary_dirs = [Path(d) for d in summary_dirs]
+        self.export_dir = Path(export_dir) if export_dir else None
+        self.codec = codec
+        self.level = level
+        self.compress_after_days = compress_after_days
+        self.retention_days = retention_days
+        self.quota_bytes = quota_bytes
+        self.interval_s = interval_s
+        self.first_run_s = first_run_s
+        self.log_filename = log_filename
+
+        self.passes = 0
+        self.compressed = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.removed = 0
+        self.removed_bytes = 0
+        self.errors = 0
+        self.cpu_s = 0.0
+        self._stopped = threading.Event()
+
+    # -----------------------------
+    # Thread
+    # -----------------------------
+    def _lower_priority(self):
+        # nice and ionice of a thread id only apply to that thread on Linux;
+        # elsewhere they would slow down the whole application
+        if not sys.platform.startswith("linux"):
+            return
+        try:
+            thread = psutil.Process(threading.get_native_id())
+            thread.nice(19)
+            thread.ionice(psutil.IOPRIO_CLASS_IDLE)
+        except (psutil.Error, OSError) as e:
+            logger.debug("Could not lower maintenance priority: %s", e)
+
+    def run(self):
+        self._lower_priority()
+        delay = self.first_run_s
+        while not self._stopped.wait(delay):
+            self.run_once()
+            delay = self.interval_s
+
+    def stop(self, timeout=5.0):
+        """
+        Stop after the file being compressed, if any.
+        """
+        self._stopped.set()
+        if self.is_alive():
+            self.join(timeout)
+
+    def run_once(self):
+        cpu = time.thread_time()
+        if self.codec:
+            self._compress_logs()
+            self._compress_segments()
+        if self.retention_days or self.quota_bytes:
+            self._enforce_limits()
+        self.cpu_s += time.thread_time() - cpu
+        self.passes += 1
+
+    def stats(self):
+        return {
+            "passes": self.passes,
+            "compressed": self.compressed,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "removed": self.removed,
+            "removed_bytes": self.removed_bytes,
+            "errors": self.errors,
+            "cpu_s": self.cpu_s,
+        }
+
+    # -----------------------------
+    # Compression
+    # -----------------------------
+    def _log_days(self):
+        if not self.log_dir.is_dir():
+            return []
+        return sorted(p for p in self.log_dir.iterdir() if _is_day(p.name))
+
+    def _compress(self, path):
+        if time.time() - path.stat().st_mtime < SETTLE_S:
+            return
+        size = path.stat().st_size
+        try:
+            target = compress_file(path, self.codec, self.level)
+        except OSError as e:
+            self.errors += 1
+            logger.warning("Could not compress %s: %s", path, e)
+            return
+        self.compressed += 1
+        self.bytes_in += size
+        self.bytes_out += target.stat().st_size
+
+    def _compress_logs(self):
+        last = (date.today() - timedelta(days=self.compress_after_days)).isoformat()
+        for day_dir in self._log_days():
+            if day_dir.name > last or self._stopped.is_set():
+                return
+            _remove_partial(day_dir)
+            log_path = day_dir / self.log_filename
+            if not log_path.exists():
+                continue
+            # the index is complete before it is frozen
+            catch_up(log_path)
+            for path in (index_path(log_path), log_path):
+                if path.exists():
+                    self._compress(path)
+
+    def _segment_dirs(self):
+        """
+        (directory, expires) of every segment store: the raw stores, with
+        the per-transmitter sample stores nested in them, then the rollups.
+        """
+        dirs = []
+        for directory in self.store_dirs:
+            if directory.is_dir():
+                dirs.append((directory, True))
+                dirs += [(d, True) for d in sorted(directory.iterdir()) if d.is_dir()]
+        dirs += [(d, False) for d in self.summary_dirs if d.is_dir()]
+        return dirs
+
+    def _compress_segments(self):
+        for directory, _ in self._segment_dirs():
+            _remove_partial(directory)
+            # the newest segment may still be appended to
+            for path in segment_paths(directory)[:-1]:
+                if self._stopped.is_set():
+                    return
+                if not is_compressed(path):
+                    self._compress(path)
+
+    # -----------------------------
+    # Retention and quota
+    # -----------------------------
+    def _candidates(self):
+        """
+        (end time, path, size, expires) of everything that may be removed,
+        oldest first. Only `expires` items are subject to `retention_days`;
+        rollups are small and only go under quota pressure.
+        """
+        items = []
+        today = date.today().isoformat()
+        for day_dir in self._log_days():
+            if day_dir.name < today:
+                end = datetime.strptime(day_dir.name, "%Y-%m-%d") + timedelta(days=1)
+                items.append((end.timestamp(), day_dir, _size(day_dir), True))
+        for directory, expires in self._segment_dirs():
+            paths = segment_paths(directory)
+            # a segment ends where the next one starts
+            for path, following in zip(paths, paths[1:]):
+                items.append((segment_created(following), path, _size(path), expires))
+        if self.export_dir and self.export_dir.is_dir():
+            for path in self.export_dir.glob(EXPORT_PATTERN):
+                items.append((path.stat().st_mtime, path, _size(path), True))
+        items.sort(key=lambda item: item[0])
+        return items
+
+    def used_bytes(self):
+        total = _size(self.log_dir)
+        for directory in self.store_dirs + self.summary_dirs:
+            total += _size(directory)
+        if self.export_dir and self.export_dir.is_dir():
+            total += sum(_size(p) for p in self.export_dir.glob(EXPORT_PATTERN))
+        return total
+
+    def _remove(self, path, size):
+        try:
+            if path.is_dir():
+                shutil.rmtree(path)
+            else:
+                # with any copy left by an interrupted compression
+                plain = path.with_name(plain_name(path.name))
+                for suffix in ("",) + tuple(CODECS.values()):
+                    plain.with_name(plain.name + suffix).unlink(missing_ok=True)
+        except OSError as e:
+            self.errors += 1
+            logger.warning("Could not remove %s: %s", path, e)
+            return False
+        self.removed += 1
+        self.removed_bytes += size
+        return True
+
+    def _enforce_limits(self):
+        items = self._candidates()
+        if self.retention_days:
+            cutoff = time.time() - self.retention_days * 86400
+            kept = []
+            for item in items:
+                end, path, size, expires = item
+                if not (expires and end < cutoff and self._remove(path, size)):
+                    kept.append(item)
+            items = kept
+        if self.quota_bytes:
+            used = self.used_bytes()
+            for _, path, size, _ in items:
+                if used <= self.quota_bytes or self._stopped.is_set():
+                    break
+                if self._remove(path, size):
+                    used -= size
+            if used > self.quota_bytes:
+                logger.warning(
+                    "Storage quota exceeded: %d of %d bytes in use",
+                    used,
+                    self.quota_bytes,
+                )
+
+
+def _is_day(name):
+    try:
+        datetime.strptime(name, "%Y-%m-%d")
+        return True
+    except ValueError:
+        return False
+
+
+def _size(path):
+    path = Path(path)
+    if path.is_file():
+        return path.stat().st_size
+    if not path.is_dir():
+        return 0
+    return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+
+
+def _remove_partial(directory):
+    # left behind by a compression interrupted by a crash
+    for suffix in CODECS.values():
+        for path in directory.glob("*" + suffix + TMP_SUFFIX):
+            path.unlink(missing_ok=True)
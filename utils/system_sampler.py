@@ -0,0 +1,133 @@
+import threading
+import time
+from collections import namedtuple
+
+import psutil
+
+from utils.logger import get_logger
+
+logger = get_logger("system_sampler")
+
+SystemSnapshot = namedtuple(
+    "SystemSnapshot", ["timestamp", "cpu", "ram", "disk", "net_up", "net_down"]
+)
+
+# seconds between two readings of each metric
+DEFAULT_INTERVALS = {"cpu": 1.0, "ram": 2.0, "disk": 30.0, "net": 1.0}
+
+
+# -----------------------------
+# System metrics sampler
+# -----------------------------
+class SystemSampler(threading.Thread):
+    """
+    Reads CPU, RAM, disk and network usage on its own thread so the Tk
+    loop never waits on psutil.
+
+    Each metric has its own cadence (`intervals`, seconds). CPU and
+    network are rates over the time since their previous reading
+    (`cpu_percent(None)` and byte counter deltas), so nothing sleeps
+    between two reads. Every metric is read once on construction, which
+    primes both counters, so the first round (one interval later) already
+    reports rates over a full interval. After every round the latest
+    values are published as one immutable SystemSnapshot in `snapshot`,
+    which the UI reads without locking.
+    """
+
+    def __init__(self, intervals=None, disk_path="/"):
+        super().__init__(daemon=True)
+        self.intervals = dict(DEFAULT_INTERVALS, **(intervals or {}))
+        self.disk_path = disk_path
+
+        self.rounds = 0
+        self.errors = 0
+        self.cpu_s = 0.0
+        self._values = dict(
+            timestamp=0.0, cpu=0.0, ram=0.0, disk=0.0, net_up=0.0, net_down=0.0
+        )
+        self._net = None  # (monotonic time, bytes sent, bytes received)
+        self._readers = {
+            "cpu": self._read_cpu,
+            "ram": self._read_ram,
+            "disk": self._read_disk,
+            "net": self._read_net,
+        }
+        self._stopped = threading.Event()
+
+        # primes the cpu and network counters; their rates start at 0
+        now = time.monotonic()
+        self._due = {}
+        for name in self._readers:
+            self._read(name, now)
+            self._due[name] = now + self.intervals[name]
+        self._values["cpu"] = 0.0
+        self._values["timestamp"] = time.time()
+        self.snapshot = SystemSnapshot(**self._values)
+
+    # -----------------------------
+    # Readers
+    # -----------------------------
+    def _read_cpu(self, now):
+        self._values["cpu"] = psutil.cpu_percent(interval=None)
+
+    def _read_ram(self, now):
+        self._values["ram"] = psutil.virtual_memory().percent
+
+    def _read_disk(self, now):
+        self._values["disk"] = psutil.disk_usage(self.disk_path).percent
+
+    def _read_net(self, now):
+        counters = psutil.net_io_counters()
+        if counters is None:
+            return
+        if self._net is not None:
+            last, sent, received = self._net
+            elapsed = now - last
+            if elapsed > 0:
+                # counters reset with the interface; never report negative
+                up = max(counters.bytes_sent - sent, 0) / 1024.0 / elapsed
+                down = max(counters.bytes_recv - received, 0) / 1024.0 / elapsed
+                self._values["net_up"] = up
+                self._values["net_down"] = down
+        self._net = (now, counters.bytes_sent, counters.bytes_recv)
+
+    # -----------------------------
+    # Thread
+    # -----------------------------
+    def _read(self, name, now):
+        try:
+            self._readers[name](now)
+        except (psutil.Error, OSError) as e:
+            self.errors += 1
+            logger.warning("Could not read %s usage: %s", name, e)
+
+    def sample(self):
+        """
+        Read every metric that is due and publish a new snapshot.
+        """
+        now = time.monotonic()
+        for name, due in self._due.items():
+            if now < due:
+                continue
+            self._read(name, now)
+            # keep the cadence, but after a stall start a fresh interval
+            # rather than reading again at once over a tiny window
+            due += self.intervals[name]
+            self._due[name] = due if due > now else now + self.intervals[name]
+        self._values["timestamp"] = time.time()
+        self.snapshot = SystemSnapshot(**self._values)
+        self.rounds += 1
+
+    def run(self):
+        start = time.thread_time()
+        # everything was read on construction; wait for the first metric due
+        while not self._stopped.wait(
+            max(0.0, min(self._due.values()) - time.monotonic())
+        ):
+            self.sample()
+            self.cpu_s = time.thread_time() - start
+
+    def stop(self, timeout=2.0):
+        self._stopped.set()
+        if self.is_alive():
+            self.join(timeout)